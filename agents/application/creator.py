@@ -12,7 +12,7 @@ from agents.polymarket.polymarket import Polymarket
 
 class Creator:
     def __init__(self):
-        self.polymarket = Polymarket()
+        self.polymarket = Polymarket(read_only=True)
         self.gamma = Gamma()
         self.agent = Agent()
 
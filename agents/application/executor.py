@@ -139,7 +139,8 @@ class Executor:
         print()
         print("... prompting ... ", prompt)
         print()
-        return self.chroma.events(events, prompt)
+        # the tradeable event crawl stops early, so events missing from it are kept
+        return self.chroma.events(events, prompt, complete=False)
 
     def map_filtered_events_to_markets(
         self, filtered_events: "list[tuple]"
@@ -155,6 +156,8 @@ class Executor:
             "failed": 0
         }
         
+        # First pass: collect market ids per event so they can be fetched in bulk
+        event_market_ids = []
         for idx, event_tuple in enumerate(filtered_events):
             try:
                 # filtered_events is a list of tuples from RAG: (Document, score)
@@ -169,36 +172,49 @@ class Executor:
                 market_ids = market_ids_str.split(",")
                 error_stats["total_market_ids"] += len(market_ids)
                 print(f"Processing event {idx}: {len(market_ids)} markets")
-                
-                for market_id in market_ids:
-                    if not market_id or not market_id.strip():
-                        continue
-                    try:
-                        market_data = self.gamma.get_market(market_id.strip())
-                        formatted_market_data = self.polymarket.map_api_to_market(market_data)
-                        markets.append(formatted_market_data)
-                        error_stats["successful"] += 1
-                    except ValueError as ve:
-                        error_stats["failed"] += 1
-                        error_msg = str(ve)
-                        if "not active" in error_msg:
-                            error_stats["not_active"] += 1
-                        elif "outcomePrices" in error_msg:
-                            error_stats["missing_outcome_prices"] += 1
-                        elif "CLOB token IDs" in error_msg:
-                            error_stats["missing_clob_token_ids"] += 1
-                        else:
-                            error_stats["other_errors"] += 1
-                        print(f"  ✗ Error fetching market {market_id}: {error_msg}")
-                    except Exception as e:
-                        error_stats["failed"] += 1
-                        error_stats["other_errors"] += 1
-                        print(f"  ✗ Error fetching market {market_id}: {e}")
+                event_market_ids.append(
+                    [x.strip() for x in market_ids if x and x.strip()]
+                )
             except Exception as event_error:
                 print(f"Error processing event {idx}: {event_error}")
                 import traceback
                 traceback.print_exc()
                 continue
+
+        all_market_ids = [x for ids in event_market_ids for x in ids]
+        try:
+            market_lookup = self.gamma.get_markets_by_ids(all_market_ids)
+        except Exception as e:
+            print(f"Error fetching markets in bulk: {e}")
+            market_lookup = {}
+        print(f"Fetched {len(market_lookup)} of {len(set(all_market_ids))} unique markets")
+
+        # Second pass: map markets in the original event/market order
+        for market_ids in event_market_ids:
+            for market_id in market_ids:
+                try:
+                    market_data = market_lookup.get(market_id)
+                    if market_data is None:
+                        raise LookupError(f"Market {market_id} not returned by api")
+                    formatted_market_data = self.polymarket.map_api_to_market(market_data)
+                    markets.append(formatted_market_data)
+                    error_stats["successful"] += 1
+                except ValueError as ve:
+                    error_stats["failed"] += 1
+                    error_msg = str(ve)
+                    if "not active" in error_msg:
+                        error_stats["not_active"] += 1
+                    elif "outcomePrices" in error_msg:
+                        error_stats["missing_outcome_prices"] += 1
+                    elif "CLOB token IDs" in error_msg:
+                        error_stats["missing_clob_token_ids"] += 1
+                    else:
+                        error_stats["other_errors"] += 1
+                    print(f"  ✗ Error fetching market {market_id}: {error_msg}")
+                except Exception as e:
+                    error_stats["failed"] += 1
+                    error_stats["other_errors"] += 1
+                    print(f"  ✗ Error fetching market {market_id}: {e}")
         
         # Print summary statistics
         print("\n=== Market Mapping Statistics ===")
@@ -229,7 +245,8 @@ class Executor:
         print()
         print("... prompting ... ", prompt)
         print()
-        return self.chroma.markets(markets, prompt)
+        # markets of the filtered events only: markets indexed by earlier runs are kept
+        return self.chroma.markets(markets, prompt, complete=False)
 
     def source_best_trade(self, market_object: tuple) -> str:
         market_document = market_object[0].dict()
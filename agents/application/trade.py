@@ -19,9 +19,11 @@ class Trader:
         self.agent = Agent()
 
     def pre_trade_logic(self) -> None:
-        self.clear_local_dbs()
+        # the vector dbs are updated incrementally, so they are kept between runs
+        pass
 
     def clear_local_dbs(self) -> None:
+        # full reset of the local vector dbs; the next run re-embeds everything
         # Use absolute paths based on project root
         project_root = Path(__file__).parent.parent.parent
         events_db = project_root / "local_db_events"
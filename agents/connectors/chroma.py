@@ -5,28 +5,82 @@ import time
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.document_loaders import JSONLoader
 from langchain_community.vectorstores.chroma import Chroma
+from langchain_core.documents import Document
 
+from agents.connectors.embedding_cache import CachedEmbeddings, get_embedding_cache
+from agents.connectors.vector_index import IncrementalIndex
 from agents.polymarket.gamma import GammaMarketClient
 from agents.utils.objects import SimpleEvent, SimpleMarket
 
 
+EMBEDDING_MODEL = "Qwen/Qwen3-Embedding-8B"
+
+
 def get_embedding_function():
     """获取 SiliconFlow Embeddings 函数"""
     api_key = os.getenv("EMBEDDING_API_KEY", "")
     api_base = os.getenv("EMBEDDING_API_BASE", "https://api.siliconflow.cn/v1")
     
-    return OpenAIEmbeddings(
-        model="Qwen/Qwen3-Embedding-8B",
+    embeddings = OpenAIEmbeddings(
+        model=EMBEDDING_MODEL,
         base_url=api_base,
         api_key=api_key
     )
+    # texts already embedded with this model are served from the local cache
+    cache = get_embedding_cache()
+    if cache is None:
+        return embeddings
+    return CachedEmbeddings(embeddings, EMBEDDING_MODEL, cache)
+
+
+def _get(record, name: str):
+    # markets arrive as SimpleMarket objects or as the dicts from map_api_to_market
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name, None)
+
+
+def _documents(records, metadata_fields: "tuple[str, ...]") -> "list[Document]":
+    docs = []
+    for record in records:
+        description = _get(record, "description")
+        metadata = {name: _get(record, name) for name in metadata_fields}
+        if not description or not description.strip():
+            print(f"Warning: Document with empty content skipped: {metadata}")
+            continue
+        docs.append(Document(page_content=description, metadata=metadata))
+    return docs
+
+
+def event_documents(events: "list[SimpleEvent]") -> "list[Document]":
+    """One document per event description, with the event id and its market ids."""
+    return _documents(events, ("id", "markets"))
+
+
+def market_documents(markets: "list[SimpleMarket]") -> "list[Document]":
+    return _documents(
+        markets, ("id", "outcomes", "outcome_prices", "question", "clob_token_ids")
+    )
 
 
 class PolymarketRAG:
-    def __init__(self, local_db_directory=None, embedding_function=None) -> None:
+    def __init__(
+        self,
+        local_db_directory=None,
+        embedding_function=None,
+        debug_dump=None,
+        vector_store=None,
+    ) -> None:
         self.gamma_client = GammaMarketClient()
         self.local_db_directory = local_db_directory
         self.embedding_function = embedding_function
+        # RAG_DEBUG_DUMP=1 also writes events.json / markets.json next to the vector dbs
+        if debug_dump is None:
+            debug_dump = os.getenv("RAG_DEBUG_DUMP", "0").lower() in ("1", "true", "yes")
+        self.debug_dump = debug_dump
+        # VECTOR_STORE=numpy keeps the event / market vectors in a memory-mapped numpy
+        # matrix instead of a chroma collection
+        self.vector_store = vector_store or os.getenv("VECTOR_STORE", "chroma")
 
     def load_json_from_local(
         self, json_file_path=None, vector_db_directory="./local_db"
@@ -66,226 +120,62 @@ class PolymarketRAG:
         response_docs = local_db.similarity_search_with_score(query=query)
         return response_docs
 
-    def events(self, events: "list[SimpleEvent]", prompt: str) -> "list[tuple]":
-        # create local json file
-        local_events_directory: str = "./local_db_events"
-        if not os.path.isdir(local_events_directory):
-            os.mkdir(local_events_directory)
-        local_file_path = f"{local_events_directory}/events.json"
-        dict_events = [x.dict() for x in events]
-        with open(local_file_path, "w+") as output_file:
-            json.dump(dict_events, output_file)
-
-        # create vector db
-        def metadata_func(record: dict, metadata: dict) -> dict:
-
-            metadata["id"] = record.get("id")
-            metadata["markets"] = record.get("markets")
-
-            return metadata
-
-        loader = JSONLoader(
-            file_path=local_file_path,  # Use the file path, not directory
-            jq_schema=".[]",
-            content_key="description",
-            text_content=False,
-            metadata_func=metadata_func,
-        )
-        loaded_docs = loader.load()
-        
-        # Validate loaded documents
-        if not loaded_docs:
-            print("Warning: No documents loaded from JSON file")
-            return []
-        
-        print(f"Loaded {len(loaded_docs)} documents for embedding")
-        
-        # Check for valid description content
-        valid_docs = []
-        for doc in loaded_docs:
-            if doc.page_content and doc.page_content.strip():
-                valid_docs.append(doc)
-            else:
-                print(f"Warning: Document with empty content skipped: {doc.metadata}")
-        
-        if not valid_docs:
-            print("Error: No valid documents with content found")
-            return []
-        
-        print(f"Processing {len(valid_docs)} valid documents for embedding")
-        
+    def _sync_index(self, directory: str, docs: list, complete: bool = True) -> IncrementalIndex:
         try:
-            # Use SiliconFlow Embeddings
-            embedding_function = get_embedding_function()
-            print(f"Using SiliconFlow API: Qwen/Qwen3-Embedding-8B")
-            
-            # Process in smaller batches to avoid API issues
-            batch_size = 10  # Reduce batch size for better stability
-            local_db = None
-            vector_db_directory = f"{local_events_directory}/chroma"
-            
-            # Clean up existing database directory if it exists to avoid readonly errors
-            import shutil
-            if os.path.exists(vector_db_directory):
-                try:
-                    # Force remove with retries
-                    for _ in range(3):
-                        try:
-                            shutil.rmtree(vector_db_directory)
-                            print(f"Cleaned up existing vector database directory: {vector_db_directory}")
-                            break
-                        except Exception as cleanup_error:
-                            print(f"Warning: Could not clean up vector database directory (attempt {_ + 1}/3): {cleanup_error}")
-                            import time
-                            time.sleep(0.5)
-                except Exception as cleanup_error:
-                    print(f"Warning: Could not clean up vector database directory: {cleanup_error}")
-            
-            for i in range(0, len(valid_docs), batch_size):
-                batch = valid_docs[i:i + batch_size]
-                print(f"Processing batch {i//batch_size + 1}/{(len(valid_docs) + batch_size - 1)//batch_size} ({len(batch)} documents)")
-                
-                try:
-                    if local_db is None:
-                        # First batch: create the database
-                        local_db = Chroma.from_documents(
-                            batch, embedding_function, persist_directory=vector_db_directory
-                        )
-                    else:
-                        # Subsequent batches: add to existing database
-                        local_db.add_documents(batch)
-                    print(f"  ✓ Batch {i//batch_size + 1} completed successfully")
-                except Exception as batch_error:
-                    print(f"  ✗ Error processing batch {i//batch_size + 1}: {batch_error}")
-                    import traceback
-                    traceback.print_exc()
-                    # Continue with next batch
-                    continue
-            
-            if local_db is None:
-                print("Error: Failed to create vector database after all retries")
-                return []
-            
-            print(f"Successfully created vector database with {len(valid_docs)} documents")
-            
+            print(f"Using SiliconFlow API: {EMBEDDING_MODEL}")
+            subdirectory = "chroma" if self.vector_store == "chroma" else "vectors"
+            vector_db_directory = f"{directory}/{subdirectory}"
+            index = IncrementalIndex(
+                vector_db_directory, get_embedding_function(), backend=self.vector_store
+            )
+            index.sync(docs, [str(doc.metadata["id"]) for doc in docs], complete=complete)
         except Exception as e:
-            print(f"Error creating vector database: {e}")
+            print(f"Error updating vector database: {e}")
             import traceback
             traceback.print_exc()
             raise
+        return index
+
+    def _dump(self, directory: str, name: str, records) -> None:
+        # debug copy of the ingested records, not read back by anything
+        if not self.debug_dump:
+            return
+        os.makedirs(directory, exist_ok=True)
+        rows = [r if isinstance(r, dict) else r.dict() for r in records]
+        with open(f"{directory}/{name}", "w+") as output_file:
+            json.dump(rows, output_file)
+
+    def _index_and_query(
+        self, directory: str, docs: "list[Document]", prompt: str, complete: bool = True
+    ) -> "list[tuple]":
+        if not docs:
+            print("Error: No valid documents with content found")
+            return []
 
-        # query
-        return local_db.similarity_search_with_score(query=prompt)
-
-    def markets(self, markets: "list[SimpleMarket]", prompt: str) -> "list[tuple]":
-        # create local json file
-        local_events_directory: str = "./local_db_markets"
-        if not os.path.isdir(local_events_directory):
-            os.mkdir(local_events_directory)
-        local_file_path = f"{local_events_directory}/markets.json"
-        with open(local_file_path, "w+") as output_file:
-            json.dump(markets, output_file)
-
-        # create vector db
-        def metadata_func(record: dict, metadata: dict) -> dict:
+        print(f"Processing {len(docs)} valid documents for embedding")
 
-            metadata["id"] = record.get("id")
-            metadata["outcomes"] = record.get("outcomes")
-            metadata["outcome_prices"] = record.get("outcome_prices")
-            metadata["question"] = record.get("question")
-            metadata["clob_token_ids"] = record.get("clob_token_ids")
+        # update the persistent index in place: only new or changed descriptions are embedded
+        local_db = self._sync_index(directory, docs, complete)
 
-            return metadata
+        # query, ranking only the documents passed in (the index may hold others)
+        ids = [str(doc.metadata["id"]) for doc in docs]
+        return local_db.similarity_search_with_score(query=prompt, ids=ids)
 
-        loader = JSONLoader(
-            file_path=local_file_path,
-            jq_schema=".[]",
-            content_key="description",
-            text_content=False,
-            metadata_func=metadata_func,
+    def events(
+        self, events: "list[SimpleEvent]", prompt: str, complete: bool = True
+    ) -> "list[tuple]":
+        # complete=False when `events` is only part of the source set: nothing is deleted
+        local_events_directory: str = "./local_db_events"
+        self._dump(local_events_directory, "events.json", events)
+        return self._index_and_query(
+            local_events_directory, event_documents(events), prompt, complete
         )
-        loaded_docs = loader.load()
-        
-        # Validate loaded documents
-        if not loaded_docs:
-            print("Warning: No documents loaded from JSON file")
-            return []
-        
-        print(f"Loaded {len(loaded_docs)} documents for embedding")
-        
-        # Check for valid description content
-        valid_docs = []
-        for doc in loaded_docs:
-            if doc.page_content and doc.page_content.strip():
-                valid_docs.append(doc)
-            else:
-                print(f"Warning: Document with empty content skipped: {doc.metadata}")
-        
-        if not valid_docs:
-            print("Error: No valid documents with content found")
-            return []
-        
-        print(f"Processing {len(valid_docs)} valid documents for embedding")
-        
-        try:
-            # Use SiliconFlow Embeddings
-            embedding_function = get_embedding_function()
-            print(f"Using SiliconFlow API: Qwen/Qwen3-Embedding-8B")
-            
-            # Process in smaller batches to avoid API issues
-            batch_size = 10  # Reduce batch size for better stability
-            local_db = None
-            vector_db_directory = f"{local_events_directory}/chroma"
-            
-            # Clean up existing database directory if it exists to avoid readonly errors
-            import shutil
-            if os.path.exists(vector_db_directory):
-                try:
-                    # Force remove with retries
-                    for _ in range(3):
-                        try:
-                            shutil.rmtree(vector_db_directory)
-                            print(f"Cleaned up existing vector database directory: {vector_db_directory}")
-                            break
-                        except Exception as cleanup_error:
-                            print(f"Warning: Could not clean up vector database directory (attempt {_ + 1}/3): {cleanup_error}")
-                            import time
-                            time.sleep(0.5)
-                except Exception as cleanup_error:
-                    print(f"Warning: Could not clean up vector database directory: {cleanup_error}")
-            
-            for i in range(0, len(valid_docs), batch_size):
-                batch = valid_docs[i:i + batch_size]
-                print(f"Processing batch {i//batch_size + 1}/{(len(valid_docs) + batch_size - 1)//batch_size} ({len(batch)} documents)")
-                
-                try:
-                    if local_db is None:
-                        # First batch: create the database
-                        local_db = Chroma.from_documents(
-                            batch, embedding_function, persist_directory=vector_db_directory
-                        )
-                    else:
-                        # Subsequent batches: add to existing database
-                        local_db.add_documents(batch)
-                    print(f"  ✓ Batch {i//batch_size + 1} completed successfully")
-                except Exception as batch_error:
-                    print(f"  ✗ Error processing batch {i//batch_size + 1}: {batch_error}")
-                    import traceback
-                    traceback.print_exc()
-                    # Continue with next batch
-                    continue
-            
-            if local_db is None:
-                print("Error: Failed to create vector database after all retries")
-                return []
-            
-            print(f"Successfully created vector database with {len(valid_docs)} documents")
-            
-        except Exception as e:
-            print(f"Error creating vector database: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
 
-        # query
-        return local_db.similarity_search_with_score(query=prompt)
+    def markets(
+        self, markets: "list[SimpleMarket]", prompt: str, complete: bool = True
+    ) -> "list[tuple]":
+        local_markets_directory: str = "./local_db_markets"
+        self._dump(local_markets_directory, "markets.json", markets)
+        return self._index_and_query(
+            local_markets_directory, market_documents(markets), prompt, complete
+        )
@@ -0,0 +1,92 @@
+# concurrent embedding of many texts
+# texts are packed into batches by estimated token count (up to the provider's per-request
+# limit), several batches are in flight at once, and a failed batch is retried on its own
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# per-request limits of the embedding endpoint
+MAX_BATCH_TOKENS = int(os.getenv("EMBEDDING_MAX_BATCH_TOKENS", 8000))
+MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", 32))
+MAX_IN_FLIGHT = int(os.getenv("EMBEDDING_CONCURRENCY", 4))
+
+
+def estimate_tokens(text: str) -> int:
+    # rough estimate, about 4 characters per token
+    return len(text) // 4 + 1
+
+
+def pack_batches(
+    texts: "list[str]",
+    max_tokens: int = MAX_BATCH_TOKENS,
+    max_size: int = MAX_BATCH_SIZE,
+) -> "list[list[int]]":
+    """Greedy packing of text indices into batches under `max_tokens` and `max_size`."""
+    batches, current, current_tokens = [], [], 0
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (
+            current_tokens + tokens > max_tokens or len(current) >= max_size
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        # a single text over the limit still gets its own batch
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def embed_texts(
+    embeddings,
+    texts: "list[str]",
+    max_in_flight: int = MAX_IN_FLIGHT,
+    retries: int = 3,
+    backoff: float = 1.0,
+    max_tokens: int = MAX_BATCH_TOKENS,
+    max_size: int = MAX_BATCH_SIZE,
+) -> list:
+    """
+    Vector per text, in order; None for texts whose batch still failed after `retries`
+    retries. Prints throughput when done.
+    """
+    batches = pack_batches(texts, max_tokens, max_size)
+    vectors = [None] * len(texts)
+    if not batches:
+        return vectors
+
+    def run(batch_no: int, batch: "list[int]") -> bool:
+        for attempt in range(retries + 1):
+            try:
+                result = embeddings.embed_documents([texts[i] for i in batch])
+            except Exception as e:
+                if attempt == retries:
+                    print(
+                        f"  ✗ Embedding batch {batch_no + 1}/{len(batches)} failed: {e}"
+                    )
+                    return False
+                delay = backoff * 2**attempt
+                print(
+                    f"  Embedding batch {batch_no + 1}/{len(batches)} failed ({e}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                continue
+            for i, vector in zip(batch, result):
+                vectors[i] = vector
+            return True
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as executor:
+        ok = list(executor.map(run, range(len(batches)), batches))
+    elapsed = time.monotonic() - start
+
+    done = sum(len(batch) for batch, success in zip(batches, ok) if success)
+    rate = done / elapsed if elapsed > 0 else float("inf")
+    print(
+        f"Embedded {done}/{len(texts)} documents in {len(batches)} batches, "
+        f"{elapsed:.2f}s ({rate:.1f} docs/s)"
+    )
+    return vectors
@@ -0,0 +1,178 @@
+# content-addressed embedding cache shared by every RAG entry point
+# vectors are stored as float32 blobs in a sqlite file, keyed by model name and a hash
+# of the text, so a description is only sent to the embedding api once per model
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def embedding_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Size-bounded LRU store of embedding vectors in a sqlite file."""
+
+    def __init__(
+        self,
+        path: str = "./local_cache/embeddings.sqlite",
+        max_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                vector BLOB,
+                accessed_at REAL,
+                size INTEGER
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_accessed_at ON embeddings (accessed_at)"
+        )
+        self._db.commit()
+        self._size = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM embeddings"
+        ).fetchone()[0]
+
+    def get_many(self, model: str, texts: "list[str]") -> "list[np.ndarray]":
+        """Cached vector per text (None where missing)."""
+        keys = [embedding_key(model, text) for text in texts]
+        found = {}
+        with self._lock:
+            # sqlite caps the number of bound parameters per statement
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._db.commit()
+        self.hits += sum(1 for key in keys if key in found)
+        self.misses += sum(1 for key in keys if key not in found)
+        return [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None
+            for key in keys
+        ]
+
+    def put_many(self, model: str, texts: "list[str]", vectors) -> None:
+        now = time.time()
+        rows = []
+        for text, vector in zip(texts, vectors):
+            blob = np.asarray(vector, dtype=np.float32).tobytes()
+            rows.append((embedding_key(model, text), model, blob, now, len(blob)))
+        with self._lock:
+            for key, _, blob, _, size in rows:
+                old = self._db.execute(
+                    "SELECT size FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if old is not None:
+                    self._size -= old[0]
+                self._size += size
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM embeddings ORDER BY accessed_at ASC LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._size <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM embeddings WHERE key = ?", (key,))
+                self._size -= size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM embeddings")
+            self._db.commit()
+            self._size = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size_bytes": self._size,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends texts missing from the cache to `embeddings`."""
+
+    def __init__(
+        self, embeddings: Embeddings, model: str, cache: EmbeddingCache
+    ) -> None:
+        self.embeddings = embeddings
+        self.model = model
+        self.cache = cache
+
+    def embed_documents(self, texts: "list[str]") -> "list[list[float]]":
+        vectors = self.cache.get_many(self.model, texts)
+        # each distinct missing text is embedded once, even if it repeats in `texts`
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        if missing:
+            embedded = self.embeddings.embed_documents(missing)
+            self.cache.put_many(self.model, missing, embedded)
+            fresh = dict(
+                zip(missing, (np.asarray(v, dtype=np.float32) for v in embedded))
+            )
+            vectors = [fresh[t] if v is None else v for t, v in zip(texts, vectors)]
+        return [v.tolist() for v in vectors]
+
+    def embed_query(self, text: str) -> "list[float]":
+        return self.embed_documents([text])[0]
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide embedding cache, or None when disabled with EMBEDDING_CACHE=0."""
+    global _cache
+    if os.getenv("EMBEDDING_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache(
+                path=os.getenv(
+                    "EMBEDDING_CACHE_PATH", "./local_cache/embeddings.sqlite"
+                ),
+                max_bytes=int(
+                    os.getenv("EMBEDDING_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+                ),
+            )
+    return _cache
@@ -0,0 +1,244 @@
+# embedded vector store: normalized float32 embeddings in a memory-mapped matrix plus a
+# json sidecar with ids, texts and metadata
+# exact top-k is one matrix-vector product and an argpartition; for large corpora an
+# optional hnsw index (hnswlib) can be used instead
+
+import json
+import os
+
+import numpy as np
+from langchain_core.documents import Document
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+VECTORS_FILE = "vectors.f32"
+SIDECAR_FILE = "index.json"
+# below this many vectors the exact search is as fast as hnsw
+HNSW_MIN_SIZE = 20000
+
+
+def _normalize(vectors) -> np.ndarray:
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> "tuple[np.ndarray, np.ndarray]":
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.argsort(-scores[top])]
+    return top, scores[top]
+
+
+class NumpyVectorStore:
+    """
+    Same search interface as the langchain Chroma store: similarity_search_with_score
+    returns (Document, distance) pairs, best first, with distance = 1 - cosine similarity.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        embedding_function,
+        use_hnsw: bool = False,
+        hnsw_min_size: int = HNSW_MIN_SIZE,
+    ) -> None:
+        self.directory = directory
+        self.embedding_function = embedding_function
+        self.use_hnsw = use_hnsw and hnswlib is not None
+        if use_hnsw and hnswlib is None:
+            print("use_hnsw is set but hnswlib is not installed, using exact search")
+        self.hnsw_min_size = hnsw_min_size
+        self._hnsw = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, VECTORS_FILE)
+        self._sidecar_path = os.path.join(directory, SIDECAR_FILE)
+        self.dim = None
+        self.ids: "list[str]" = []
+        self.documents: "list[str]" = []
+        self.metadatas: "list[dict]" = []
+        if os.path.exists(self._sidecar_path):
+            with open(self._sidecar_path) as f:
+                sidecar = json.load(f)
+            self.dim = sidecar["dim"]
+            self.ids = sidecar["ids"]
+            self.documents = sidecar["documents"]
+            self.metadatas = sidecar["metadatas"]
+        self._rows = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self._open()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _open(self) -> None:
+        self._hnsw = None
+        if not self.ids:
+            self.vectors = np.empty((0, self.dim or 0), dtype=np.float32)
+            return
+        self.vectors = np.memmap(
+            self._vectors_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(len(self.ids), self.dim),
+        )
+
+    def _save_sidecar(self) -> None:
+        tmp = self._sidecar_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                {
+                    "dim": self.dim,
+                    "ids": self.ids,
+                    "documents": self.documents,
+                    "metadatas": self.metadatas,
+                },
+                f,
+            )
+        os.replace(tmp, self._sidecar_path)
+
+    def get_metadatas(self) -> "dict[str, dict]":
+        return dict(zip(self.ids, self.metadatas))
+
+    def update_metadatas(self, ids: "list[str]", metadatas: "list[dict]") -> None:
+        for doc_id, metadata in zip(ids, metadatas):
+            self.metadatas[self._rows[doc_id]] = metadata
+        self._save_sidecar()
+
+    def upsert(
+        self,
+        ids: "list[str]",
+        embeddings,
+        documents: "list[str]",
+        metadatas: "list[dict]",
+    ) -> None:
+        vectors = _normalize(embeddings)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match store ({self.dim})"
+            )
+
+        n_before = len(self.ids)
+        new_vectors = []
+        replace = {}
+        for doc_id, vector, text, metadata in zip(ids, vectors, documents, metadatas):
+            row = self._rows.get(doc_id)
+            if row is None:
+                self._rows[doc_id] = len(self.ids)
+                self.ids.append(doc_id)
+                self.documents.append(text)
+                self.metadatas.append(metadata)
+                new_vectors.append(vector)
+            else:
+                self.documents[row] = text
+                self.metadatas[row] = metadata
+                if row >= n_before:
+                    new_vectors[row - n_before] = vector
+                else:
+                    replace[row] = vector
+
+        # changed rows are rewritten in place, new rows are appended to the file
+        del self.vectors
+        if replace:
+            matrix = np.memmap(
+                self._vectors_path,
+                dtype=np.float32,
+                mode="r+",
+                shape=(n_before, self.dim),
+            )
+            for row, vector in replace.items():
+                matrix[row] = vector
+            matrix.flush()
+            del matrix
+        if new_vectors:
+            if os.path.exists(self._vectors_path):
+                # drop rows left over from an interrupted write that the sidecar never recorded
+                os.truncate(self._vectors_path, n_before * self.dim * 4)
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.asarray(new_vectors, dtype=np.float32).tobytes())
+        self._save_sidecar()
+        self._open()
+
+    def delete(self, ids: "list[str]") -> None:
+        drop = {self._rows[doc_id] for doc_id in ids if doc_id in self._rows}
+        if not drop:
+            return
+        keep = np.array(
+            [i for i in range(len(self.ids)) if i not in drop], dtype=np.int64
+        )
+        kept = np.array(self.vectors[keep]) if len(keep) else None
+        del self.vectors
+
+        # compacted copy swapped in atomically
+        tmp = self._vectors_path + ".tmp"
+        with open(tmp, "wb") as f:
+            if kept is not None:
+                f.write(kept.tobytes())
+        os.replace(tmp, self._vectors_path)
+        self.ids = [self.ids[i] for i in keep]
+        self.documents = [self.documents[i] for i in keep]
+        self.metadatas = [self.metadatas[i] for i in keep]
+        self._rows = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self._save_sidecar()
+        self._open()
+
+    def _search_exact(
+        self, query: np.ndarray, k: int
+    ) -> "tuple[np.ndarray, np.ndarray]":
+        return _top_k(self.vectors @ query, k)
+
+    def _search_hnsw(
+        self, query: np.ndarray, k: int
+    ) -> "tuple[np.ndarray, np.ndarray]":
+        if self._hnsw is None:
+            # built in memory on first use after the store changed
+            index = hnswlib.Index(space="ip", dim=self.dim)
+            index.init_index(max_elements=len(self.ids), ef_construction=200, M=16)
+            index.add_items(np.asarray(self.vectors), np.arange(len(self.ids)))
+            self._hnsw = index
+        self._hnsw.set_ef(max(50, k))
+        labels, distances = self._hnsw.knn_query(query, k=k)
+        # hnswlib "ip" distance is 1 - inner product
+        return labels[0].astype(np.int64), 1.0 - distances[0]
+
+    def _search_rows(
+        self, query: np.ndarray, k: int, rows: np.ndarray
+    ) -> "tuple[np.ndarray, np.ndarray]":
+        # exact search over a subset of the rows
+        top, scores = _top_k(self.vectors[rows] @ query, k)
+        return rows[top], scores
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, ids: "list[str]" = None
+    ) -> "list[tuple]":
+        """`ids` limits the search to those documents (unknown ids are ignored)."""
+        if ids is not None:
+            rows = np.array(
+                sorted({self._rows[i] for i in ids if i in self._rows}), dtype=np.int64
+            )
+        if not self.ids or (ids is not None and not len(rows)):
+            return []
+        q = _normalize(self.embedding_function.embed_query(query))[0]
+        if ids is not None:
+            rows, scores = self._search_rows(q, min(k, len(rows)), rows)
+        elif self.use_hnsw and len(self.ids) >= self.hnsw_min_size:
+            rows, scores = self._search_hnsw(q, min(k, len(self.ids)))
+        else:
+            rows, scores = self._search_exact(q, min(k, len(self.ids)))
+        return [
+            (
+                Document(
+                    page_content=self.documents[row], metadata=self.metadatas[row]
+                ),
+                float(1.0 - score),
+            )
+            for row, score in zip(rows, scores)
+        ]
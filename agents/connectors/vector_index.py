@@ -0,0 +1,168 @@
+# persistent vector index that is updated in place instead of rebuilt every run
+# each document is stored under a stable id together with a hash of its text; a sync only
+# embeds new or changed texts, refreshes metadata of unchanged ones and deletes ids that
+# are no longer in the current set (closed events / markets) when that set is complete
+# the index can hold more than the last sync passed in, so searches take the ids to rank
+
+import hashlib
+import os
+
+from langchain_community.vectorstores.chroma import Chroma
+from langchain_core.documents import Document
+
+from agents.connectors.embedding_batch import embed_texts
+from agents.connectors.numpy_store import NumpyVectorStore
+
+HASH_KEY = "content_hash"
+# the document id is also kept in the metadata so chroma queries can filter on it
+ID_KEY = "doc_id"
+# rows written to chroma per upsert call
+UPSERT_CHUNK = 1000
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _clean_metadata(metadata: dict) -> dict:
+    # chroma (and the json sidecar of the numpy store) only keep str / int / float / bool values
+    return {k: v for k, v in metadata.items() if isinstance(v, (str, int, float, bool))}
+
+
+class ChromaBackend:
+    """The storage calls IncrementalIndex needs, on a persistent chroma collection."""
+
+    def __init__(self, persist_directory: str, embedding_function) -> None:
+        self.store = Chroma(
+            persist_directory=persist_directory, embedding_function=embedding_function
+        )
+
+    def get_metadatas(self) -> "dict[str, dict]":
+        stored = self.store._collection.get(include=["metadatas"])
+        return {
+            doc_id: metadata or {}
+            for doc_id, metadata in zip(stored["ids"], stored["metadatas"])
+        }
+
+    def delete(self, ids: "list[str]") -> None:
+        self.store._collection.delete(ids=ids)
+
+    def update_metadatas(self, ids: "list[str]", metadatas: "list[dict]") -> None:
+        self.store._collection.update(ids=ids, metadatas=metadatas)
+
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        for i in range(0, len(ids), UPSERT_CHUNK):
+            self.store._collection.upsert(
+                ids=ids[i : i + UPSERT_CHUNK],
+                embeddings=[list(v) for v in embeddings[i : i + UPSERT_CHUNK]],
+                documents=documents[i : i + UPSERT_CHUNK],
+                metadatas=metadatas[i : i + UPSERT_CHUNK],
+            )
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, ids: "list[str]" = None
+    ) -> "list[tuple]":
+        where = None if ids is None else {ID_KEY: {"$in": list(ids)}}
+        return self.store.similarity_search_with_score(query=query, k=k, filter=where)
+
+
+class IncrementalIndex:
+    """
+    `backend` is "chroma" (langchain Chroma collection) or "numpy" (NumpyVectorStore,
+    memory-mapped matrix with exact or hnsw search).
+    """
+
+    def __init__(
+        self, persist_directory: str, embedding_function, backend: str = "chroma"
+    ) -> None:
+        self.persist_directory = persist_directory
+        self.embedding_function = embedding_function
+        if backend == "chroma":
+            self.store = ChromaBackend(persist_directory, embedding_function)
+        elif backend == "numpy":
+            self.store = NumpyVectorStore(
+                persist_directory,
+                embedding_function,
+                use_hnsw=os.getenv("VECTOR_STORE_HNSW", "0").lower()
+                in ("1", "true", "yes"),
+            )
+        else:
+            raise ValueError(f"Unknown vector store backend: {backend}")
+
+    def _existing(self) -> "dict[str, dict]":
+        return self.store.get_metadatas()
+
+    def sync(
+        self, docs: "list[Document]", ids: "list[str]", complete: bool = True
+    ) -> dict:
+        """
+        Make the index hold exactly `docs` (keyed by `ids`). Returns counts of
+        added / updated / unchanged / deleted / failed documents. With `complete=False`
+        (`docs` is only part of the source set) ids missing from `docs` are kept.
+        """
+        existing = self._existing()
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "deleted": 0, "failed": 0}
+
+        to_embed: "list[tuple[str, Document]]" = []
+        meta_ids, meta_values = [], []
+        seen = set()
+        for doc_id, doc in zip(ids, docs):
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            metadata = _clean_metadata(doc.metadata)
+            metadata[HASH_KEY] = content_hash(doc.page_content)
+            metadata[ID_KEY] = doc_id
+            stored = existing.get(doc_id)
+            if stored is None or stored.get(HASH_KEY) != metadata[HASH_KEY]:
+                stats["added" if stored is None else "updated"] += 1
+                to_embed.append(
+                    (doc_id, Document(page_content=doc.page_content, metadata=metadata))
+                )
+            else:
+                stats["unchanged"] += 1
+                if stored != metadata:
+                    # prices / flags moved but the text did not: no new embedding needed
+                    meta_ids.append(doc_id)
+                    meta_values.append(metadata)
+
+        stale = (
+            [doc_id for doc_id in existing if doc_id not in seen] if complete else []
+        )
+        if stale:
+            self.store.delete(stale)
+            stats["deleted"] = len(stale)
+
+        if meta_ids:
+            self.store.update_metadatas(meta_ids, meta_values)
+
+        if to_embed:
+            vectors = embed_texts(
+                self.embedding_function, [doc.page_content for _, doc in to_embed]
+            )
+            # documents whose batch failed stay out of the index; the next sync retries them
+            embedded = [
+                (item, v) for item, v in zip(to_embed, vectors) if v is not None
+            ]
+            stats["failed"] = len(to_embed) - len(embedded)
+            if embedded:
+                self.store.upsert(
+                    [doc_id for (doc_id, _), _ in embedded],
+                    [v for _, v in embedded],
+                    [doc.page_content for (_, doc), _ in embedded],
+                    [doc.metadata for (_, doc), _ in embedded],
+                )
+
+        print(
+            f"Index {self.persist_directory}: {stats['added']} added, {stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged, {stats['deleted']} deleted, {stats['failed']} failed"
+        )
+        return stats
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, ids: "list[str]" = None
+    ) -> "list[tuple]":
+        """Best `k` matches for `query`, among `ids` only when given."""
+        if ids is not None and not ids:
+            return []
+        return self.store.similarity_search_with_score(query=query, k=k, ids=ids)
@@ -0,0 +1,118 @@
+# one-time trading approvals (usdc allowance + ctf operator approval per exchange contract)
+# reads what is already approved, sends only the missing transactions back to back with
+# locally assigned nonces, then waits for all receipts together
+
+import asyncio
+import time
+
+from web3 import Web3
+from web3.constants import MAX_INT
+from web3.exceptions import TransactionNotFound
+
+from agents.polymarket.onchain import SPENDERS, WalletReader
+
+
+class ApprovalsManager:
+    def __init__(
+        self,
+        web3,
+        usdc,
+        ctf,
+        reader: WalletReader,
+        private_key: str,
+        address: str,
+        chain_id: int,
+    ) -> None:
+        self.web3 = web3
+        self.usdc = usdc
+        self.ctf = ctf
+        self.reader = reader
+        self.private_key = private_key
+        self.address = address
+        self.chain_id = chain_id
+
+    def missing(self, spenders=SPENDERS) -> "list[tuple[str, str]]":
+        """(kind, spender) approvals not set yet; kind is "usdc" or "ctf"."""
+        return self.reader.snapshot(self.address, spenders).missing_approvals()
+
+    def _build(self, kind: str, spender: str, nonce: int, gas_price: int) -> dict:
+        if kind == "usdc":
+            fn = self.usdc.functions.approve(spender, int(MAX_INT, 0))
+        else:
+            fn = self.ctf.functions.setApprovalForAll(spender, True)
+        return fn.build_transaction(
+            {
+                "chainId": self.chain_id,
+                "from": self.address,
+                "nonce": nonce,
+                "gasPrice": gas_price,
+            }
+        )
+
+    def wait_for_receipts(
+        self, tx_hashes: list, timeout: float = 600, poll_interval: float = 1.0
+    ) -> list:
+        """Poll all pending transactions each round instead of waiting on them one by one."""
+        receipts = {}
+        deadline = time.monotonic() + timeout
+        while len(receipts) < len(tx_hashes):
+            for tx_hash in tx_hashes:
+                if tx_hash in receipts:
+                    continue
+                try:
+                    receipt = self.web3.eth.get_transaction_receipt(tx_hash)
+                except TransactionNotFound:
+                    # not mined yet; any other rpc error propagates
+                    receipt = None
+                if receipt is not None:
+                    receipts[tx_hash] = receipt
+            if len(receipts) == len(tx_hashes):
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"{len(tx_hashes) - len(receipts)} approval transactions not mined after {timeout}s"
+                )
+            time.sleep(poll_interval)
+        return [receipts[tx_hash] for tx_hash in tx_hashes]
+
+    def send_missing(self, spenders=SPENDERS) -> "tuple[list, list]":
+        """Send the missing approvals without waiting; returns (missing, tx_hashes)."""
+        missing = self.missing(spenders)
+        if not missing:
+            print("All approvals already set")
+            return [], []
+
+        # nonces are assigned here so the transactions can go out without waiting in between
+        nonce = self.web3.eth.get_transaction_count(self.address, "pending")
+        gas_price = self.web3.eth.gas_price
+        tx_hashes = []
+        for i, (kind, spender) in enumerate(missing):
+            txn = self._build(kind, spender, nonce + i, gas_price)
+            signed = self.web3.eth.account.sign_transaction(
+                txn, private_key=self.private_key
+            )
+            tx_hash = self.web3.eth.send_raw_transaction(signed.raw_transaction)
+            print(f"Sent {kind} approval for {spender}: {Web3.to_hex(tx_hash)}")
+            tx_hashes.append(tx_hash)
+        return missing, tx_hashes
+
+    def _report(self, missing: list, receipts: list) -> None:
+        for (kind, spender), receipt in zip(missing, receipts):
+            status = "ok" if receipt["status"] == 1 else "FAILED"
+            print(
+                f"{kind} approval for {spender}: {status} in block {receipt['blockNumber']}"
+            )
+
+    def run(self, spenders=SPENDERS, timeout: float = 600) -> list:
+        """Send the missing approvals and return their receipts (empty if none were needed)."""
+        missing, tx_hashes = self.send_missing(spenders)
+        receipts = self.wait_for_receipts(tx_hashes, timeout)
+        self._report(missing, receipts)
+        return receipts
+
+    async def arun(self, async_chain, spenders=SPENDERS, timeout: float = 600) -> list:
+        """run() for an event loop: sends off the loop, then awaits receipts via `async_chain`."""
+        missing, tx_hashes = await asyncio.to_thread(self.send_missing, spenders)
+        receipts = await async_chain.wait_for_receipts(tx_hashes, timeout)
+        self._report(missing, receipts)
+        return receipts
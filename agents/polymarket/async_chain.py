@@ -0,0 +1,65 @@
+# async web3 backend for chain reads and receipt waits, so they can share an event loop
+# with gamma crawling and llm calls instead of blocking the process
+# AsyncHTTPProvider keeps one pooled aiohttp session per endpoint (and event loop)
+
+import asyncio
+import time
+
+from web3 import AsyncWeb3
+from web3.exceptions import TransactionNotFound
+from web3.middleware import async_geth_poa_middleware
+
+
+class AsyncChain:
+    def __init__(self, rpc_url: str, timeout: float = 10) -> None:
+        self.rpc_url = rpc_url
+        self.web3 = AsyncWeb3(
+            AsyncWeb3.AsyncHTTPProvider(rpc_url, request_kwargs={"timeout": timeout})
+        )
+        self.web3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+        self._contracts = {}
+
+    def contract(self, address: str, abi: str):
+        if address not in self._contracts:
+            self._contracts[address] = self.web3.eth.contract(
+                address=AsyncWeb3.to_checksum_address(address), abi=abi
+            )
+        return self._contracts[address]
+
+    async def block_number(self) -> int:
+        return await self.web3.eth.block_number
+
+    async def erc20_balance(self, token, address: str) -> int:
+        return await token.functions.balanceOf(address).call()
+
+    async def erc20_allowance(self, token, owner: str, spender: str) -> int:
+        return await token.functions.allowance(
+            owner, AsyncWeb3.to_checksum_address(spender)
+        ).call()
+
+    async def wait_for_receipt(
+        self, tx_hash, timeout: float = 600, poll_interval: float = 1.0
+    ) -> dict:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                receipt = await self.web3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                receipt = None
+            if receipt is not None:
+                return receipt
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Transaction {AsyncWeb3.to_hex(tx_hash)} not mined after {timeout}s"
+                )
+            await asyncio.sleep(poll_interval)
+
+    async def wait_for_receipts(
+        self, tx_hashes: list, timeout: float = 600, poll_interval: float = 1.0
+    ) -> list:
+        """Receipts for all transactions, polled concurrently; in the order given."""
+        return list(
+            await asyncio.gather(
+                *(self.wait_for_receipt(h, timeout, poll_interval) for h in tx_hashes)
+            )
+        )
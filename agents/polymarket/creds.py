@@ -0,0 +1,79 @@
+# encrypted on-disk cache of derived clob api credentials
+# deriving them is an authenticated round trip on every start; the cache is keyed and
+# encrypted (AES-GCM) with a key derived from the wallet's private key, so it is only
+# readable by the same wallet and a tampered or foreign file is simply ignored
+
+import hashlib
+import json
+import os
+
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+from py_clob_client.clob_types import ApiCreds
+
+
+def _key(private_key: str, host: str, chain_id: int) -> bytes:
+    material = (
+        f"clob-api-creds|{host}|{chain_id}|{private_key.lower().removeprefix('0x')}"
+    )
+    return hashlib.sha256(material.encode()).digest()
+
+
+class CredsCache:
+    def __init__(self, directory: str = "./local_cache") -> None:
+        self.directory = directory
+
+    def _path(self, address: str, host: str, chain_id: int) -> str:
+        name = hashlib.sha256(
+            f"{address.lower()}|{host}|{chain_id}".encode()
+        ).hexdigest()[:16]
+        return os.path.join(self.directory, f"clob_creds_{name}.bin")
+
+    def load(
+        self, private_key: str, address: str, host: str, chain_id: int
+    ) -> ApiCreds:
+        path = self._path(address, host, chain_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            blob = f.read()
+        nonce, tag, ciphertext = blob[:12], blob[12:28], blob[28:]
+        cipher = AES.new(_key(private_key, host, chain_id), AES.MODE_GCM, nonce=nonce)
+        try:
+            data = json.loads(cipher.decrypt_and_verify(ciphertext, tag))
+        except (ValueError, KeyError):
+            print("Ignoring unreadable cached API credentials")
+            return None
+        return ApiCreds(
+            api_key=data["api_key"],
+            api_secret=data["api_secret"],
+            api_passphrase=data["api_passphrase"],
+        )
+
+    def save(
+        self, private_key: str, address: str, host: str, chain_id: int, creds: ApiCreds
+    ) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        data = json.dumps(
+            {
+                "api_key": creds.api_key,
+                "api_secret": creds.api_secret,
+                "api_passphrase": creds.api_passphrase,
+            }
+        ).encode()
+        cipher = AES.new(
+            _key(private_key, host, chain_id), AES.MODE_GCM, nonce=get_random_bytes(12)
+        )
+        ciphertext, tag = cipher.encrypt_and_digest(data)
+        path = self._path(address, host, chain_id)
+        # written owner-only and swapped in atomically
+        tmp = path + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(cipher.nonce + tag + ciphertext)
+        os.replace(tmp, path)
+
+    def clear(self, address: str, host: str, chain_id: int) -> None:
+        path = self._path(address, host, chain_id)
+        if os.path.exists(path):
+            os.remove(path)
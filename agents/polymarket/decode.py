@@ -0,0 +1,92 @@
+# bulk decoding of gamma payloads into pydantic models
+# one validation pass per page instead of one model construction per record
+
+import gc
+import json
+from contextlib import contextmanager
+
+from pydantic import TypeAdapter, ValidationError
+
+from agents.utils.objects import Market, PolymarketEvent
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# returned as stringified json lists by the api
+STRINGIFIED_MARKET_FIELDS = ("outcomePrices", "clobTokenIds")
+
+_markets_adapter = TypeAdapter(list[Market])
+_events_adapter = TypeAdapter(list[PolymarketEvent])
+
+
+@contextmanager
+def _gc_paused():
+    # decoding allocates tens of thousands of acyclic containers, which otherwise
+    # triggers repeated full collections that cost more than the decode itself
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def loads(data):
+    """json.loads, backed by orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _as_records(payload) -> "list[dict]":
+    if isinstance(payload, (bytes, bytearray, memoryview, str)):
+        return loads(payload)
+    return payload
+
+
+def unstringify_market(market: dict) -> dict:
+    for field in STRINGIFIED_MARKET_FIELDS:
+        value = market.get(field)
+        if isinstance(value, str):
+            market[field] = loads(value)
+    return market
+
+
+def unstringify_event(event: dict) -> dict:
+    for market in event.get("markets") or ():
+        if isinstance(market, dict):
+            unstringify_market(market)
+    return event
+
+
+def _validate(adapter: TypeAdapter, model, records: "list[dict]", kind: str) -> list:
+    try:
+        return adapter.validate_python(records)
+    except ValidationError:
+        pass
+    # a bad record fails the whole batch, so redo it record by record and drop the failures
+    decoded, failed = [], 0
+    for record in records:
+        try:
+            decoded.append(model.model_validate(record))
+        except ValidationError:
+            failed += 1
+    print(f"[decode] skipped {failed} of {len(records)} invalid {kind}")
+    return decoded
+
+
+def decode_markets(payload) -> "list[Market]":
+    """Decode a gamma /markets page (raw bytes/str or already parsed list) into `Market`s."""
+    with _gc_paused():
+        records = [unstringify_market(m) for m in _as_records(payload)]
+        return _validate(_markets_adapter, Market, records, "markets")
+
+
+def decode_events(payload) -> "list[PolymarketEvent]":
+    """Decode a gamma /events page (raw bytes/str or already parsed list) into `PolymarketEvent`s."""
+    with _gc_paused():
+        records = [unstringify_event(e) for e in _as_records(payload)]
+        return _validate(_events_adapter, PolymarketEvent, records, "events")
@@ -0,0 +1,141 @@
+# pre-trade execution analytics over order book arrays
+# walks book levels with numpy to estimate the fill of a market order: vwap, slippage
+# and how much can be filled, for many books and many order sizes at once
+#
+# a BUY consumes asks and is sized in usdc (as MarketOrderArgs.amount is),
+# a SELL consumes bids and is sized in shares
+
+import numpy as np
+
+BUY = "BUY"
+SELL = "SELL"
+
+
+def pad_levels(books: "list", side: str = BUY) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Stack the levels a `side` order would consume from each OrderBook into (n_books, n_levels)
+    price and size matrices, best level first; short books are padded with price nan / size 0.
+    """
+    book_side = "SELL" if side == BUY else "BUY"
+    levels = [book.to_arrays(book_side) for book in books]
+    width = max((len(p) for p, _ in levels), default=0)
+    prices = np.full((len(levels), width), np.nan)
+    sizes = np.zeros((len(levels), width))
+    for i, (p, s) in enumerate(levels):
+        prices[i, : len(p)] = p
+        sizes[i, : len(s)] = s
+    return prices, sizes
+
+
+def _cumulative(prices: np.ndarray, sizes: np.ndarray):
+    notional = np.where(sizes > 0, prices * sizes, 0.0)
+    return np.cumsum(sizes, axis=-1), np.cumsum(notional, axis=-1)
+
+
+def estimate_fills(
+    prices: np.ndarray, sizes: np.ndarray, amounts, side: str = BUY
+) -> "dict[str, np.ndarray]":
+    """
+    Estimated fills of market orders of `amounts` against padded (n_books, n_levels) levels.
+
+    `amounts` is a scalar, an (n_sizes,) array applied to every book or an (n_books, n_sizes)
+    array; results are (n_books, n_sizes) arrays:
+    shares, notional (usdc), vwap, slippage_bps (vs. the best level, always >= 0),
+    filled (amount actually fillable, in the order's unit) and complete (fully fillable).
+    """
+    prices = np.atleast_2d(np.asarray(prices, dtype=np.float64))
+    sizes = np.atleast_2d(np.asarray(sizes, dtype=np.float64))
+    n_books, n_levels = prices.shape
+    amounts = np.asarray(amounts, dtype=np.float64)
+    if amounts.ndim < 2:
+        amounts = np.broadcast_to(np.atleast_1d(amounts), (n_books, amounts.size))
+
+    cum_shares, cum_notional = _cumulative(prices, sizes)
+    # the order is sized in usdc for buys and in shares for sells
+    cum_amount = cum_notional if side == BUY else cum_shares
+    total = cum_amount[:, -1:] if n_levels else np.zeros((n_books, 1))
+    filled = np.minimum(amounts, total)
+
+    # levels fully consumed before the partially filled one
+    consumed = (cum_amount[:, None, :] < filled[:, :, None]).sum(axis=-1)
+    rows = np.arange(n_books)[:, None]
+    prev = np.clip(consumed - 1, 0, None)
+    has_prev = consumed > 0
+    prev_shares = np.where(has_prev, cum_shares[rows, prev], 0.0) if n_levels else 0.0
+    prev_notional = (
+        np.where(has_prev, cum_notional[rows, prev], 0.0) if n_levels else 0.0
+    )
+    prev_amount = prev_notional if side == BUY else prev_shares
+
+    at = np.clip(consumed, 0, max(n_levels - 1, 0))
+    level_price = prices[rows, at] if n_levels else np.full(filled.shape, np.nan)
+    rest = np.clip(filled - prev_amount, 0, None)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if side == BUY:
+            shares = prev_shares + np.where(rest > 0, rest / level_price, 0.0)
+            notional = filled
+        else:
+            shares = filled
+            notional = prev_notional + np.where(rest > 0, rest * level_price, 0.0)
+        vwap = np.where(shares > 0, notional / shares, np.nan)
+        best = prices[:, :1] if n_levels else np.full((n_books, 1), np.nan)
+        if side == BUY:
+            slippage_bps = (vwap - best) / best * 1e4
+        else:
+            slippage_bps = (best - vwap) / best * 1e4
+
+    return {
+        "shares": shares,
+        "notional": notional,
+        "vwap": vwap,
+        "slippage_bps": slippage_bps,
+        "filled": filled,
+        "complete": filled >= amounts,
+    }
+
+
+def max_fill_within(
+    prices: np.ndarray, sizes: np.ndarray, max_slippage_bps: float, side: str = BUY
+) -> "np.ndarray":
+    """
+    Largest order (usdc for buys, shares for sells) per book whose vwap stays within
+    `max_slippage_bps` of the best level.
+    """
+    prices = np.atleast_2d(np.asarray(prices, dtype=np.float64))
+    sizes = np.atleast_2d(np.asarray(sizes, dtype=np.float64))
+    n_books, n_levels = prices.shape
+    if n_levels == 0:
+        return np.zeros(n_books)
+    best = prices[:, :1]
+    sign = 1.0 if side == BUY else -1.0
+    cap = best * (1 + sign * max_slippage_bps / 1e4)
+
+    cum_shares, cum_notional = _cumulative(prices, sizes)
+    # vwap only worsens level by level, so take whole levels while it stays within the cap...
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = cum_notional / cum_shares
+        ok = (sign * (cap - vwap) >= -1e-12) & (sizes > 0)
+    whole = np.cumprod(ok, axis=-1).sum(axis=-1)
+    rows = np.arange(n_books)
+    prev = np.clip(whole - 1, 0, None)
+    q0 = np.where(whole > 0, cum_shares[rows, prev], 0.0)
+    c0 = np.where(whole > 0, cum_notional[rows, prev], 0.0)
+
+    # ...then the part q of the next level with (c0 + p q) / (q0 + q) == cap
+    nxt = np.clip(whole, 0, n_levels - 1)
+    p = prices[rows, nxt]
+    available = np.where(whole < n_levels, sizes[rows, nxt], 0.0)
+    cap = cap[:, 0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        extra = (cap * q0 - c0) / (p - cap)
+    extra = np.clip(np.nan_to_num(extra, nan=0.0, posinf=0.0, neginf=0.0), 0, available)
+    if side == BUY:
+        return c0 + np.where(extra > 0, p * extra, 0.0)
+    return q0 + extra
+
+
+def estimate_fill(book, amount: float, side: str = BUY) -> dict:
+    """Fill estimate of a single market order against one OrderBook, as plain floats."""
+    prices, sizes = pad_levels([book], side)
+    fill = estimate_fills(prices, sizes, amount, side)
+    return {key: value[0, 0].item() for key, value in fill.items()}
@@ -1,8 +1,26 @@
-import httpx
+import asyncio
 import json
 
+import httpx
+
+from agents.polymarket.decode import (
+    decode_events,
+    decode_markets,
+    loads,
+    unstringify_event,
+    unstringify_market,
+)
+from agents.polymarket.pagination import DEFAULT_CONCURRENCY, aiter_offset_pages
 from agents.polymarket.polymarket import Polymarket
-from agents.utils.objects import Market, PolymarketEvent, ClobReward, Tag
+from agents.polymarket.store import MARKETS, get_gamma_store
+from agents.utils.http import (
+    get_async_http_client,
+    get_http_client,
+    iter_async,
+    run_sync,
+)
+from agents.utils.cache import NO_CACHE
+from agents.utils.objects import Market, PolymarketEvent
 
 
 class GammaMarketClient:
@@ -10,61 +28,26 @@ class GammaMarketClient:
         self.gamma_url = "https://gamma-api.polymarket.com"
         self.gamma_markets_endpoint = self.gamma_url + "/markets"
         self.gamma_events_endpoint = self.gamma_url + "/events"
+        self.http = get_http_client()
 
     def parse_pydantic_market(self, market_object: dict) -> Market:
         try:
-            if "clobRewards" in market_object:
-                clob_rewards: list[ClobReward] = []
-                for clob_rewards_obj in market_object["clobRewards"]:
-                    clob_rewards.append(ClobReward(**clob_rewards_obj))
-                market_object["clobRewards"] = clob_rewards
-
-            if "events" in market_object:
-                events: list[PolymarketEvent] = []
-                for market_event_obj in market_object["events"]:
-                    events.append(self.parse_nested_event(market_event_obj))
-                market_object["events"] = events
-
-            # These two fields below are returned as stringified lists from the api
-            if "outcomePrices" in market_object:
-                market_object["outcomePrices"] = json.loads(
-                    market_object["outcomePrices"]
-                )
-            if "clobTokenIds" in market_object:
-                market_object["clobTokenIds"] = json.loads(
-                    market_object["clobTokenIds"]
-                )
-
-            return Market(**market_object)
+            return Market.model_validate(unstringify_market(market_object))
         except Exception as err:
             print(f"[parse_market] Caught exception: {err}")
             print("exception while handling object:", market_object)
 
     # Event parser for events nested under a markets api response
     def parse_nested_event(self, event_object: dict()) -> PolymarketEvent:
-        print("[parse_nested_event] called with:", event_object)
         try:
-            if "tags" in event_object:
-                print("tags here", event_object["tags"])
-                tags: list[Tag] = []
-                for tag in event_object["tags"]:
-                    tags.append(Tag(**tag))
-                event_object["tags"] = tags
-
-            return PolymarketEvent(**event_object)
+            return PolymarketEvent.model_validate(event_object)
         except Exception as err:
             print(f"[parse_event] Caught exception: {err}")
             print("\n", event_object)
 
     def parse_pydantic_event(self, event_object: dict) -> PolymarketEvent:
         try:
-            if "tags" in event_object:
-                print("tags here", event_object["tags"])
-                tags: list[Tag] = []
-                for tag in event_object["tags"]:
-                    tags.append(Tag(**tag))
-                event_object["tags"] = tags
-            return PolymarketEvent(**event_object)
+            return PolymarketEvent.model_validate(unstringify_event(event_object))
         except Exception as err:
             print(f"[parse_event] Caught exception: {err}")
 
@@ -76,19 +59,16 @@ class GammaMarketClient:
                 'Cannot use "parse_pydantic" and "local_file" params simultaneously.'
             )
 
-        response = httpx.get(self.gamma_markets_endpoint, params=querystring_params)
+        response = self.http.get(self.gamma_markets_endpoint, params=querystring_params)
         if response.status_code == 200:
-            data = response.json()
+            data = loads(response.content)
             if local_file_path is not None:
                 with open(local_file_path, "w+") as out_file:
                     json.dump(data, out_file)
             elif not parse_pydantic:
                 return data
             else:
-                markets: list[Market] = []
-                for market_object in data:
-                    markets.append(self.parse_pydantic_market(market_object))
-                return markets
+                return decode_markets(data)
         else:
             print(f"Error response returned from api: HTTP {response.status_code}")
             raise Exception()
@@ -101,19 +81,16 @@ class GammaMarketClient:
                 'Cannot use "parse_pydantic" and "local_file" params simultaneously.'
             )
 
-        response = httpx.get(self.gamma_events_endpoint, params=querystring_params)
+        response = self.http.get(self.gamma_events_endpoint, params=querystring_params)
         if response.status_code == 200:
-            data = response.json()
+            data = loads(response.content)
             if local_file_path is not None:
                 with open(local_file_path, "w+") as out_file:
                     json.dump(data, out_file)
             elif not parse_pydantic:
                 return data
             else:
-                events: list[PolymarketEvent] = []
-                for market_event_obj in data:
-                    events.append(self.parse_event(market_event_obj))
-                return events
+                return decode_events(data)
         else:
             raise Exception()
 
@@ -133,25 +110,63 @@ class GammaMarketClient:
             }
         )
 
+    async def aiter_markets(
+        self,
+        querystring_params=None,
+        limit=100,
+        max_markets=None,
+        parse_pydantic=True,
+        concurrency=DEFAULT_CONCURRENCY,
+    ):
+        """
+        Stream markets page by page as they arrive, parsed into `Market` unless parse_pydantic=False.
+        Raises PageFetchError if a page cannot be fetched.
+        """
+        count = 0
+        pages = aiter_offset_pages(
+            self.gamma_markets_endpoint,
+            querystring_params,
+            limit=limit,
+            max_records=max_markets,
+            concurrency=concurrency,
+        )
+        try:
+            async for _, page in pages:
+                if parse_pydantic:
+                    page = decode_markets(page)
+                for market_object in page:
+                    yield market_object
+                    count += 1
+                    if max_markets is not None and count >= max_markets:
+                        return
+        finally:
+            await pages.aclose()
+
+    def iter_markets(self, *args, **kwargs):
+        """Synchronous variant of aiter_markets."""
+        return iter_async(self.aiter_markets(*args, **kwargs))
+
     def get_all_current_markets(self, limit=100) -> "list[Market]":
-        offset = 0
-        all_markets = []
-        while True:
-            params = {
-                "active": True,
-                "closed": False,
-                "archived": False,
-                "limit": limit,
-                "offset": offset,
-            }
-            market_batch = self.get_markets(querystring_params=params)
-            all_markets.extend(market_batch)
+        # like get_markets, a failed request raises (PageFetchError) instead of
+        # returning the markets fetched so far
+        params = {
+            "active": True,
+            "closed": False,
+            "archived": False,
+        }
+        return list(self.iter_markets(params, limit=limit, parse_pydantic=False))
 
-            if len(market_batch) < limit:
-                break
-            offset += limit
+    def sync_markets(self, limit=100) -> dict:
+        """Incrementally sync the local market store with the gamma api."""
+        return get_gamma_store().sync(MARKETS, self.gamma_markets_endpoint, limit=limit)
 
-        return all_markets
+    def get_synced_markets(self, sync=True, parse_pydantic=False) -> "list[Market]":
+        if sync:
+            self.sync_markets()
+        markets = get_gamma_store().all(MARKETS)
+        if not parse_pydantic:
+            return markets
+        return decode_markets(markets)
 
     def get_current_events(self, limit=4) -> "list[PolymarketEvent]":
         return self.get_events(
@@ -177,9 +192,77 @@ class GammaMarketClient:
     def get_market(self, market_id: int) -> dict():
         url = self.gamma_markets_endpoint + "/" + str(market_id)
         print(url)
-        response = httpx.get(url)
+        response = self.http.get(url, headers=NO_CACHE)
         return response.json()
 
+    async def aget_markets_by_ids(
+        self,
+        market_ids: "list[str]",
+        batch_size: int = 50,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> "dict[str, dict]":
+        """
+        Resolve many market ids at once with multi-id /markets queries.
+        Ids a batch query does not return, including every id of a batch that failed,
+        are looked up individually. Returns raw api markets keyed by id string; unknown
+        ids and ids whose lookup failed are left out.
+        """
+        ids = list(dict.fromkeys(str(x).strip() for x in market_ids if str(x).strip()))
+        client = get_async_http_client()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_batch(batch: "list[str]") -> "list[dict]":
+            params = [("id", market_id) for market_id in batch]
+            params.append(("limit", len(batch)))
+            try:
+                async with semaphore:
+                    response = await client.get(
+                        self.gamma_markets_endpoint, params=params, headers=NO_CACHE
+                    )
+            except httpx.HTTPError as e:
+                # the ids fall through to the per-market lookups below
+                print(f"Error fetching market batch: {e}")
+                return []
+            if response.status_code != 200:
+                print(f"Error response returned from api: HTTP {response.status_code}")
+                return []
+            return response.json()
+
+        async def fetch_one(market_id: str) -> dict:
+            try:
+                async with semaphore:
+                    response = await client.get(
+                        f"{self.gamma_markets_endpoint}/{market_id}", headers=NO_CACHE
+                    )
+            except httpx.HTTPError as e:
+                print(f"Error fetching market {market_id}: {e}")
+                return None
+            if response.status_code != 200:
+                return None
+            return response.json()
+
+        batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+        markets = {}
+        for page in await asyncio.gather(*(fetch_batch(b) for b in batches)):
+            for market in page:
+                markets[str(market.get("id"))] = market
+
+        missing = [market_id for market_id in ids if market_id not in markets]
+        if missing:
+            singles = await asyncio.gather(*(fetch_one(x) for x in missing))
+            for market_id, market in zip(missing, singles):
+                if market:
+                    markets[market_id] = market
+        return markets
+
+    def get_markets_by_ids(
+        self,
+        market_ids: "list[str]",
+        batch_size: int = 50,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> "dict[str, dict]":
+        return run_sync(self.aget_markets_by_ids(market_ids, batch_size, concurrency))
+
 
 if __name__ == "__main__":
     gamma = GammaMarketClient()
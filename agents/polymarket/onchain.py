@@ -0,0 +1,178 @@
+# batched on-chain wallet reads: usdc balance, usdc allowances and ctf operator approvals
+# for the exchange contracts, in one Multicall3 eth_call (or one JSON-RPC batch request
+# on chains without Multicall3, e.g. a fresh local dev node)
+
+from eth_abi import decode, encode
+from web3 import Web3
+
+from agents.utils.http import get_http_client
+from agents.utils.objects import WalletSnapshot
+
+# same address on polygon and most evm chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = """[{"inputs":[{"components":[{"internalType":"address","name":"target","type":"address"},{"internalType":"bool","name":"allowFailure","type":"bool"},{"internalType":"bytes","name":"callData","type":"bytes"}],"internalType":"struct Multicall3.Call3[]","name":"calls","type":"tuple[]"}],"name":"aggregate3","outputs":[{"components":[{"internalType":"bool","name":"success","type":"bool"},{"internalType":"bytes","name":"returnData","type":"bytes"}],"internalType":"struct Multicall3.Result[]","name":"returnData","type":"tuple[]"}],"stateMutability":"payable","type":"function"},{"inputs":[],"name":"getBlockNumber","outputs":[{"internalType":"uint256","name":"blockNumber","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"addr","type":"address"}],"name":"getEthBalance","outputs":[{"internalType":"uint256","name":"balance","type":"uint256"}],"stateMutability":"view","type":"function"}]"""
+
+# the view functions the reader needs, for contracts built outside Polymarket
+ERC20_READ_ABI = """[{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"balanceOf","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"}],"name":"allowance","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"}]"""
+CTF_READ_ABI = """[{"inputs":[{"internalType":"address","name":"account","type":"address"},{"internalType":"address","name":"operator","type":"address"}],"name":"isApprovedForAll","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"}]"""
+
+USDC_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+CTF_ADDRESS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
+CTF_EXCHANGE = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
+NEG_RISK_CTF_EXCHANGE = "0xC5d563A36AE78145C45a50134d48A1215220f80a"
+NEG_RISK_ADAPTER = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
+# contracts that need the usdc allowance and the ctf operator approval to trade
+SPENDERS = (CTF_EXCHANGE, NEG_RISK_CTF_EXCHANGE, NEG_RISK_ADAPTER)
+
+
+class WalletReader:
+    """Reads a WalletSnapshot with a single round trip."""
+
+    def __init__(
+        self, web3: Web3, usdc, ctf, multicall_address: str = MULTICALL3_ADDRESS
+    ) -> None:
+        self.web3 = web3
+        self.usdc = usdc
+        self.ctf = ctf
+        self.multicall = web3.eth.contract(
+            address=Web3.to_checksum_address(multicall_address), abi=MULTICALL3_ABI
+        )
+        self._has_multicall = None
+
+    @classmethod
+    def from_rpc(
+        cls,
+        rpc_url: str,
+        usdc_address: str = USDC_ADDRESS,
+        ctf_address: str = CTF_ADDRESS,
+        multicall_address: str = MULTICALL3_ADDRESS,
+    ) -> "WalletReader":
+        """Reader against any rpc endpoint, e.g. a local dev chain with its own token deployments."""
+        web3 = Web3(Web3.HTTPProvider(rpc_url))
+        usdc = web3.eth.contract(
+            address=Web3.to_checksum_address(usdc_address), abi=ERC20_READ_ABI
+        )
+        ctf = web3.eth.contract(
+            address=Web3.to_checksum_address(ctf_address), abi=CTF_READ_ABI
+        )
+        return cls(web3, usdc, ctf, multicall_address)
+
+    def _calls(self, address: str, spenders) -> "list[tuple[str, str, list[str]]]":
+        # (target, calldata, output types), in the order the snapshot is assembled
+        calls = [
+            (
+                self.multicall.address,
+                self.multicall.encodeABI(fn_name="getBlockNumber"),
+                ["uint256"],
+            ),
+            (
+                self.multicall.address,
+                self.multicall.encodeABI(fn_name="getEthBalance", args=[address]),
+                ["uint256"],
+            ),
+            (
+                self.usdc.address,
+                self.usdc.encodeABI(fn_name="balanceOf", args=[address]),
+                ["uint256"],
+            ),
+        ]
+        for spender in spenders:
+            calls.append(
+                (
+                    self.usdc.address,
+                    self.usdc.encodeABI(fn_name="allowance", args=[address, spender]),
+                    ["uint256"],
+                )
+            )
+        for spender in spenders:
+            calls.append(
+                (
+                    self.ctf.address,
+                    self.ctf.encodeABI(
+                        fn_name="isApprovedForAll", args=[address, spender]
+                    ),
+                    ["bool"],
+                )
+            )
+        return calls
+
+    def has_multicall(self) -> bool:
+        if self._has_multicall is None:
+            self._has_multicall = (
+                len(self.web3.eth.get_code(self.multicall.address)) > 0
+            )
+        return self._has_multicall
+
+    def _read_multicall(self, calls: list, block) -> "list[bytes]":
+        results = self.multicall.functions.aggregate3(
+            [(target, False, data) for target, data, _ in calls]
+        ).call(block_identifier=block)
+        return [data for _, data in results]
+
+    def _rpc(self, payload):
+        res = get_http_client().post(self.web3.provider.endpoint_uri, json=payload)
+        res.raise_for_status()
+        return res.json()
+
+    def _read_batch(self, calls: list, block, address: str) -> "list[bytes]":
+        # without Multicall3 the block number and native balance come from their own rpc methods
+        if isinstance(block, str) and not block.startswith("0x"):
+            # resolve a tag like "latest" first so every call in the batch reads the same block
+            item = self._rpc(
+                {"jsonrpc": "2.0", "id": 0, "method": "eth_blockNumber", "params": []}
+            )
+            if "error" in item:
+                raise RuntimeError(f"RPC error for eth_blockNumber: {item['error']}")
+            block = item["result"]
+        elif not isinstance(block, str):
+            block = hex(block)
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "eth_getBalance",
+                "params": [address, block],
+            },
+        ]
+        for i, (target, data, _) in enumerate(calls[2:], start=2):
+            payload.append(
+                {
+                    "jsonrpc": "2.0",
+                    "id": i,
+                    "method": "eth_call",
+                    "params": [{"to": target, "data": data}, block],
+                }
+            )
+        by_id = {0: block}
+        for item in self._rpc(payload):
+            if "error" in item:
+                raise RuntimeError(
+                    f"RPC error for call {item.get('id')}: {item['error']}"
+                )
+            by_id[item["id"]] = item["result"]
+        # the block number / eth_getBalance are quantities, re-encode them like call results
+        return [encode(["uint256"], [int(by_id[i], 16)]) for i in (0, 1)] + [
+            bytes.fromhex(by_id[i][2:]) for i in range(2, len(payload) + 1)
+        ]
+
+    def snapshot(
+        self, address: str, spenders=SPENDERS, block="latest"
+    ) -> WalletSnapshot:
+        address = Web3.to_checksum_address(address)
+        spenders = [Web3.to_checksum_address(s) for s in spenders]
+        calls = self._calls(address, spenders)
+        if self.has_multicall():
+            raw = self._read_multicall(calls, block)
+        else:
+            raw = self._read_batch(calls, block, address)
+        values = [decode(types, data)[0] for (_, _, types), data in zip(calls, raw)]
+
+        n = len(spenders)
+        return WalletSnapshot(
+            address=address,
+            block_number=values[0],
+            pol_balance=values[1],
+            usdc_balance=values[2],
+            usdc_allowances=dict(zip(spenders, values[3 : 3 + n])),
+            ctf_approvals=dict(zip(spenders, values[3 + n : 3 + 2 * n])),
+        )
@@ -0,0 +1,368 @@
+# local L2 order book mirror for clob tokens
+# a REST snapshot per token plus incremental price level updates from the market websocket
+# (or a replay file / any iterable of messages standing in for it)
+
+import asyncio
+import json
+import time
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+from py_clob_client.clob_types import OrderBookSummary, OrderSummary
+
+MARKET_CHANNEL_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+# seconds a mirrored book is trusted without a snapshot or a feed message
+MAX_BOOK_AGE = 5.0
+
+BID = "BUY"
+ASK = "SELL"
+
+
+def _levels(raw_levels) -> "list[tuple[float, float]]":
+    # levels come as OrderSummary objects from the sdk or {"price", "size"} dicts from the api
+    levels = []
+    for level in raw_levels or ():
+        if isinstance(level, dict):
+            price, size = level["price"], level["size"]
+        else:
+            price, size = level.price, level.size
+        levels.append((float(price), float(size)))
+    return levels
+
+
+class OrderBook:
+    """
+    One token's book as two price-sorted arrays per side (ascending for both, so the
+    best bid is the last bid level and the best ask the first ask level).
+    Finding a level is a binary search (O(log n)); inserting or removing one shifts the
+    tail of the array (O(n) in the levels on that side, a few dozen in practice).
+    A size of 0 removes the level.
+    """
+
+    __slots__ = (
+        "token_id",
+        "market",
+        "hash",
+        "timestamp",
+        "bid_prices",
+        "bid_sizes",
+        "ask_prices",
+        "ask_sizes",
+    )
+
+    def __init__(self, token_id: str, market: str = None) -> None:
+        self.token_id = token_id
+        self.market = market
+        self.hash = None
+        self.timestamp = None
+        self.bid_prices = array("d")
+        self.bid_sizes = array("d")
+        self.ask_prices = array("d")
+        self.ask_sizes = array("d")
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "OrderBook":
+        """Build from an sdk OrderBookSummary or a raw /book (or websocket "book") dict."""
+        if isinstance(snapshot, dict):
+            book = cls(snapshot.get("asset_id"), snapshot.get("market"))
+        else:
+            book = cls(snapshot.asset_id, snapshot.market)
+        book.apply_snapshot(snapshot)
+        return book
+
+    def copy(self) -> "OrderBook":
+        """Independent snapshot, safe to read while the mirror keeps applying updates."""
+        book = OrderBook(self.token_id, self.market)
+        book.hash = self.hash
+        book.timestamp = self.timestamp
+        book.bid_prices = array("d", self.bid_prices)
+        book.bid_sizes = array("d", self.bid_sizes)
+        book.ask_prices = array("d", self.ask_prices)
+        book.ask_sizes = array("d", self.ask_sizes)
+        return book
+
+    def _side(self, side: str) -> "tuple[array, array]":
+        if side.upper() in (BID, "BID", "BIDS"):
+            return self.bid_prices, self.bid_sizes
+        return self.ask_prices, self.ask_sizes
+
+    def apply_snapshot(self, snapshot) -> None:
+        get = (
+            snapshot.get
+            if isinstance(snapshot, dict)
+            else lambda k: getattr(snapshot, k, None)
+        )
+        for side, raw_levels in ((BID, get("bids")), (ASK, get("asks"))):
+            prices, sizes = self._side(side)
+            levels = sorted(l for l in _levels(raw_levels) if l[1] > 0)
+            prices[:] = array("d", [p for p, _ in levels])
+            sizes[:] = array("d", [s for _, s in levels])
+        self.hash = get("hash")
+        self.timestamp = get("timestamp")
+
+    def set_level(self, side: str, price: float, size: float) -> None:
+        prices, sizes = self._side(side)
+        price, size = float(price), float(size)
+        i = bisect_left(prices, price)
+        exists = i < len(prices) and prices[i] == price
+        if size <= 0:
+            if exists:
+                del prices[i]
+                del sizes[i]
+        elif exists:
+            sizes[i] = size
+        else:
+            prices.insert(i, price)
+            sizes.insert(i, size)
+
+    def best_bid(self) -> "tuple[float, float]":
+        if not self.bid_prices:
+            return None
+        return self.bid_prices[-1], self.bid_sizes[-1]
+
+    def best_ask(self) -> "tuple[float, float]":
+        if not self.ask_prices:
+            return None
+        return self.ask_prices[0], self.ask_sizes[0]
+
+    def mid(self) -> float:
+        if not self.bid_prices or not self.ask_prices:
+            return None
+        return (self.bid_prices[-1] + self.ask_prices[0]) / 2
+
+    def spread(self) -> float:
+        if not self.bid_prices or not self.ask_prices:
+            return None
+        return self.ask_prices[0] - self.bid_prices[-1]
+
+    def levels(self, side: str, n: int = None) -> "list[tuple[float, float]]":
+        """Top `n` levels of a side, best first."""
+        prices, sizes = self._side(side)
+        pairs = list(zip(prices, sizes))
+        if prices is self.bid_prices:
+            pairs.reverse()
+        return pairs if n is None else pairs[:n]
+
+    def depth(self, side: str, levels: int = None, price_limit: float = None) -> float:
+        """
+        Size resting on a side: the top `levels` levels, and/or only levels at or better
+        than `price_limit` (bids >= limit, asks <= limit).
+        """
+        prices, sizes = self._side(side)
+        if prices is self.bid_prices:
+            lo = 0 if price_limit is None else bisect_left(prices, price_limit)
+            if levels is not None:
+                lo = max(lo, len(prices) - levels)
+            return float(sum(sizes[lo:]))
+        hi = len(prices)
+        if price_limit is not None:
+            hi = bisect_left(prices, price_limit)
+            if hi < len(prices) and prices[hi] == price_limit:
+                hi += 1
+        if levels is not None:
+            hi = min(hi, levels)
+        return float(sum(sizes[:hi]))
+
+    def to_arrays(self, side: str) -> "tuple[np.ndarray, np.ndarray]":
+        """(prices, sizes) of a side as numpy arrays, best level first."""
+        prices, sizes = self._side(side)
+        # copies: a live buffer view would stop the arrays from being resized by updates
+        p = np.array(prices, dtype=np.float64)
+        s = np.array(sizes, dtype=np.float64)
+        if prices is self.bid_prices:
+            return p[::-1], s[::-1]
+        return p, s
+
+    def to_summary(self) -> OrderBookSummary:
+        # same shape and level order as the /book endpoint: best bid and best ask last
+        return OrderBookSummary(
+            market=self.market,
+            asset_id=self.token_id,
+            bids=[
+                OrderSummary(price=str(p), size=str(s))
+                for p, s in zip(self.bid_prices, self.bid_sizes)
+            ],
+            asks=[
+                OrderSummary(price=str(p), size=str(s))
+                for p, s in zip(reversed(self.ask_prices), reversed(self.ask_sizes))
+            ],
+            hash=self.hash,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"OrderBook({self.token_id!r}, bid={self.best_bid()}, ask={self.best_ask()}, "
+            f"levels={len(self.bid_prices)}/{len(self.ask_prices)})"
+        )
+
+
+class OrderBookMirror:
+    """
+    Books for a set of tokens, seeded from REST snapshots and kept current by applying
+    market channel messages ("book" replaces a book, "price_change" updates levels).
+    `snapshot_fn(token_id)` fetches a snapshot, e.g. ClobClient.get_order_book.
+    A book is fresh while its last snapshot, or the last feed message for its token, is
+    younger than `max_age`; a token the feed stopped updating goes stale and is
+    re-snapshotted.
+    """
+
+    def __init__(self, snapshot_fn=None, max_age: float = MAX_BOOK_AGE) -> None:
+        self.snapshot_fn = snapshot_fn
+        self.max_age = max_age
+        self.books: "dict[str, OrderBook]" = {}
+        self.updates = 0
+        # per token: time of the last snapshot and of the last feed message
+        self._snapshot_at: "dict[str, float]" = {}
+        self._message_at: "dict[str, float]" = {}
+
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self.books
+
+    def book(self, token_id: str) -> OrderBook:
+        return self.books.get(token_id)
+
+    def snapshot(self, token_id: str) -> OrderBook:
+        book = OrderBook.from_snapshot(self.snapshot_fn(token_id))
+        book.token_id = book.token_id or token_id
+        self.books[token_id] = book
+        self._snapshot_at[token_id] = time.monotonic()
+        return book
+
+    def is_fresh(self, token_id: str, max_age: float = None) -> bool:
+        max_age = self.max_age if max_age is None else max_age
+        seen = max(
+            self._snapshot_at.get(token_id, 0.0), self._message_at.get(token_id, 0.0)
+        )
+        return token_id in self.books and time.monotonic() - seen <= max_age
+
+    def fresh_book(self, token_id: str, max_age: float = None) -> OrderBook:
+        """The tracked book, re-snapshotted first if stale; None for untracked tokens."""
+        if token_id not in self.books:
+            return None
+        if not self.is_fresh(token_id, max_age):
+            return self.snapshot(token_id)
+        return self.books[token_id]
+
+    def track(self, token_ids: "list[str]") -> None:
+        for token_id in token_ids:
+            if token_id not in self.books:
+                self.snapshot(token_id)
+
+    def untrack(self, token_id: str) -> None:
+        self.books.pop(token_id, None)
+        self._snapshot_at.pop(token_id, None)
+        self._message_at.pop(token_id, None)
+
+    def apply(self, message) -> None:
+        """Apply one market channel message, or a list of them as the websocket sends."""
+        if isinstance(message, (str, bytes)):
+            message = json.loads(message)
+        if isinstance(message, list):
+            for m in message:
+                self.apply(m)
+            return
+        now = time.monotonic()
+        # a message for a token means the feed is alive for it and its book is current
+        for change in message.get("price_changes", ()):
+            self._message_at[change.get("asset_id")] = now
+        if message.get("asset_id"):
+            self._message_at[message["asset_id"]] = now
+        event_type = message.get("event_type")
+        if event_type == "book":
+            token_id = message["asset_id"]
+            if token_id in self.books:
+                self.books[token_id].apply_snapshot(message)
+            else:
+                self.books[token_id] = OrderBook.from_snapshot(message)
+        elif event_type == "price_change":
+            self._apply_price_change(message)
+        else:
+            # tick_size_change, last_trade_price, ... do not move levels
+            return
+        self.updates += 1
+
+    def _apply_price_change(self, message: dict) -> None:
+        # older messages carry one asset with "changes", newer ones "price_changes" per asset
+        if "price_changes" in message:
+            changes = message["price_changes"]
+        else:
+            changes = [
+                dict(c, asset_id=message.get("asset_id"))
+                for c in message.get("changes", ())
+            ]
+        for change in changes:
+            book = self.books.get(change.get("asset_id"))
+            if book is None:
+                continue
+            book.set_level(change["side"], change["price"], change["size"])
+            if change.get("hash") or message.get("hash"):
+                book.hash = change.get("hash") or message.get("hash")
+            book.timestamp = message.get("timestamp", book.timestamp)
+
+    def run(self, feed) -> int:
+        """Apply every message of a (sync) feed; returns how many were applied."""
+        count = 0
+        for message in feed:
+            self.apply(message)
+            count += 1
+        return count
+
+    async def arun(self, feed) -> int:
+        count = 0
+        async for message in feed:
+            self.apply(message)
+            count += 1
+        return count
+
+
+class ReplayFeed:
+    """Recorded market channel messages, one json message (or list of them) per line."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    async def __aiter__(self):
+        for message in self:
+            yield message
+
+
+class MarketChannelFeed:
+    """Live market channel messages for `token_ids` from the clob websocket."""
+
+    def __init__(
+        self,
+        token_ids: "list[str]",
+        url: str = MARKET_CHANNEL_URL,
+        ping_interval: float = 10,
+    ) -> None:
+        self.token_ids = list(token_ids)
+        self.url = url
+        self.ping_interval = ping_interval
+
+    async def __aiter__(self):
+        import websockets
+
+        async with websockets.connect(self.url, ping_interval=None) as ws:
+            await ws.send(json.dumps({"assets_ids": self.token_ids, "type": "market"}))
+
+            async def keepalive():
+                while True:
+                    await asyncio.sleep(self.ping_interval)
+                    await ws.send("PING")
+
+            pinger = asyncio.create_task(keepalive())
+            try:
+                async for raw in ws:
+                    if raw == "PONG":
+                        continue
+                    yield json.loads(raw)
+            finally:
+                pinger.cancel()
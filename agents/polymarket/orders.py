@@ -0,0 +1,188 @@
+# batch order submission and cancel-replace for requoting, on top of ClobClient
+# every submitted order gets a submit -> ack latency sample
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from py_clob_client.clob_types import OrderType, RequestArgs
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.headers.headers import create_level_2_headers
+from py_clob_client.http_helpers.helpers import post
+from py_clob_client.utilities import order_to_json
+
+from agents.utils.http import run_sync
+
+POST_ORDERS = "/orders"
+# orders accepted per POST /orders request
+MAX_BATCH = 15
+
+
+class LatencyTracker:
+    """Submit -> ack latency samples per order."""
+
+    def __init__(self, max_samples: int = 10000) -> None:
+        self.max_samples = max_samples
+        self.samples: "list[dict]" = []
+
+    def record(
+        self, token_id: str, order_id: str, latency: float, success: bool
+    ) -> None:
+        self.samples.append(
+            {
+                "token_id": token_id,
+                "order_id": order_id,
+                "latency_ms": round(latency * 1000, 2),
+                "success": success,
+            }
+        )
+        if len(self.samples) > self.max_samples:
+            del self.samples[: len(self.samples) - self.max_samples]
+
+    def stats(self) -> dict:
+        if not self.samples:
+            return {"orders": 0}
+        latencies = np.array([s["latency_ms"] for s in self.samples])
+        return {
+            "orders": len(latencies),
+            "failed": sum(1 for s in self.samples if not s["success"]),
+            "mean_ms": round(float(latencies.mean()), 2),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+            "max_ms": round(float(latencies.max()), 2),
+        }
+
+
+class OrderPipeline:
+    """
+    Posts signed orders in batches (POST /orders, MAX_BATCH per request, batches in parallel)
+    and cancels / replaces quotes in one step. If the batch endpoint is not available the
+    orders are posted one by one, still in parallel. Submissions go through the shared
+    request scheduler and are never retried.
+    """
+
+    def __init__(
+        self,
+        client,
+        scheduler,
+        host: str,
+        batch_size: int = MAX_BATCH,
+        max_workers: int = 8,
+    ) -> None:
+        self.client = client
+        self.scheduler = scheduler
+        self.host = host
+        self.batch_size = min(batch_size, MAX_BATCH)
+        self.batch_supported = True
+        self.latency = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _post_batch(self, orders: list, order_type: OrderType) -> list:
+        self.client.assert_level_2_auth()
+        body = [
+            order_to_json(order, self.client.creds.api_key, order_type)
+            for order in orders
+        ]
+        headers = create_level_2_headers(
+            self.client.signer,
+            self.client.creds,
+            RequestArgs(method="POST", request_path=POST_ORDERS, body=body),
+        )
+        return post(f"{self.client.host}{POST_ORDERS}", headers=headers, data=body)
+
+    def _submit(self, orders: list, order_type: OrderType) -> list:
+        # one chunk: a single batch request, or one post_order per order when batching is
+        # unavailable (possibly found out by another chunk after this one was cut)
+        if len(orders) > 1 and not self.batch_supported:
+            return [self._submit([order], order_type)[0] for order in orders]
+        start = time.monotonic()
+        try:
+            if len(orders) > 1:
+                try:
+                    responses = self.scheduler.call(
+                        self.host, self._post_batch, orders, order_type, retries=0
+                    )
+                except PolyApiException as e:
+                    if e.status_code not in (404, 405):
+                        raise
+                    if self.batch_supported:
+                        print(
+                            "Batch order endpoint unavailable, posting orders one by one"
+                        )
+                        self.batch_supported = False
+                    return self._submit(orders, order_type)
+            else:
+                responses = [
+                    self.scheduler.call(
+                        self.host,
+                        self.client.post_order,
+                        orders[0],
+                        order_type,
+                        retries=0,
+                    )
+                ]
+        except Exception as e:
+            responses = [{"success": False, "errorMsg": str(e)} for _ in orders]
+        latency = time.monotonic() - start
+
+        if not isinstance(responses, list):
+            responses = [responses]
+        for order, response in zip(orders, responses):
+            success = isinstance(response, dict) and response.get("success", True)
+            order_id = response.get("orderID") if isinstance(response, dict) else None
+            self.latency.record(
+                str(order.order["tokenId"]), order_id, latency, bool(success)
+            )
+        return responses
+
+    def post_orders(self, orders: list, order_type: OrderType = OrderType.GTC) -> list:
+        """Post signed orders; returns one response per order, in order."""
+        orders = list(orders)
+        size = self.batch_size if self.batch_supported else 1
+        chunks = [orders[i : i + size] for i in range(0, len(orders), size)]
+        responses = []
+        for chunk_responses in self._executor.map(
+            lambda chunk: self._submit(chunk, order_type), chunks
+        ):
+            responses.extend(chunk_responses)
+        return responses
+
+    async def apost_orders(
+        self, orders: list, order_type: OrderType = OrderType.GTC
+    ) -> list:
+        return await asyncio.to_thread(self.post_orders, orders, order_type)
+
+    async def acancel(self, order_ids: "list[str]"):
+        if not order_ids:
+            return None
+        return await asyncio.to_thread(
+            self.scheduler.call, self.host, self.client.cancel_orders, list(order_ids)
+        )
+
+    async def acancel_replace(
+        self,
+        cancel_ids: "list[str]",
+        new_orders: list,
+        order_type: OrderType = OrderType.GTC,
+        overlap: bool = False,
+    ) -> dict:
+        """
+        Cancel `cancel_ids` and post `new_orders`. By default the cancel is acknowledged
+        before the new quotes go out; overlap=True sends both at once, which is faster but
+        briefly leaves old and new quotes live together.
+        """
+        if overlap:
+            canceled, posted = await asyncio.gather(
+                self.acancel(cancel_ids), self.apost_orders(new_orders, order_type)
+            )
+        else:
+            canceled = await self.acancel(cancel_ids)
+            posted = await self.apost_orders(new_orders, order_type)
+        return {"canceled": canceled, "posted": posted}
+
+    def cancel_replace(self, *args, **kwargs) -> dict:
+        return run_sync(self.acancel_replace(*args, **kwargs))
+
+    def close(self) -> None:
+        self._executor.shutdown()
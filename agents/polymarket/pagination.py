@@ -0,0 +1,113 @@
+# concurrent offset pagination for the gamma api
+
+import asyncio
+import math
+from collections import deque
+
+import httpx
+
+from agents.utils.http import get_async_http_client, iter_async
+
+DEFAULT_CONCURRENCY = 8
+
+
+class PageFetchError(Exception):
+    """A page could not be fetched, so the crawl is incomplete."""
+
+    def __init__(self, url: str, offset: int, status_code: int) -> None:
+        super().__init__(
+            f"API request failed with status code: {status_code} (url={url}, offset={offset})"
+        )
+        self.url = url
+        self.offset = offset
+        self.status_code = status_code
+
+
+async def _fetch_page(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict,
+    offset: int,
+    limit: int,
+    headers: dict = None,
+):
+    page_params = dict(params)
+    page_params["limit"] = limit
+    page_params["offset"] = offset
+    res = await client.get(url, params=page_params, headers=headers)
+    if res.status_code != 200:
+        raise PageFetchError(url, offset, res.status_code)
+    return res.json()
+
+
+async def aiter_offset_pages(
+    url: str,
+    params: dict = None,
+    limit: int = 100,
+    max_records: int = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    start_offset: int = 0,
+    headers: dict = None,
+):
+    """
+    Yield (offset, page) tuples from an offset-paginated gamma endpoint, in offset order.
+
+    Pages are prefetched: the window starts at one page and doubles with every page
+    consumed, up to `concurrency` in flight, so a consumer that stops after a page or two
+    wastes few requests while a long crawl still runs at full concurrency. Iteration stops
+    at the first empty or short page, or once `max_records` worth of pages has been requested.
+    A failed page raises PageFetchError (after the transport's retries), so a crawl
+    that ends normally is always complete.
+    Closing the generator early cancels any pages still in flight.
+    """
+    params = params or {}
+    max_pages = math.ceil(max_records / limit) if max_records is not None else None
+    concurrency = max(1, concurrency)
+
+    client = get_async_http_client()
+    pending = deque()
+    next_offset = start_offset
+    scheduled = 0
+    window = 1
+
+    def schedule() -> None:
+        nonlocal next_offset, scheduled
+        while len(pending) < window and (max_pages is None or scheduled < max_pages):
+            task = asyncio.ensure_future(
+                _fetch_page(client, url, params, next_offset, limit, headers)
+            )
+            pending.append((next_offset, task))
+            next_offset += limit
+            scheduled += 1
+
+    try:
+        schedule()
+        while pending:
+            offset, task = pending.popleft()
+            page = await task
+            if not page:
+                break
+            yield offset, page
+            if len(page) < limit:
+                # last page
+                break
+            window = min(concurrency, window * 2)
+            schedule()
+    finally:
+        for _, task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+
+def iter_offset_pages(*args, **kwargs):
+    """
+    Synchronous wrapper around `aiter_offset_pages` for callers outside an event loop.
+    Pages are still fetched concurrently on a private event loop.
+    """
+    return iter_async(aiter_offset_pages(*args, **kwargs))
+
+
+def fetch_offset_pages(*args, **kwargs) -> "list[list[dict]]":
+    """Fetch every page of an offset-paginated endpoint, returned in offset order."""
+    return [page for _, page in iter_offset_pages(*args, **kwargs)]
@@ -2,6 +2,10 @@
 # https://github.com/Polymarket/py-clob-client/tree/main/examples
 
 import os
+import asyncio
+from functools import cached_property
+import json
+import math
 import pdb
 import time
 import ast
@@ -28,172 +32,195 @@ from py_clob_client.clob_types import (
 )
 from py_clob_client.order_builder.constants import BUY
 
-from agents.utils.objects import SimpleMarket, SimpleEvent
+from agents.utils.http import (
+    get_async_http_client,
+    get_http_client,
+    get_request_scheduler,
+    iter_async,
+    run_sync,
+)
+from agents.polymarket.orders import OrderPipeline
+from agents.polymarket.signing import SigningContext
+from agents.polymarket.pagination import DEFAULT_CONCURRENCY, aiter_offset_pages
+from agents.polymarket.execution import estimate_fill, max_fill_within, pad_levels
+from agents.polymarket.approvals import ApprovalsManager
+from agents.polymarket.async_chain import AsyncChain
+from agents.polymarket.creds import CredsCache
+from agents.polymarket.onchain import WalletReader
+from agents.polymarket.orderbook import OrderBook, OrderBookMirror
+from agents.polymarket.store import EVENTS, get_gamma_store
+from agents.polymarket.wallet import get_wallet_cache
+from agents.polymarket.tables import BookTable, EventTable, MarketTable
+from agents.utils.cache import NO_CACHE
+from agents.utils.objects import SimpleMarket, SimpleEvent, WalletSnapshot
 
 load_dotenv()
 
 
 class Polymarket:
-    def __init__(self) -> None:
+    def __init__(self, read_only: bool = False) -> None:
+        """
+        Chain and clob components are built on first use. With read_only=True no wallet
+        key is needed and no clob auth happens: gamma and public clob reads work, anything
+        that signs or touches the wallet raises.
+        """
         self.gamma_url = "https://gamma-api.polymarket.com"
         self.gamma_markets_endpoint = self.gamma_url + "/markets"
         self.gamma_events_endpoint = self.gamma_url + "/events"
 
         self.clob_url = "https://clob.polymarket.com"
         self.clob_auth_endpoint = self.clob_url + "/auth/api-key"
-
+        self.clob_host = "clob.polymarket.com"
+
+        self.http = get_http_client()
+        self.scheduler = get_request_scheduler()
+        # raw gamma markets by clob token id as (fetched_at, market), filled as markets are
+        # resolved; entries older than market_cache_ttl seconds are fetched again
+        self.markets_by_token_id = {}
+        self.market_cache_ttl = float(os.getenv("MARKET_CACHE_TTL", 30))
+        # local books for tokens passed to track_orderbooks, fed by apply_book_updates
+        self.orderbooks = OrderBookMirror(self._fetch_orderbook)
+
+        self.read_only = read_only
         self.chain_id = 137  # POLYGON
         self.private_key = os.getenv("POLYGON_WALLET_PRIVATE_KEY")
         
         # Validate required environment variables
-        if not self.private_key:
+        if not self.private_key and not read_only:
             raise EnvironmentError("Missing required environment variable: POLYGON_WALLET_PRIVATE_KEY")
         
         self.polygon_rpc = "https://polygon-rpc.com"
-        self.w3 = Web3(Web3.HTTPProvider(self.polygon_rpc))
 
         self.exchange_address = "0x4bfb41d5b3570defd03c39a9a4d8de6bd8b8982e"
         self.neg_risk_exchange_address = "0xC5d563A36AE78145C45a50134d48A1215220f80a"
 
         self.erc20_approve = """[{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"owner","type":"address"},{"indexed":true,"internalType":"address","name":"spender","type":"address"},{"indexed":false,"internalType":"uint256","name":"value","type":"uint256"}],"name":"Approval","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"authorizer","type":"address"},{"indexed":true,"internalType":"bytes32","name":"nonce","type":"bytes32"}],"name":"AuthorizationCanceled","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"authorizer","type":"address"},{"indexed":true,"internalType":"bytes32","name":"nonce","type":"bytes32"}],"name":"AuthorizationUsed","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"account","type":"address"}],"name":"Blacklisted","type":"event"},{"anonymous":false,"inputs":[{"indexed":false,"internalType":"address","name":"userAddress","type":"address"},{"indexed":false,"internalType":"address payable","name":"relayerAddress","type":"address"},{"indexed":false,"internalType":"bytes","name":"functionSignature","type":"bytes"}],"name":"MetaTransactionExecuted","type":"event"},{"anonymous":false,"inputs":[],"name":"Pause","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"newRescuer","type":"address"}],"name":"RescuerChanged","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"role","type":"bytes32"},{"indexed":true,"internalType":"bytes32","name":"previousAdminRole","type":"bytes32"},{"indexed":true,"internalType":"bytes32","name":"newAdminRole","type":"bytes32"}],"name":"RoleAdminChanged","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"role","type":"bytes32"},{"indexed":true,"internalType":"address","name":"account","type":"address"},{"indexed":true,"internalType":"address","name":"sender","type":"address"}],"name":"RoleGranted","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"bytes32","name":"role","type":"bytes32"},{"indexed":true,"internalType":"address","name":"account","type":"address"},{"indexed":true,"internalType":"address","name":"sender","type":"address"}],"name":"RoleRevoked","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"from","type":"address"},{"indexed":true,"internalType":"address","name":"to","type":"address"},{"indexed":false,"internalType":"uint256","name":"value","type":"uint256"}],"name":"Transfer","type":"event"},{"anonymous":false,"inputs":[{"indexed":true,"internalType":"address","name":"account","type":"address"}],"name":"UnBlacklisted","type":"event"},{"anonymous":false,"inputs":[],"name":"Unpause","type":"event"},{"inputs":[],"name":"APPROVE_WITH_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"BLACKLISTER_ROLE","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"CANCEL_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"DECREASE_ALLOWANCE_WITH_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"DEFAULT_ADMIN_ROLE","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"DEPOSITOR_ROLE","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"DOMAIN_SEPARATOR","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"EIP712_VERSION","outputs":[{"internalType":"string","name":"","type":"string"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"INCREASE_ALLOWANCE_WITH_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"META_TRANSACTION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"PAUSER_ROLE","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"PERMIT_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"RESCUER_ROLE","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"TRANSFER_WITH_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"WITHDRAW_WITH_AUTHORIZATION_TYPEHASH","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"}],"name":"allowance","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"approve","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"value","type":"uint256"},{"internalType":"uint256","name":"validAfter","type":"uint256"},{"internalType":"uint256","name":"validBefore","type":"uint256"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"approveWithAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"authorizer","type":"address"},{"internalType":"bytes32","name":"nonce","type":"bytes32"}],"name":"authorizationState","outputs":[{"internalType":"enum GasAbstraction.AuthorizationState","name":"","type":"uint8"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"balanceOf","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"blacklist","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"blacklisters","outputs":[{"internalType":"address[]","name":"","type":"address[]"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"authorizer","type":"address"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"cancelAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"decimals","outputs":[{"internalType":"uint8","name":"","type":"uint8"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"subtractedValue","type":"uint256"}],"name":"decreaseAllowance","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"decrement","type":"uint256"},{"internalType":"uint256","name":"validAfter","type":"uint256"},{"internalType":"uint256","name":"validBefore","type":"uint256"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"decreaseAllowanceWithAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"user","type":"address"},{"internalType":"bytes","name":"depositData","type":"bytes"}],"name":"deposit","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"userAddress","type":"address"},{"internalType":"bytes","name":"functionSignature","type":"bytes"},{"internalType":"bytes32","name":"sigR","type":"bytes32"},{"internalType":"bytes32","name":"sigS","type":"bytes32"},{"internalType":"uint8","name":"sigV","type":"uint8"}],"name":"executeMetaTransaction","outputs":[{"internalType":"bytes","name":"","type":"bytes"}],"stateMutability":"payable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"}],"name":"getRoleAdmin","outputs":[{"internalType":"bytes32","name":"","type":"bytes32"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"},{"internalType":"uint256","name":"index","type":"uint256"}],"name":"getRoleMember","outputs":[{"internalType":"address","name":"","type":"address"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"}],"name":"getRoleMemberCount","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"},{"internalType":"address","name":"account","type":"address"}],"name":"grantRole","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"},{"internalType":"address","name":"account","type":"address"}],"name":"hasRole","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"addedValue","type":"uint256"}],"name":"increaseAllowance","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"increment","type":"uint256"},{"internalType":"uint256","name":"validAfter","type":"uint256"},{"internalType":"uint256","name":"validBefore","type":"uint256"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"increaseAllowanceWithAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"string","name":"newName","type":"string"},{"internalType":"string","name":"newSymbol","type":"string"},{"internalType":"uint8","name":"newDecimals","type":"uint8"},{"internalType":"address","name":"childChainManager","type":"address"}],"name":"initialize","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"initialized","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"isBlacklisted","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"name","outputs":[{"internalType":"string","name":"","type":"string"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"}],"name":"nonces","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"pause","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"paused","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"pausers","outputs":[{"internalType":"address[]","name":"","type":"address[]"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"value","type":"uint256"},{"internalType":"uint256","name":"deadline","type":"uint256"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"permit","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"},{"internalType":"address","name":"account","type":"address"}],"name":"renounceRole","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"contract IERC20","name":"tokenContract","type":"address"},{"internalType":"address","name":"to","type":"address"},{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"rescueERC20","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"rescuers","outputs":[{"internalType":"address[]","name":"","type":"address[]"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"bytes32","name":"role","type":"bytes32"},{"internalType":"address","name":"account","type":"address"}],"name":"revokeRole","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"symbol","outputs":[{"internalType":"string","name":"","type":"string"}],"stateMutability":"view","type":"function"},{"inputs":[],"name":"totalSupply","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},{"inputs":[{"internalType":"address","name":"recipient","type":"address"},{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"transfer","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"sender","type":"address"},{"internalType":"address","name":"recipient","type":"address"},{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"transferFrom","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"from","type":"address"},{"internalType":"address","name":"to","type":"address"},{"internalType":"uint256","name":"value","type":"uint256"},{"internalType":"uint256","name":"validAfter","type":"uint256"},{"internalType":"uint256","name":"validBefore","type":"uint256"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"transferWithAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"unBlacklist","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[],"name":"unpause","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"string","name":"newName","type":"string"},{"internalType":"string","name":"newSymbol","type":"string"}],"name":"updateMetadata","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"uint256","name":"amount","type":"uint256"}],"name":"withdraw","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"owner","type":"address"},{"internalType":"uint256","name":"value","type":"uint256"},{"internalType":"uint256","name":"validAfter","type":"uint256"},{"internalType":"uint256","name":"validBefore","type":"uint256"},{"internalType":"bytes32","name":"nonce","type":"bytes32"},{"internalType":"uint8","name":"v","type":"uint8"},{"internalType":"bytes32","name":"r","type":"bytes32"},{"internalType":"bytes32","name":"s","type":"bytes32"}],"name":"withdrawWithAuthorization","outputs":[],"stateMutability":"nonpayable","type":"function"}]"""
-        self.erc1155_set_approval = """[{"inputs": [{ "internalType": "address", "name": "operator", "type": "address" },{ "internalType": "bool", "name": "approved", "type": "bool" }],"name": "setApprovalForAll","outputs": [],"stateMutability": "nonpayable","type": "function"}]"""
+        self.erc1155_set_approval = """[{"inputs": [{ "internalType": "address", "name": "operator", "type": "address" },{ "internalType": "bool", "name": "approved", "type": "bool" }],"name": "setApprovalForAll","outputs": [],"stateMutability": "nonpayable","type": "function"},{"inputs": [{ "internalType": "address", "name": "account", "type": "address" },{ "internalType": "address", "name": "operator", "type": "address" }],"name": "isApprovedForAll","outputs": [{ "internalType": "bool", "name": "", "type": "bool" }],"stateMutability": "view","type": "function"}]"""
 
         self.usdc_address = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
         self.ctf_address = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
 
-        self.web3 = Web3(Web3.HTTPProvider(self.polygon_rpc))
-        self.web3.middleware_onion.inject(geth_poa_middleware, layer=0)
-
-        self.usdc = self.web3.eth.contract(
-            address=self.usdc_address, abi=self.erc20_approve
-        )
-        self.ctf = self.web3.eth.contract(
-            address=self.ctf_address, abi=self.erc1155_set_approval
-        )
-
-        self._init_api_keys()
-        self._init_approvals(False)
+        self.creds_cache = CredsCache(os.getenv("CLOB_CREDS_CACHE_DIR", "./local_cache"))
+
+    def _require_wallet(self) -> None:
+        if self.read_only:
+            raise RuntimeError("Polymarket was created with read_only=True, wallet access is disabled")
+
+    @cached_property
+    def web3(self) -> Web3:
+        web3 = Web3(Web3.HTTPProvider(self.polygon_rpc))
+        web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        return web3
+
+    @property
+    def w3(self) -> Web3:
+        # same provider as self.web3, kept for existing callers
+        return self.web3
+
+    @cached_property
+    def async_chain(self) -> AsyncChain:
+        # async provider for balance reads and receipt waits inside an event loop
+        return AsyncChain(self.polygon_rpc)
+
+    @cached_property
+    def async_usdc(self):
+        return self.async_chain.contract(self.usdc_address, self.erc20_approve)
+
+    @cached_property
+    def usdc(self):
+        return self.web3.eth.contract(address=self.usdc_address, abi=self.erc20_approve)
+
+    @cached_property
+    def ctf(self):
+        return self.web3.eth.contract(address=self.ctf_address, abi=self.erc1155_set_approval)
+
+    @cached_property
+    def signing(self) -> SigningContext:
+        self._require_wallet()
+        return SigningContext(self.private_key, self.exchange_address, self.chain_id)
+
+    @cached_property
+    def wallet(self):
+        # balances and allowances, reused within a block and dropped after our own orders
+        return get_wallet_cache(self.web3, self.signing.address, self.async_chain)
+
+    @cached_property
+    def wallet_reader(self) -> WalletReader:
+        return WalletReader(self.web3, self.usdc, self.ctf)
+
+    @cached_property
+    def client(self) -> ClobClient:
+        if self.read_only:
+            # public endpoints (books, prices, sampling markets) need no auth
+            return ClobClient(self.clob_url, chain_id=self.chain_id)
+        client = ClobClient(self.clob_url, key=self.private_key, chain_id=self.chain_id)
+        client.set_api_creds(self._load_api_creds(client))
+        return client
+
+    @property
+    def credentials(self) -> ApiCreds:
+        return self.client.creds
+
+    @cached_property
+    def orders(self) -> OrderPipeline:
+        self._require_wallet()
+        return OrderPipeline(self.client, self.scheduler, self.clob_host)
+
+    def _load_api_creds(self, client: ClobClient) -> ApiCreds:
+        # derived creds are stable per wallet, so they are derived once and cached encrypted
+        address = self.signing.address
+        creds = self.creds_cache.load(self.private_key, address, self.clob_url, self.chain_id)
+        if creds is None:
+            creds = client.create_or_derive_api_creds()
+            self.creds_cache.save(self.private_key, address, self.clob_url, self.chain_id, creds)
+        return creds
+
+    def reset_api_creds(self) -> None:
+        """Drop the cached api creds (e.g. after they were revoked) and derive them again."""
+        self.creds_cache.clear(self.signing.address, self.clob_url, self.chain_id)
+        self.__dict__.pop("client", None)
+        self.__dict__.pop("orders", None)
+        self.client
 
     def _init_api_keys(self) -> None:
-        self.client = ClobClient(
-            self.clob_url, key=self.private_key, chain_id=self.chain_id
-        )
-        self.credentials = self.client.create_or_derive_api_creds()
-        self.client.set_api_creds(self.credentials)
-        # print(self.credentials)
+        # builds the authenticated client now instead of on first use
+        self.client
 
     def _init_approvals(self, run: bool = False) -> None:
         if not run:
             return
 
-        priv_key = self.private_key
-        pub_key = self.get_address_for_private_key()
-        chain_id = self.chain_id
-        web3 = self.web3
-        nonce = web3.eth.get_transaction_count(pub_key)
-        usdc = self.usdc
-        ctf = self.ctf
-
-        # CTF Exchange
-        raw_usdc_approve_txn = usdc.functions.approve(
-            "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E", int(MAX_INT, 0)
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_usdc_approve_tx = web3.eth.account.sign_transaction(
-            raw_usdc_approve_txn, private_key=priv_key
-        )
-        send_usdc_approve_tx = web3.eth.send_raw_transaction(
-            signed_usdc_approve_tx.raw_transaction
-        )
-        usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_usdc_approve_tx, 600
-        )
-        print(usdc_approve_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        raw_ctf_approval_txn = ctf.functions.setApprovalForAll(
-            "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E", True
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_ctf_approval_tx = web3.eth.account.sign_transaction(
-            raw_ctf_approval_txn, private_key=priv_key
-        )
-        send_ctf_approval_tx = web3.eth.send_raw_transaction(
-            signed_ctf_approval_tx.raw_transaction
-        )
-        ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_ctf_approval_tx, 600
-        )
-        print(ctf_approval_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        # Neg Risk CTF Exchange
-        raw_usdc_approve_txn = usdc.functions.approve(
-            "0xC5d563A36AE78145C45a50134d48A1215220f80a", int(MAX_INT, 0)
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_usdc_approve_tx = web3.eth.account.sign_transaction(
-            raw_usdc_approve_txn, private_key=priv_key
-        )
-        send_usdc_approve_tx = web3.eth.send_raw_transaction(
-            signed_usdc_approve_tx.raw_transaction
+        # only the approvals that are still missing are sent, all in the same block interval
+        manager = ApprovalsManager(
+            self.web3,
+            self.usdc,
+            self.ctf,
+            self.wallet_reader,
+            self.private_key,
+            self.get_address_for_private_key(),
+            self.chain_id,
         )
-        usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_usdc_approve_tx, 600
+        manager.run()
+        self.wallet.invalidate()
+
+    async def ainit_approvals(self) -> list:
+        """_init_approvals for an event loop: receipts are awaited on the async provider."""
+        manager = ApprovalsManager(
+            self.web3,
+            self.usdc,
+            self.ctf,
+            self.wallet_reader,
+            self.private_key,
+            self.get_address_for_private_key(),
+            self.chain_id,
         )
-        print(usdc_approve_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        raw_ctf_approval_txn = ctf.functions.setApprovalForAll(
-            "0xC5d563A36AE78145C45a50134d48A1215220f80a", True
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_ctf_approval_tx = web3.eth.account.sign_transaction(
-            raw_ctf_approval_txn, private_key=priv_key
-        )
-        send_ctf_approval_tx = web3.eth.send_raw_transaction(
-            signed_ctf_approval_tx.raw_transaction
-        )
-        ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_ctf_approval_tx, 600
-        )
-        print(ctf_approval_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        # Neg Risk Adapter
-        raw_usdc_approve_txn = usdc.functions.approve(
-            "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296", int(MAX_INT, 0)
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_usdc_approve_tx = web3.eth.account.sign_transaction(
-            raw_usdc_approve_txn, private_key=priv_key
-        )
-        send_usdc_approve_tx = web3.eth.send_raw_transaction(
-            signed_usdc_approve_tx.raw_transaction
-        )
-        usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_usdc_approve_tx, 600
-        )
-        print(usdc_approve_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        raw_ctf_approval_txn = ctf.functions.setApprovalForAll(
-            "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296", True
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_ctf_approval_tx = web3.eth.account.sign_transaction(
-            raw_ctf_approval_txn, private_key=priv_key
-        )
-        send_ctf_approval_tx = web3.eth.send_raw_transaction(
-            signed_ctf_approval_tx.raw_transaction
-        )
-        ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_ctf_approval_tx, 600
-        )
-        print(ctf_approval_tx_receipt)
+        receipts = await manager.arun(self.async_chain)
+        self.wallet.invalidate()
+        return receipts
 
     def get_all_markets(self) -> "list[SimpleMarket]":
         markets = []
-        res = httpx.get(self.gamma_markets_endpoint)
+        res = self.http.get(self.gamma_markets_endpoint)
         if res.status_code == 200:
             for market in res.json():
                 try:
@@ -204,7 +231,17 @@ class Polymarket:
                     pass
         return markets
 
+    def get_market_table(self, params: dict = None) -> MarketTable:
+        """Raw /markets response as a columnar MarketTable, for vectorized filters and sorts."""
+        res = self.http.get(self.gamma_markets_endpoint, params=params)
+        if res.status_code == 200:
+            return MarketTable.from_records(res.json())
+        print(f"API request failed with status code: {res.status_code}")
+        return MarketTable.from_records([])
+
     def filter_markets_for_trading(self, markets: "list[SimpleMarket]"):
+        if isinstance(markets, MarketTable):
+            return markets.filter(tradeable=True)
         tradeable_markets = []
         for market in markets:
             if market.active:
@@ -213,12 +250,82 @@ class Polymarket:
 
     def get_market(self, token_id: str) -> SimpleMarket:
         params = {"clob_token_ids": token_id}
-        res = httpx.get(self.gamma_markets_endpoint, params=params)
+        # always live: outcome prices feed order decisions, so never from a cache
+        res = self.http.get(self.gamma_markets_endpoint, params=params, headers=NO_CACHE)
         if res.status_code == 200:
             data = res.json()
             market = data[0]
+            self._remember_market_tokens(market)
             return self.map_api_to_market(market, token_id)
 
+    def _remember_market_tokens(self, market: dict) -> None:
+        token_ids = market.get("clobTokenIds") or "[]"
+        if isinstance(token_ids, str):
+            token_ids = json.loads(token_ids)
+        now = time.monotonic()
+        for token_id in token_ids:
+            self.markets_by_token_id[str(token_id)] = (now, market)
+
+    def _cached_market(self, token_id: str) -> dict:
+        entry = self.markets_by_token_id.get(token_id)
+        if entry is None or time.monotonic() - entry[0] > self.market_cache_ttl:
+            return None
+        return entry[1]
+
+    def clear_market_cache(self) -> None:
+        self.markets_by_token_id.clear()
+
+    async def aresolve_token_ids(
+        self,
+        token_ids: "list[str]",
+        batch_size: int = 50,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> "dict[str, dict]":
+        """
+        Raw gamma markets for many clob token ids, using multi-id `clob_token_ids` queries.
+        Results are kept in `markets_by_token_id` for `market_cache_ttl` seconds, so repeated
+        lookups within that window make no requests. Tokens of a failed batch are left out.
+        """
+        wanted = list(dict.fromkeys(str(x) for x in token_ids))
+        missing = [x for x in wanted if self._cached_market(x) is None]
+        if missing:
+            client = get_async_http_client()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def fetch_batch(batch: "list[str]") -> "list[dict]":
+                params = [("clob_token_ids", token_id) for token_id in batch]
+                params.append(("limit", len(batch)))
+                try:
+                    async with semaphore:
+                        res = await client.get(
+                            self.gamma_markets_endpoint, params=params, headers=NO_CACHE
+                        )
+                except httpx.HTTPError as e:
+                    # the batch's tokens are left out of the result, other batches still resolve
+                    print(f"Token id batch failed: {e}")
+                    return []
+                if res.status_code != 200:
+                    print(f"API request failed with status code: {res.status_code}")
+                    return []
+                return res.json()
+
+            batches = [missing[i : i + batch_size] for i in range(0, len(missing), batch_size)]
+            for page in await asyncio.gather(*(fetch_batch(b) for b in batches)):
+                for market in page:
+                    self._remember_market_tokens(market)
+        resolved = {x: self._cached_market(x) for x in wanted}
+        return {x: market for x, market in resolved.items() if market is not None}
+
+    def get_markets_by_token_ids(self, token_ids: "list[str]") -> "dict[str, dict]":
+        """Mapped markets (see map_api_to_market) keyed by token id; unknown or invalid ones are left out."""
+        markets = {}
+        for token_id, market in run_sync(self.aresolve_token_ids(token_ids)).items():
+            try:
+                markets[token_id] = self.map_api_to_market(market, token_id)
+            except ValueError as e:
+                print(f"Skipping market for token {token_id}: {e}")
+        return markets
+
     def map_api_to_market(self, market, token_id: str = "") -> SimpleMarket:
         # First check if market is active - this is the most important filter
         if not market.get("active", False):
@@ -257,7 +364,106 @@ class Polymarket:
             market_data["clob_token_ids"] = token_id
         return market_data
 
-    def get_all_events(self, tradeable_only: bool = False, limit: int = 100, max_events: int = None) -> "list[SimpleEvent]":
+    def _event_params(self, tradeable_only: bool) -> dict:
+        if not tradeable_only:
+            return {}
+        # Use API query parameters to filter at the source
+        return {
+            "active": True,
+            "closed": False,
+            "archived": False,
+        }
+
+    def parse_events(self, api_events: "list[dict]") -> "list[SimpleEvent]":
+        events = []
+        for event in api_events:
+            try:
+                event_data = self.map_api_to_event(event)
+                events.append(SimpleEvent(**event_data))
+            except Exception as e:
+                print(f"Error creating SimpleEvent for event {event.get('id', 'unknown')}: {e}")
+        return events
+
+    async def aiter_event_pages(
+        self,
+        tradeable_only: bool = False,
+        limit: int = 100,
+        max_events: int = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        """
+        Yield (offset, list[SimpleEvent]) per api page, in offset order, as pages arrive.
+        `max_events` counts parsed events: pages whose events fail to parse are topped up
+        with further pages until that many are parsed or the api runs out.
+        """
+        offset, parsed = 0, 0
+        while True:
+            remaining = None if max_events is None else max_events - parsed
+            pages = aiter_offset_pages(
+                self.gamma_events_endpoint,
+                self._event_params(tradeable_only),
+                limit=limit,
+                max_records=remaining,
+                concurrency=concurrency,
+                start_offset=offset,
+            )
+            last_page, n_pages = True, 0
+            try:
+                async for page_offset, api_events in pages:
+                    print(f"API returned {len(api_events)} events (offset={page_offset}, limit={limit}, tradeable_only={tradeable_only})")
+                    events = self.parse_events(api_events)
+                    parsed += len(events)
+                    offset = page_offset + limit
+                    last_page = len(api_events) < limit
+                    n_pages += 1
+                    yield page_offset, events
+            finally:
+                await pages.aclose()
+            # go on only when the page budget ran out because some events failed to parse
+            if remaining is None or last_page or parsed >= max_events:
+                return
+            if n_pages < math.ceil(remaining / limit):
+                # ended on an empty page
+                return
+
+    def iter_event_pages(self, *args, **kwargs):
+        return iter_async(self.aiter_event_pages(*args, **kwargs))
+
+    async def aiter_events(
+        self,
+        tradeable_only: bool = False,
+        limit: int = 100,
+        max_events: int = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        """
+        Stream events one by one as their pages arrive; memory is bounded to the pages in flight.
+        See get_all_events for the arguments.
+        """
+        total_fetched = 0
+        pages = self.aiter_event_pages(tradeable_only, limit, max_events, concurrency)
+        try:
+            async for _, events in pages:
+                for event in events:
+                    yield event
+                    total_fetched += 1
+                    # Stop if we've reached max_events
+                    if max_events is not None and total_fetched >= max_events:
+                        return
+        finally:
+            await pages.aclose()
+
+    def iter_events(self, *args, **kwargs):
+        """Synchronous variant of aiter_events."""
+        return iter_async(self.aiter_events(*args, **kwargs))
+
+    def get_all_events(
+        self,
+        tradeable_only: bool = False,
+        limit: int = 100,
+        max_events: int = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> "list[SimpleEvent]":
         """
         Get all events from Polymarket API with pagination support.
         
@@ -266,64 +472,13 @@ class Polymarket:
                           (active=True, closed=False, archived=False).
                           If False, return all events without API-level filtering.
             limit: Number of events to fetch per API request (default: 100).
-            max_events: Maximum total number of events to fetch. If None, fetches all available events.
+            max_events: Maximum total number of events to return (events that fail to parse do
+                        not count). If None, fetches all available events.
+            concurrency: Maximum number of pages fetched in parallel (default: 8).
+
+        Raises PageFetchError if a page fails, rather than returning a partial list.
         """
-        events = []
-        offset = 0
-        total_fetched = 0
-        
-        base_params = {}
-        if tradeable_only:
-            # Use API query parameters to filter at the source
-            base_params = {
-                "active": True,
-                "closed": False,
-                "archived": False,
-            }
-        
-        while True:
-            # Build request parameters with pagination
-            params = base_params.copy()
-            params["limit"] = limit
-            params["offset"] = offset
-            
-            res = httpx.get(self.gamma_events_endpoint, params=params)
-            if res.status_code == 200:
-                api_events = res.json()
-                batch_size = len(api_events)
-                
-                if batch_size == 0:
-                    # No more events available
-                    break
-                
-                print(f"API returned {batch_size} events (offset={offset}, limit={limit}, tradeable_only={tradeable_only})")
-                
-                for event in api_events:
-                    try:
-                        event_data = self.map_api_to_event(event)
-                        events.append(SimpleEvent(**event_data))
-                        total_fetched += 1
-                        # Stop if we've reached max_events
-                        if max_events is not None and total_fetched >= max_events:
-                            break
-                    except Exception as e:
-                        print(f"Error creating SimpleEvent for event {event.get('id', 'unknown')}: {e}")
-                        pass
-                
-                # Stop if we've reached max_events
-                if max_events is not None and total_fetched >= max_events:
-                    break
-                
-                # Stop if we got fewer events than requested (last page)
-                if batch_size < limit:
-                    break
-                
-                # Move to next page
-                offset += limit
-            else:
-                print(f"API request failed with status code: {res.status_code}")
-                break
-        
+        events = list(self.iter_events(tradeable_only, limit, max_events, concurrency))
         print(f"Total fetched: {len(events)} events")
         return events
 
@@ -364,6 +519,9 @@ class Polymarket:
     def filter_events_for_trading(
         self, events: "list[SimpleEvent]"
     ) -> "list[SimpleEvent]":
+        if isinstance(events, EventTable):
+            return self._filter_event_table_for_trading(events)
+
         tradeable_events = []
         filter_stats = {
             "not_active": 0,
@@ -399,152 +557,395 @@ class Polymarket:
         
         return tradeable_events
 
-    def get_all_tradeable_events(self, limit: int = 100, max_events: int = None, min_tradeable: int = 1) -> "list[SimpleEvent]":
+    def _filter_event_table_for_trading(self, events: EventTable) -> EventTable:
+        mask = events.mask(active=True, archived=False, closed=False)
+        if len(events) > 0:
+            print(f"\n=== Filtering Summary ===")
+            print(f"Total events: {len(events)}")
+            print(f"Filtered out - not active: {int((~events['active']).sum())}")
+            print(f"Filtered out - archived: {int(events['archived'].sum())}")
+            print(f"Filtered out - closed: {int(events['closed'].sum())}")
+            print(f"Tradeable events: {int(mask.sum())}")
+        return events.take(mask)
+
+    def get_event_table(
+        self,
+        tradeable_only: bool = False,
+        limit: int = 100,
+        max_events: int = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> EventTable:
+        """Raw events as a columnar EventTable; see get_all_events for the arguments."""
+        records = []
+        pages = iter_async(
+            aiter_offset_pages(
+                self.gamma_events_endpoint,
+                self._event_params(tradeable_only),
+                limit=limit,
+                max_records=max_events,
+                concurrency=concurrency,
+            )
+        )
+        for _, api_events in pages:
+            records.extend(api_events)
+        if max_events is not None:
+            records = records[:max_events]
+        return EventTable.from_records(records)
+
+    def get_all_tradeable_events(
+        self,
+        limit: int = 100,
+        max_events: int = None,
+        min_tradeable: int = 1,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> "list[SimpleEvent]":
         """
         Get all tradeable events. Uses API-level filtering and client-side filtering.
         Continues fetching until minimum number of tradeable events is found.
         
         Args:
             limit: Number of events to fetch per API request (default: 100).
-            max_events: Maximum total number of events to fetch from API. If None, fetches until min_tradeable is met.
+            max_events: Maximum total number of parsed events to fetch from API. If None, fetches until min_tradeable is met.
             min_tradeable: Minimum number of tradeable events to find before stopping (default: 1).
+            concurrency: Maximum number of pages fetched in parallel (default: 8). The pager
+                         starts with one page in flight and widens as pages are consumed, and
+                         pages still in flight are cancelled once a limit is reached.
         """
         tradeable_events = []
-        offset = 0
         total_fetched = 0
         max_total_fetch = max_events if max_events is not None else float('inf')
         
-        base_params = {
-            "active": True,
-            "closed": False,
-            "archived": False,
-        }
-        
-        while len(tradeable_events) < min_tradeable and total_fetched < max_total_fetch:
-            # Build request parameters with pagination
-            params = base_params.copy()
-            params["limit"] = limit
-            params["offset"] = offset
-            
-            res = httpx.get(self.gamma_events_endpoint, params=params)
-            if res.status_code == 200:
-                api_events = res.json()
-                batch_size = len(api_events)
-                
-                if batch_size == 0:
-                    # No more events available
-                    print(f"No more events available. Found {len(tradeable_events)} tradeable events.")
-                    break
-                
-                print(f"API returned {batch_size} events (offset={offset}, limit={limit}, tradeable_only=True)")
-                
-                # Convert API events to SimpleEvent objects
-                batch_events = []
-                for event in api_events:
-                    try:
-                        event_data = self.map_api_to_event(event)
-                        batch_events.append(SimpleEvent(**event_data))
-                        total_fetched += 1
-                    except Exception as e:
-                        print(f"Error creating SimpleEvent for event {event.get('id', 'unknown')}: {e}")
-                        pass
-                
+        # a failed page raises (PageFetchError) instead of returning a truncated list
+        pages = self.iter_event_pages(True, limit, max_events, concurrency)
+        try:
+            for _, batch_events in pages:
+                total_fetched += len(batch_events)
+
                 # Filter for tradeable events
                 filtered_batch = self.filter_events_for_trading(batch_events)
                 tradeable_events.extend(filtered_batch)
-                
+
                 print(f"Batch filtered: {len(filtered_batch)} tradeable out of {len(batch_events)} events")
                 print(f"Total tradeable so far: {len(tradeable_events)}")
-                
-                # Stop if we got fewer events than requested (last page)
-                if batch_size < limit:
-                    print(f"Reached end of available events. Found {len(tradeable_events)} tradeable events.")
-                    break
-                
+
                 # Stop if we've reached max_total_fetch
                 if total_fetched >= max_total_fetch:
                     print(f"Reached max fetch limit ({max_total_fetch}). Found {len(tradeable_events)} tradeable events.")
                     break
-                
-                # Move to next page
-                offset += limit
+
+                if len(tradeable_events) >= min_tradeable:
+                    break
             else:
-                print(f"API request failed with status code: {res.status_code}")
-                break
+                # Paginator stopped on an empty or short page
+                print(f"Reached end of available events. Found {len(tradeable_events)} tradeable events.")
+        finally:
+            pages.close()
         
         print(f"Total fetched: {total_fetched} events, Total tradeable: {len(tradeable_events)} events")
         return tradeable_events
 
+    def sync_events(self, limit: int = 100) -> dict:
+        """Incrementally sync the local event store with the gamma api."""
+        return get_gamma_store().sync(EVENTS, self.gamma_events_endpoint, limit=limit)
+
+    def get_synced_events(self, sync: bool = True) -> "list[SimpleEvent]":
+        """
+        Tradeable events from the local store, after pulling only the events
+        updated since the last sync.
+        """
+        if sync:
+            self.sync_events()
+        return self.parse_events(get_gamma_store().all(EVENTS))
+
     def get_sampling_simplified_markets(self) -> "list[SimpleEvent]":
-        markets = []
-        raw_sampling_simplified_markets = self.client.get_sampling_simplified_markets()
-        for raw_market in raw_sampling_simplified_markets["data"]:
-            token_one_id = raw_market["tokens"][0]["token_id"]
-            market = self.get_market(token_one_id)
-            markets.append(market)
-        return markets
+        raw_sampling_simplified_markets = self.scheduler.call(
+            self.clob_host, self.client.get_sampling_simplified_markets
+        )
+        token_ids = [
+            raw_market["tokens"][0]["token_id"]
+            for raw_market in raw_sampling_simplified_markets["data"]
+        ]
+        resolved = self.get_markets_by_token_ids(token_ids)
+        return [resolved[x] for x in token_ids if x in resolved]
+
+    def _fetch_orderbook(self, token_id: str) -> OrderBookSummary:
+        return self.scheduler.call(self.clob_host, self.client.get_order_book, token_id)
+
+    def track_orderbooks(self, token_ids: "list[str]") -> None:
+        """Snapshot these tokens' books into the local mirror; later reads are served locally."""
+        self.orderbooks.track(token_ids)
+
+    def apply_book_updates(self, feed) -> int:
+        """
+        Apply market channel messages from `feed` (a ReplayFeed, a list of messages, ...)
+        to the local mirror. For the live websocket use `orderbooks.arun(MarketChannelFeed(...))`.
+        """
+        return self.orderbooks.run(feed)
 
     def get_orderbook(self, token_id: str) -> OrderBookSummary:
-        return self.client.get_order_book(token_id)
+        book = self.orderbooks.fresh_book(token_id)
+        if book is not None:
+            return book.to_summary()
+        return self._fetch_orderbook(token_id)
 
-    def get_orderbook_price(self, token_id: str) -> float:
-        return float(self.client.get_price(token_id))
+    async def aget_orderbooks(
+        self,
+        token_ids: "list[str]",
+        batch_size: int = 100,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> "dict[str, OrderBook]":
+        """
+        Books for many tokens keyed by token id, fetched with batched POST /books requests.
+        Fresh books from the local mirror are served from it, as copies the feed does not
+        mutate; tokens a batch did not return (including every token of a failed batch)
+        are retried one by one with GET /book. Tokens whose lookup failed are left out.
+        """
+        wanted = list(dict.fromkeys(str(x) for x in token_ids))
+        # stale mirrored books are fetched like untracked ones
+        books = {
+            x: self.orderbooks.book(x).copy() for x in wanted if self.orderbooks.is_fresh(x)
+        }
+        missing = [x for x in wanted if x not in books]
+        client = get_async_http_client()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_batch(batch: "list[str]") -> "list[dict]":
+            try:
+                async with semaphore:
+                    res = await client.post(
+                        self.clob_url + "/books", json=[{"token_id": x} for x in batch]
+                    )
+            except httpx.HTTPError as e:
+                # the tokens fall through to the per-token lookups below
+                print(f"Order book batch failed: {e}")
+                return []
+            if res.status_code != 200:
+                print(f"Order book batch failed with status code: {res.status_code}")
+                return []
+            return res.json()
+
+        async def fetch_one(token_id: str) -> "list[dict]":
+            try:
+                async with semaphore:
+                    res = await client.get(
+                        self.clob_url + "/book", params={"token_id": token_id}
+                    )
+            except httpx.HTTPError as e:
+                print(f"No order book for token {token_id}: {e}")
+                return []
+            if res.status_code != 200:
+                print(f"No order book for token {token_id}: {res.status_code}")
+                return []
+            return [res.json()]
+
+        batches = [missing[i : i + batch_size] for i in range(0, len(missing), batch_size)]
+        for page in await asyncio.gather(*(fetch_batch(b) for b in batches)):
+            for raw in page:
+                book = OrderBook.from_snapshot(raw)
+                books[book.token_id] = book
+
+        missing = [x for x in missing if x not in books]
+        for page in await asyncio.gather(*(fetch_one(x) for x in missing)):
+            for raw in page:
+                book = OrderBook.from_snapshot(raw)
+                books[book.token_id] = book
+        return {x: books[x] for x in wanted if x in books}
+
+    def get_orderbooks(
+        self,
+        token_ids: "list[str]",
+        batch_size: int = 100,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> "dict[str, OrderBook]":
+        return run_sync(self.aget_orderbooks(token_ids, batch_size, concurrency))
+
+    def get_book_table(self, token_ids: "list[str]", depth_levels: int = 5) -> BookTable:
+        """Top-of-book and depth columns for many tokens, see BookTable."""
+        return BookTable.from_books(self.get_orderbooks(token_ids).values(), depth_levels)
+
+    def get_orderbook_price(self, token_id: str, side: str = BUY) -> float:
+        """
+        Best price on the `side` of the book (BUY: best bid, SELL: best ask), like the clob
+        price endpoint. Comes from the mirror for tracked tokens (re-snapshotted when stale);
+        otherwise, or when the mirrored book has no level on that side, from the clob.
+        """
+        book = self.orderbooks.fresh_book(token_id)
+        if book is not None:
+            best = book.best_bid() if side == BUY else book.best_ask()
+            if best is not None:
+                return best[0]
+        res = self.scheduler.call(self.clob_host, self.client.get_price, token_id, side)
+        return float(res["price"] if isinstance(res, dict) else res)
 
     def get_address_for_private_key(self):
-        account = self.w3.eth.account.from_key(str(self.private_key))
-        return account.address
+        return self.signing.address
 
     def build_order(
         self,
         market_token: str,
         amount: float,
-        nonce: str = str(round(time.time())),  # for cancellations
+        nonce: str = None,  # for cancellations, defaults to the current time
         side: str = "BUY",
         expiration: str = "0",  # timestamp after which order expires
     ):
-        signer = Signer(self.private_key)
-        builder = OrderBuilder(self.exchange_address, self.chain_id, signer)
-
-        buy = side == "BUY"
-        side = 0 if buy else 1
-        maker_amount = amount if buy else 0
-        taker_amount = amount if not buy else 0
-        order_data = OrderData(
-            maker=self.get_address_for_private_key(),
-            tokenId=market_token,
-            makerAmount=maker_amount,
-            takerAmount=taker_amount,
-            feeRateBps="1",
-            nonce=nonce,
-            side=side,
-            expiration=expiration,
-        )
-        order = builder.build_signed_order(order_data)
-        return order
+        order_data = self.signing.order_data(market_token, amount, side, nonce, expiration)
+        return self.signing.sign(order_data)
+
+    def build_orders(self, orders: "list[dict]", processes: int = None) -> list:
+        """
+        Sign many orders at once; each item holds build_order's keyword arguments.
+        Large batches are signed in parallel across a process pool.
+        """
+        order_data = [
+            self.signing.order_data(
+                order["market_token"],
+                order["amount"],
+                order.get("side", "BUY"),
+                order.get("nonce"),
+                order.get("expiration", "0"),
+            )
+            for order in orders
+        ]
+        return self.signing.sign_many(order_data, processes)
 
     def execute_order(self, price, size, side, token_id) -> str:
-        return self.client.create_and_post_order(
-            OrderArgs(price=price, size=size, side=side, token_id=token_id)
+        # order submission is not idempotent, so it is rate limited but never retried
+        resp = self.scheduler.call(
+            self.clob_host,
+            self.client.create_and_post_order,
+            OrderArgs(price=price, size=size, side=side, token_id=token_id),
+            retries=0,
         )
+        self.wallet.invalidate()
+        return resp
+
+    def _create_orders(self, orders: "list[dict]") -> list:
+        return [
+            self.client.create_order(
+                OrderArgs(
+                    price=o["price"], size=o["size"], side=o["side"], token_id=o["token_id"]
+                )
+            )
+            for o in orders
+        ]
+
+    def execute_orders(
+        self, orders: "list[dict]", order_type: OrderType = OrderType.GTC
+    ) -> list:
+        """
+        Sign and post many limit orders at once; each item holds execute_order's arguments
+        (price, size, side, token_id). Returns one response per order.
+        """
+        signed_orders = self._create_orders(orders)
+        resp = self.orders.post_orders(signed_orders, order_type)
+        self.wallet.invalidate()
+        return resp
+
+    def requote(
+        self,
+        cancel_ids: "list[str]",
+        orders: "list[dict]",
+        order_type: OrderType = OrderType.GTC,
+        overlap: bool = False,
+    ) -> dict:
+        """Cancel resting orders and post their replacements (see OrderPipeline.acancel_replace)."""
+        signed_orders = self._create_orders(orders)
+        resp = self.orders.cancel_replace(cancel_ids, signed_orders, order_type, overlap)
+        self.wallet.invalidate()
+        return resp
 
-    def execute_market_order(self, market, amount) -> str:
+    def estimate_market_order(self, token_id: str, amount: float, side: str = BUY) -> dict:
+        """
+        Expected fill of a market order from the current book (the local mirror when the
+        token is tracked): shares, notional, vwap, slippage_bps, filled and complete.
+        """
+        book = self.get_orderbooks([token_id]).get(str(token_id))
+        if book is None:
+            book = OrderBook(token_id)
+        return estimate_fill(book, amount, side)
+
+    def execute_market_order(self, market, amount, max_slippage_bps: float = None) -> str:
         token_id = ast.literal_eval(market[0].dict()["metadata"]["clob_token_ids"])[1]
+        if max_slippage_bps is not None:
+            # size the order down to what the book can fill within the slippage limit
+            book = self.get_orderbooks([token_id]).get(str(token_id)) or OrderBook(token_id)
+            fillable = float(max_fill_within(*pad_levels([book]), max_slippage_bps)[0])
+            if fillable < amount:
+                print(
+                    f"Reducing order from {amount} to {fillable:.2f} USDC to stay within {max_slippage_bps} bps"
+                )
+                amount = fillable
+            if amount <= 0:
+                print("No liquidity within the slippage limit, skipping order")
+                return None
+            estimate = estimate_fill(book, amount)
+            print(
+                f"Estimated fill: {estimate['shares']:.2f} shares at {estimate['vwap']:.4f} "
+                f"({estimate['slippage_bps']:.1f} bps slippage)"
+            )
         order_args = MarketOrderArgs(
             token_id=token_id,
             amount=amount,
         )
         signed_order = self.client.create_market_order(order_args)
         print("Execute market order... signed_order ", signed_order)
-        resp = self.client.post_order(signed_order, orderType=OrderType.FOK)
+        resp = self.scheduler.call(
+            self.clob_host,
+            self.client.post_order,
+            signed_order,
+            orderType=OrderType.FOK,
+            retries=0,
+        )
+        self.wallet.invalidate()
         print(resp)
         print("Done!")
         return resp
 
     def get_usdc_balance(self) -> float:
-        balance_res = self.usdc.functions.balanceOf(
-            self.get_address_for_private_key()
-        ).call()
-        return float(balance_res / 10e5)
+        def fetch() -> float:
+            balance_res = self.usdc.functions.balanceOf(
+                self.get_address_for_private_key()
+            ).call()
+            return float(balance_res / 10e5)
+
+        return self.wallet.get("usdc_balance", fetch)
+
+    async def aget_usdc_balance(self) -> float:
+        async def fetch() -> float:
+            balance_res = await self.async_chain.erc20_balance(
+                self.async_usdc, self.get_address_for_private_key()
+            )
+            return float(balance_res / 10e5)
+
+        return await self.wallet.aget("usdc_balance", fetch)
+
+    def get_wallet_snapshot(self, block="latest") -> WalletSnapshot:
+        """
+        USDC balance, USDC allowances and CTF approvals for the exchange contracts in one
+        batched read; the values also refresh the wallet cache.
+        """
+        snapshot = self.wallet_reader.snapshot(self.get_address_for_private_key(), block=block)
+        self.wallet.put("usdc_balance", float(snapshot.usdc_balance / 10e5), snapshot.block_number)
+        for spender, allowance in snapshot.usdc_allowances.items():
+            self.wallet.put(f"usdc_allowance:{spender.lower()}", allowance, snapshot.block_number)
+        return snapshot
+
+    def get_usdc_allowance(self, spender: str) -> int:
+        """Raw USDC allowance (6 decimals) granted to `spender`, cached like the balance."""
+        return self.wallet.get(
+            f"usdc_allowance:{spender.lower()}",
+            lambda: self.usdc.functions.allowance(
+                self.get_address_for_private_key(), Web3.to_checksum_address(spender)
+            ).call(),
+        )
+
+    async def aget_usdc_allowance(self, spender: str) -> int:
+        return await self.wallet.aget(
+            f"usdc_allowance:{spender.lower()}",
+            lambda: self.async_chain.erc20_allowance(
+                self.async_usdc, self.get_address_for_private_key(), spender
+            ),
+        )
 
 
 def test():
@@ -0,0 +1,99 @@
+# long-lived order signing state: one Signer / OrderBuilder / maker address per key,
+# plus batch signing spread over a process pool (EIP-712 hashing and signing is cpu bound)
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from py_order_utils.builders import OrderBuilder
+from py_order_utils.model import OrderData, SignedOrder
+from py_order_utils.signer import Signer
+
+# below this many orders a pool costs more to feed than it saves
+MIN_POOL_BATCH = 16
+
+_worker_context = None
+
+
+def _init_worker(private_key: str, exchange_address: str, chain_id: int) -> None:
+    global _worker_context
+    _worker_context = SigningContext(private_key, exchange_address, chain_id)
+
+
+def _sign_chunk(orders: "list[OrderData]") -> "list[SignedOrder]":
+    return [_worker_context.sign(order) for order in orders]
+
+
+class SigningContext:
+    """Signer, OrderBuilder and maker address for one private key and exchange, built once."""
+
+    def __init__(self, private_key: str, exchange_address: str, chain_id: int) -> None:
+        self.private_key = private_key
+        self.exchange_address = exchange_address
+        self.chain_id = chain_id
+        self.signer = Signer(private_key)
+        self.builder = OrderBuilder(exchange_address, chain_id, self.signer)
+        self.address = self.signer.address()
+        self._pool = None
+        self._pool_size = 0
+
+    def order_data(
+        self,
+        token_id: str,
+        amount: float,
+        side: str = "BUY",
+        nonce: str = None,
+        expiration: str = "0",
+        fee_rate_bps: str = "1",
+    ) -> OrderData:
+        buy = side == "BUY"
+        return OrderData(
+            maker=self.address,
+            tokenId=token_id,
+            makerAmount=amount if buy else 0,
+            takerAmount=amount if not buy else 0,
+            feeRateBps=fee_rate_bps,
+            # default evaluated per order, not once at import time
+            nonce=str(round(time.time())) if nonce is None else nonce,
+            side=0 if buy else 1,
+            expiration=expiration,
+        )
+
+    def sign(self, order: OrderData) -> SignedOrder:
+        return self.builder.build_signed_order(order)
+
+    def _get_pool(self, processes: int) -> ProcessPoolExecutor:
+        if self._pool is None or self._pool_size != processes:
+            self.close()
+            self._pool = ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker,
+                initargs=(self.private_key, self.exchange_address, self.chain_id),
+            )
+            self._pool_size = processes
+        return self._pool
+
+    def sign_many(
+        self, orders: "list[OrderData]", processes: int = None
+    ) -> "list[SignedOrder]":
+        """
+        Sign a batch of orders, keeping their order. With processes > 1 (default: one per core)
+        and a large enough batch the work is split across a reused process pool.
+        """
+        orders = list(orders)
+        processes = processes or os.cpu_count() or 1
+        if processes <= 1 or len(orders) < MIN_POOL_BATCH:
+            return [self.sign(order) for order in orders]
+        pool = self._get_pool(processes)
+        size = -(-len(orders) // processes)
+        chunks = [orders[i : i + size] for i in range(0, len(orders), size)]
+        signed = []
+        for chunk in pool.map(_sign_chunk, chunks):
+            signed.extend(chunk)
+        return signed
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_size = 0
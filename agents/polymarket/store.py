@@ -0,0 +1,214 @@
+# local gamma event/market store, kept in sync incrementally by updatedAt
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from agents.polymarket.pagination import iter_offset_pages
+from agents.utils.cache import NO_CACHE
+
+EVENTS = "events"
+MARKETS = "markets"
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse gamma's ISO timestamps, which come with a varying number of fraction digits."""
+    if not value:
+        return None
+    value = value.strip().replace("Z", "+00:00")
+    match = re.match(r"^(.*T\d{2}:\d{2}:\d{2})(\.\d+)?(.*)$", value)
+    if match:
+        head, fraction, tz = match.groups()
+        fraction = (fraction or ".0")[1:7].ljust(6, "0")
+        value = f"{head}.{fraction}{tz}"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def is_tradeable(record: dict) -> bool:
+    return (
+        bool(record.get("active"))
+        and not record.get("closed")
+        and not record.get("archived")
+    )
+
+
+class GammaStore:
+    """
+    Local copy of gamma events and markets in a sqlite file.
+
+    The first sync crawls every open record; later syncs page through records
+    ordered by updatedAt (newest first) and stop at the last sync's watermark,
+    upserting changed records and evicting ones that closed or were archived.
+    """
+
+    def __init__(self, path: str = "./local_cache/gamma_store.sqlite") -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                kind TEXT,
+                id TEXT,
+                updated_at TEXT,
+                data TEXT,
+                PRIMARY KEY (kind, id)
+            )
+            """
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS watermarks (
+                kind TEXT PRIMARY KEY,
+                updated_at TEXT,
+                synced_at REAL
+            )
+            """
+        )
+        self._db.commit()
+
+    def watermark(self, kind: str) -> datetime:
+        row = self._db.execute(
+            "SELECT updated_at FROM watermarks WHERE kind = ?", (kind,)
+        ).fetchone()
+        return parse_timestamp(row[0]) if row else None
+
+    def _set_watermark(self, kind: str, updated_at: datetime) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?)",
+            (kind, updated_at.isoformat(), time.time()),
+        )
+
+    def _upsert(self, kind: str, records: "list[dict]") -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)",
+            [(kind, str(r["id"]), r.get("updatedAt"), json.dumps(r)) for r in records],
+        )
+
+    def _evict(self, kind: str, ids: "list[str]") -> None:
+        self._db.executemany(
+            "DELETE FROM records WHERE kind = ? AND id = ?",
+            [(kind, str(x)) for x in ids],
+        )
+
+    def upsert(self, kind: str, records: "list[dict]") -> None:
+        with self._lock, self._db:
+            self._upsert(kind, records)
+
+    def evict(self, kind: str, ids: "list[str]") -> None:
+        with self._lock, self._db:
+            self._evict(kind, ids)
+
+    def all(self, kind: str) -> "list[dict]":
+        rows = self._db.execute(
+            "SELECT data FROM records WHERE kind = ? ORDER BY CAST(id AS INTEGER)",
+            (kind,),
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, kind: str) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM records WHERE kind = ?", (kind,)
+        ).fetchone()[0]
+
+    def reset(self, kind: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM records WHERE kind = ?", (kind,))
+            self._db.execute("DELETE FROM watermarks WHERE kind = ?", (kind,))
+
+    def sync(self, kind: str, endpoint: str, limit: int = 100) -> dict:
+        """Bring `kind` up to date from `endpoint`; returns upserted/evicted counts."""
+        watermark = self.watermark(kind)
+        if watermark is None:
+            return self._full_sync(kind, endpoint, limit)
+        return self._delta_sync(kind, endpoint, watermark, limit)
+
+    def _full_sync(self, kind: str, endpoint: str, limit: int) -> dict:
+        params = {"active": True, "closed": False, "archived": False}
+        records = []
+        # a failed page raises, so nothing below runs on a partial crawl
+        for _, page in iter_offset_pages(
+            endpoint, params, limit=limit, headers=NO_CACHE
+        ):
+            records.extend(r for r in page if is_tradeable(r))
+
+        newest = max(
+            (
+                parse_timestamp(r.get("updatedAt"))
+                for r in records
+                if r.get("updatedAt")
+            ),
+            default=datetime.now(timezone.utc),
+        )
+        # replace, upsert and watermark commit together or not at all
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM records WHERE kind = ?", (kind,))
+            self._upsert(kind, records)
+            self._set_watermark(kind, newest)
+        print(f"Full sync of {kind}: {len(records)} records")
+        return {"upserted": len(records), "evicted": 0, "full": True}
+
+    def _delta_sync(
+        self, kind: str, endpoint: str, watermark: datetime, limit: int
+    ) -> dict:
+        params = {"order": "updatedAt", "ascending": False}
+        changed, gone = [], []
+        newest = watermark
+        # "changed since" pages must be live, not up to a ttl old
+        pages = iter_offset_pages(
+            endpoint, params, limit=limit, concurrency=2, headers=NO_CACHE
+        )
+        done = False
+        # a failed page raises PageFetchError here, before the watermark moves; the crawl
+        # only gets past this loop by reaching the old watermark or a short last page
+        try:
+            for _, page in pages:
+                for record in page:
+                    updated_at = parse_timestamp(record.get("updatedAt"))
+                    if updated_at is None:
+                        continue
+                    if updated_at < watermark:
+                        done = True
+                        break
+                    newest = max(newest, updated_at)
+                    if is_tradeable(record):
+                        changed.append(record)
+                    else:
+                        gone.append(record["id"])
+                if done:
+                    break
+        finally:
+            pages.close()
+
+        with self._lock, self._db:
+            self._upsert(kind, changed)
+            self._evict(kind, gone)
+            self._set_watermark(kind, newest)
+        print(f"Delta sync of {kind}: {len(changed)} updated, {len(gone)} evicted")
+        return {"upserted": len(changed), "evicted": len(gone), "full": False}
+
+
+def get_gamma_store() -> GammaStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = GammaStore(
+                os.getenv("GAMMA_STORE_PATH", "./local_cache/gamma_store.sqlite")
+            )
+        return _store
@@ -0,0 +1,279 @@
+# columnar views over gamma pages for vectorized filtering and sorting
+# only rows that survive the filters are converted into pydantic objects
+
+import numpy as np
+
+from agents.utils.objects import SimpleEvent, SimpleMarket
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _float_column(records: "list[dict]", key: str) -> np.ndarray:
+    return np.array([_to_float(r.get(key)) for r in records], dtype=np.float64)
+
+
+def _bool_column(records: "list[dict]", key: str) -> np.ndarray:
+    return np.array([bool(r.get(key)) for r in records], dtype=bool)
+
+
+def _date_column(records: "list[dict]", key: str) -> np.ndarray:
+    # gamma dates are ISO strings; seconds resolution is enough for window filters
+    values = []
+    for r in records:
+        value = r.get(key)
+        values.append(value[:19] if isinstance(value, str) and value else "NaT")
+    try:
+        return np.array(values, dtype="datetime64[s]")
+    except ValueError:
+        return np.array([_to_datetime(v) for v in values], dtype="datetime64[s]")
+
+
+def _converts(convert, record) -> bool:
+    try:
+        convert(record)
+    except Exception:
+        return False
+    return True
+
+
+def _to_datetime(value: str) -> np.datetime64:
+    try:
+        return np.datetime64(value, "s")
+    except ValueError:
+        return np.datetime64("NaT")
+
+
+class _Table:
+    """Shared columnar machinery: a list of raw records plus one numpy array per column."""
+
+    columns: "tuple[str]" = ()
+
+    def __init__(self, records: "list[dict]", data: "dict[str, np.ndarray]") -> None:
+        self.records = records
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.data[column]
+
+    def take(self, indices: np.ndarray):
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        return type(self)(
+            [self.records[i] for i in indices],
+            {name: column[indices] for name, column in self.data.items()},
+        )
+
+    def head(self, n: int):
+        return self.take(np.arange(min(n, len(self))))
+
+    def top_k(self, column: str, k: int, descending: bool = True):
+        """Rows with the k largest (or smallest) values of `column`, sorted; NaNs last."""
+        values = self.data[column].astype(np.float64)
+        keys = -values if descending else values
+        keys = np.where(np.isnan(keys), np.inf, keys)
+        k = min(k, len(self))
+        if k <= 0:
+            return self.take(np.array([], dtype=np.int64))
+        if k < len(self):
+            candidates = np.argpartition(keys, k - 1)[:k]
+        else:
+            candidates = np.arange(len(self))
+        order = candidates[np.argsort(keys[candidates], kind="stable")]
+        return self.take(order)
+
+    def mask(
+        self,
+        active: bool = None,
+        closed: bool = None,
+        archived: bool = None,
+        min_liquidity: float = None,
+        end_after=None,
+        end_before=None,
+    ) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if active is not None:
+            mask &= self.data["active"] == active
+        if closed is not None:
+            mask &= self.data["closed"] == closed
+        if archived is not None:
+            mask &= self.data["archived"] == archived
+        if min_liquidity is not None:
+            mask &= self.data["liquidity"] >= min_liquidity
+        if end_after is not None:
+            mask &= self.data["end"] > np.datetime64(end_after, "s")
+        if end_before is not None:
+            mask &= self.data["end"] < np.datetime64(end_before, "s")
+        return mask
+
+
+class MarketTable(_Table):
+    @classmethod
+    def from_records(cls, records: "list[dict]") -> "MarketTable":
+        return cls(
+            records,
+            {
+                "id": np.array([int(r.get("id", 0)) for r in records], dtype=np.int64),
+                "active": _bool_column(records, "active"),
+                "closed": _bool_column(records, "closed"),
+                "archived": _bool_column(records, "archived"),
+                "has_clob_token_ids": _bool_column(records, "clobTokenIds"),
+                "liquidity": _float_column(records, "liquidity"),
+                "volume": _float_column(records, "volume"),
+                "spread": _float_column(records, "spread"),
+                "end": _date_column(records, "endDate"),
+            },
+        )
+
+    def mask(
+        self,
+        min_spread: float = None,
+        max_spread: float = None,
+        tradeable: bool = None,
+        **kwargs,
+    ) -> np.ndarray:
+        mask = super().mask(**kwargs)
+        if min_spread is not None:
+            mask &= self.data["spread"] >= min_spread
+        if max_spread is not None:
+            mask &= self.data["spread"] <= max_spread
+        if tradeable is not None:
+            is_tradeable = self.data["active"] & self.data["has_clob_token_ids"]
+            mask &= is_tradeable == tradeable
+        return mask
+
+    def filter(self, **kwargs) -> "MarketTable":
+        return self.take(self.mask(**kwargs))
+
+    def valid_mask(self, map_api_to_market) -> np.ndarray:
+        """Rows that convert into a SimpleMarket, i.e. the rows to_simple_markets keeps."""
+        return np.array(
+            [
+                _converts(lambda r: SimpleMarket(**map_api_to_market(r)), r)
+                for r in self.records
+            ],
+            dtype=bool,
+        )
+
+    def to_simple_markets(self, map_api_to_market) -> "list[SimpleMarket]":
+        """Build SimpleMarket rows with `Polymarket.map_api_to_market`, skipping invalid ones."""
+        markets = []
+        for record in self.records:
+            try:
+                markets.append(SimpleMarket(**map_api_to_market(record)))
+            except Exception as e:
+                print(e)
+        return markets
+
+
+class EventTable(_Table):
+    @classmethod
+    def from_records(cls, records: "list[dict]") -> "EventTable":
+        return cls(
+            records,
+            {
+                "id": np.array([int(r.get("id", 0)) for r in records], dtype=np.int64),
+                "active": _bool_column(records, "active"),
+                "closed": _bool_column(records, "closed"),
+                "archived": _bool_column(records, "archived"),
+                "restricted": _bool_column(records, "restricted"),
+                "liquidity": _float_column(records, "liquidity"),
+                "volume": _float_column(records, "volume"),
+                "n_markets": np.array(
+                    [len(r.get("markets") or []) for r in records], dtype=np.int64
+                ),
+                "end": _date_column(records, "endDate"),
+            },
+        )
+
+    def filter(self, **kwargs) -> "EventTable":
+        return self.take(self.mask(**kwargs))
+
+    def valid_mask(self, map_api_to_event) -> np.ndarray:
+        """Rows that convert into a SimpleEvent, i.e. the rows to_simple_events keeps."""
+        return np.array(
+            [
+                _converts(lambda r: SimpleEvent(**map_api_to_event(r)), r)
+                for r in self.records
+            ],
+            dtype=bool,
+        )
+
+    def to_simple_events(self, map_api_to_event) -> "list[SimpleEvent]":
+        events = []
+        for record in self.records:
+            try:
+                events.append(SimpleEvent(**map_api_to_event(record)))
+            except Exception as e:
+                print(
+                    f"Error creating SimpleEvent for event {record.get('id', 'unknown')}: {e}"
+                )
+        return events
+
+
+class BookTable(_Table):
+    """
+    One row per order book (records are `OrderBook`s) with top-of-book and depth columns,
+    for scanning liquidity and spreads across many tokens at once.
+    """
+
+    @classmethod
+    def from_books(cls, books: "list", depth_levels: int = 5) -> "BookTable":
+        books = list(books)
+        n = len(books)
+        best_bid = np.full(n, np.nan)
+        best_ask = np.full(n, np.nan)
+        bid_depth = np.zeros(n)
+        ask_depth = np.zeros(n)
+        # sizes[-0:] would be the whole side, so depth over 0 levels is left at 0
+        depth_levels = max(0, depth_levels)
+        for i, book in enumerate(books):
+            if book.bid_prices:
+                best_bid[i] = book.bid_prices[-1]
+                if depth_levels:
+                    bid_depth[i] = sum(book.bid_sizes[-depth_levels:])
+            if book.ask_prices:
+                best_ask[i] = book.ask_prices[0]
+                if depth_levels:
+                    ask_depth[i] = sum(book.ask_sizes[:depth_levels])
+        return cls(
+            books,
+            {
+                "best_bid": best_bid,
+                "best_ask": best_ask,
+                "mid": (best_bid + best_ask) / 2,
+                "spread": best_ask - best_bid,
+                "bid_depth": bid_depth,
+                "ask_depth": ask_depth,
+            },
+        )
+
+    def mask(
+        self,
+        max_spread: float = None,
+        min_bid_depth: float = None,
+        min_ask_depth: float = None,
+    ) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if max_spread is not None:
+            mask &= self.data["spread"] <= max_spread
+        if min_bid_depth is not None:
+            mask &= self.data["bid_depth"] >= min_bid_depth
+        if min_ask_depth is not None:
+            mask &= self.data["ask_depth"] >= min_ask_depth
+        return mask
+
+    def filter(self, **kwargs) -> "BookTable":
+        return self.take(self.mask(**kwargs))
+
+    @property
+    def token_ids(self) -> "list[str]":
+        return [book.token_id for book in self.records]
@@ -0,0 +1,100 @@
+# block-aware cache for wallet reads (usdc balance, allowances, ...)
+# values are reused until the chain moves to a new block or one of our own orders fills
+
+import threading
+import time
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+class WalletCache:
+    """
+    Values read from chain for one wallet, each tagged with the block it was read at.
+    The block number itself is polled at most every `block_ttl` seconds (about one polygon
+    block), so a burst of reads costs one `eth_blockNumber` call instead of one call per read.
+    """
+
+    def __init__(
+        self, web3, address: str, block_ttl: float = 2.0, async_chain=None
+    ) -> None:
+        self.web3 = web3
+        # AsyncChain used by the async readers (ablock_number / aget)
+        self.async_chain = async_chain
+        self.address = address
+        self.block_ttl = block_ttl
+        self.hits = 0
+        self.misses = 0
+        self._block = None
+        self._block_checked = 0.0
+        self._values: "dict[str, tuple[int, object]]" = {}
+        self._lock = threading.Lock()
+
+    def block_number(self) -> int:
+        now = time.monotonic()
+        if self._block is None or now - self._block_checked >= self.block_ttl:
+            self._block = self.web3.eth.block_number
+            self._block_checked = now
+        return self._block
+
+    async def ablock_number(self) -> int:
+        now = time.monotonic()
+        if self._block is None or now - self._block_checked >= self.block_ttl:
+            self._block = await self.async_chain.block_number()
+            self._block_checked = now
+        return self._block
+
+    def get(self, key: str, fetch):
+        """Cached value of `key` for the current block, calling `fetch()` on a miss."""
+        block = self.block_number()
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is not None and cached[0] == block:
+                self.hits += 1
+                return cached[1]
+        value = fetch()
+        with self._lock:
+            self._values[key] = (block, value)
+            self.misses += 1
+        return value
+
+    async def aget(self, key: str, fetch):
+        """Async get: `fetch` is a coroutine function and the block number is read async."""
+        block = await self.ablock_number()
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is not None and cached[0] == block:
+                self.hits += 1
+                return cached[1]
+        value = await fetch()
+        with self._lock:
+            self._values[key] = (block, value)
+            self.misses += 1
+        return value
+
+    def put(self, key: str, value, block: int = None) -> None:
+        with self._lock:
+            self._values[key] = (self.block_number() if block is None else block, value)
+
+    def invalidate(self, key: str = None) -> None:
+        """Drop one value, or everything (e.g. after our own order filled)."""
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+            # force the next read to look at the chain again
+            self._block_checked = 0.0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "block": self._block}
+
+
+def get_wallet_cache(web3, address: str, async_chain=None) -> WalletCache:
+    """One cache per wallet address, shared by every Polymarket instance in the process."""
+    with _caches_lock:
+        if address not in _caches:
+            _caches[address] = WalletCache(web3, address, async_chain=async_chain)
+        elif _caches[address].async_chain is None:
+            _caches[address].async_chain = async_chain
+        return _caches[address]
@@ -0,0 +1,285 @@
+# persistent http response cache for the gamma api (opt-in, GAMMA_CACHE=1)
+# plugs into the pooled httpx clients as a transport, so callers stay unchanged
+# requests sent with NO_CACHE headers (prices, trading reads, store syncs) always go to the api
+
+import asyncio
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import httpx
+
+GAMMA_HOST = "gamma-api.polymarket.com"
+
+# seconds a cached response is served without asking the server
+DEFAULT_TTLS = {
+    GAMMA_HOST + "/events": 60,
+    GAMMA_HOST + "/markets": 60,
+}
+
+# request headers that bypass the cache for one call
+NO_CACHE = {"Cache-Control": "no-cache"}
+
+# headers that describe the wire encoding, not the cached (decoded) body
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU store of GET responses in a sqlite file, keyed by url and query params.
+    Entries older than their endpoint TTL are revalidated with ETag / Last-Modified.
+    """
+
+    def __init__(
+        self,
+        path: str = "./local_cache/gamma_responses.sqlite",
+        ttls: "dict[str, float]" = None,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._db.commit()
+        self._size = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def ttl_for(self, url: httpx.URL) -> float:
+        # longest configured prefix wins, None means the url is not cached
+        target = url.host + url.path
+        matches = [prefix for prefix in self.ttls if target.startswith(prefix)]
+        if not matches:
+            return None
+        return self.ttls[max(matches, key=len)]
+
+    def key_for(self, url: httpx.URL) -> str:
+        params = sorted(url.params.multi_items())
+        raw = f"{url.host}{url.path}?{json.dumps(params)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> dict:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+        status, headers, body, etag, last_modified, stored_at = row
+        return {
+            "status": status,
+            "headers": json.loads(headers),
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": stored_at,
+        }
+
+    def put(
+        self, key: str, url: httpx.URL, response: httpx.Response, body: bytes
+    ) -> dict:
+        headers = [
+            (k, v)
+            for k, v in response.headers.multi_items()
+            if k.lower() not in _DROP_HEADERS
+        ]
+        now = time.time()
+        with self._lock:
+            old = self._db.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if old is not None:
+                self._size -= old[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    str(url),
+                    response.status_code,
+                    json.dumps(headers),
+                    body,
+                    response.headers.get("etag"),
+                    response.headers.get("last-modified"),
+                    now,
+                    now,
+                    len(body),
+                ),
+            )
+            self._size += len(body)
+            self._evict()
+            self._db.commit()
+        return {"status": response.status_code, "headers": headers, "body": body}
+
+    def refresh(self, key: str) -> None:
+        # a 304 restarts the ttl of the stored entry
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at ASC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._size -= row[1]
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._size = 0
+
+    def count(self, name: str) -> None:
+        # counters are bumped from several threads and event loops
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+            "size_bytes": self._size,
+        }
+
+    def lookup(self, request: httpx.Request):
+        """Return (key, entry, fresh) for a cacheable request, or None if it bypasses the cache."""
+        if request.method != "GET":
+            return None
+        if "no-cache" in request.headers.get("cache-control", ""):
+            return None
+        ttl = self.ttl_for(request.url)
+        if ttl is None:
+            return None
+        key = self.key_for(request.url)
+        entry = self.get(key)
+        fresh = entry is not None and time.time() - entry["stored_at"] < ttl
+        if entry is not None and not fresh:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+        return key, entry, fresh
+
+    def to_response(self, request: httpx.Request, entry: dict) -> httpx.Response:
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=entry["body"],
+            request=request,
+        )
+
+
+class CachingTransport(httpx.BaseTransport):
+    def __init__(self, cache: ResponseCache, transport: httpx.BaseTransport) -> None:
+        self.cache = cache
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        cached = self.cache.lookup(request)
+        if cached is None:
+            return self.transport.handle_request(request)
+        key, entry, fresh = cached
+        if fresh:
+            self.cache.count("hits")
+            return self.cache.to_response(request, entry)
+
+        response = self.transport.handle_request(request)
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            self.cache.refresh(key)
+            self.cache.count("revalidated")
+            return self.cache.to_response(request, entry)
+
+        self.cache.count("misses")
+        if response.status_code != 200:
+            return response
+        body = response.read()
+        response.close()
+        entry = self.cache.put(key, request.url, response, body)
+        return self.cache.to_response(request, entry)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCachingTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self, cache: ResponseCache, transport: httpx.AsyncBaseTransport
+    ) -> None:
+        self.cache = cache
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # sqlite reads and writes run in a worker thread, off the event loop
+        cached = await asyncio.to_thread(self.cache.lookup, request)
+        if cached is None:
+            return await self.transport.handle_async_request(request)
+        key, entry, fresh = cached
+        if fresh:
+            self.cache.count("hits")
+            return self.cache.to_response(request, entry)
+
+        response = await self.transport.handle_async_request(request)
+        if response.status_code == 304 and entry is not None:
+            await response.aclose()
+            await asyncio.to_thread(self.cache.refresh, key)
+            self.cache.count("revalidated")
+            return self.cache.to_response(request, entry)
+
+        self.cache.count("misses")
+        if response.status_code != 200:
+            return response
+        body = await response.aread()
+        await response.aclose()
+        entry = await asyncio.to_thread(
+            self.cache.put, key, request.url, response, body
+        )
+        return self.cache.to_response(request, entry)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
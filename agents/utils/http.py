@@ -0,0 +1,236 @@
+# shared pooled http clients
+# one keep-alive pool per process instead of a fresh TCP+TLS connection per request
+
+import os
+import threading
+import weakref
+import asyncio
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from agents.utils.cache import (
+    DEFAULT_TTLS,
+    AsyncCachingTransport,
+    CachingTransport,
+    ResponseCache,
+)
+from agents.utils.ratelimit import (
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+    RequestScheduler,
+)
+
+_lock = threading.Lock()
+_client: httpx.Client = None
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+) = weakref.WeakKeyDictionary()
+_session: requests.Session = None
+# event loop (in a daemon thread) that runs async work for sync callers
+_loop: asyncio.AbstractEventLoop = None
+_loop_thread: threading.Thread = None
+_cache: ResponseCache = None
+_scheduler: RequestScheduler = None
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def http2_enabled() -> bool:
+    # HTTP/2 needs the optional `h2` package
+    if os.getenv("HTTP_HTTP2", "0").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print("HTTP_HTTP2 is set but the h2 package is not installed, using HTTP/1.1")
+        return False
+    return True
+
+
+def get_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_env_int("HTTP_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=_env_int("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20),
+        keepalive_expiry=_env_float("HTTP_KEEPALIVE_EXPIRY", 30.0),
+    )
+
+
+def get_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        _env_float("HTTP_TIMEOUT", 10.0),
+        connect=_env_float("HTTP_CONNECT_TIMEOUT", 5.0),
+    )
+
+
+def get_response_cache() -> ResponseCache:
+    """On-disk gamma response cache when enabled with GAMMA_CACHE=1, otherwise None."""
+    global _cache
+    if os.getenv("GAMMA_CACHE", "0").lower() not in ("1", "true", "yes"):
+        return None
+    if _cache is None:
+        ttls = None
+        if os.getenv("GAMMA_CACHE_TTL"):
+            ttl = float(os.getenv("GAMMA_CACHE_TTL"))
+            ttls = {prefix: ttl for prefix in DEFAULT_TTLS}
+        _cache = ResponseCache(
+            path=os.getenv("GAMMA_CACHE_PATH", "./local_cache/gamma_responses.sqlite"),
+            ttls=ttls,
+            max_bytes=_env_int("GAMMA_CACHE_MAX_BYTES", 256 * 1024 * 1024),
+        )
+    return _cache
+
+
+def get_request_scheduler() -> RequestScheduler:
+    """Per-host rate limits, adaptive concurrency and retries shared by every http call."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RequestScheduler(
+            # 0 = no fixed cap, throughput is found by the AIMD concurrency limit
+            rate=_env_float("HTTP_RATE_LIMIT", 0.0),
+            burst=_env_float("HTTP_RATE_BURST", 20.0),
+            concurrency=_env_int("HTTP_INITIAL_CONCURRENCY", 8),
+            max_concurrency=_env_int("HTTP_MAX_CONCURRENCY", 32),
+            max_retries=_env_int("HTTP_MAX_RETRIES", 4),
+        )
+    return _scheduler
+
+
+# cache sits outside the scheduler so cache hits cost no rate limit tokens
+def _transport() -> httpx.BaseTransport:
+    transport = httpx.HTTPTransport(http2=http2_enabled(), limits=get_limits())
+    transport = RateLimitedTransport(get_request_scheduler(), transport)
+    cache = get_response_cache()
+    if cache is not None:
+        transport = CachingTransport(cache, transport)
+    return transport
+
+
+def _async_transport() -> httpx.AsyncBaseTransport:
+    transport = httpx.AsyncHTTPTransport(http2=http2_enabled(), limits=get_limits())
+    transport = AsyncRateLimitedTransport(get_request_scheduler(), transport)
+    cache = get_response_cache()
+    if cache is not None:
+        transport = AsyncCachingTransport(cache, transport)
+    return transport
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide pooled sync client, safe to share between threads."""
+    global _client
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(transport=_transport(), timeout=get_timeout())
+        return _client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Pooled async client for the running event loop.
+    Connections are bound to the loop that opened them, so each loop gets its own pool.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                transport=_async_transport(), timeout=get_timeout()
+            )
+            _async_clients[loop] = client
+        return client
+
+
+async def close_async_http_client() -> None:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is None or _loop.is_closed() or not _loop_thread.is_alive():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever, name="http-event-loop", daemon=True
+            )
+            _loop_thread.start()
+        return _loop
+
+
+def run_sync(coro):
+    """
+    Run a coroutine from synchronous code on the shared background event loop.
+    The loop lives for the whole process, so its pooled async client and keep-alive
+    connections are reused across calls. Safe to call from several threads at once.
+    """
+    loop = _background_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError(
+            "run_sync called on the background event loop, await instead"
+        )
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        # e.g. KeyboardInterrupt while waiting: stop the work on the loop as well
+        future.cancel()
+        raise
+
+
+def iter_async(agen):
+    """
+    Drive an async generator from synchronous code on the shared background event loop,
+    so its work (e.g. concurrent page fetches) still overlaps.
+    """
+
+    async def next_item():
+        return await agen.__anext__()
+
+    try:
+        while True:
+            try:
+                yield run_sync(next_item())
+            except StopAsyncIteration:
+                break
+    finally:
+        run_sync(agen.aclose())
+
+
+def get_requests_session() -> requests.Session:
+    """Pooled `requests` session for third party SDKs that accept one (e.g. NewsAPI)."""
+    global _session
+    with _lock:
+        if _session is None:
+            limits = get_limits()
+            adapter = HTTPAdapter(
+                pool_connections=limits.max_keepalive_connections,
+                pool_maxsize=limits.max_connections,
+            )
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def close_http_clients() -> None:
+    global _client, _session
+    if _loop is not None and not _loop.is_closed() and _loop_thread.is_alive():
+        run_sync(close_async_http_client())
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -226,3 +226,24 @@ class Article(BaseModel):
     urlToImage: Optional[str]
     publishedAt: Optional[str]
     content: Optional[str]
+
+
+class WalletSnapshot(BaseModel):
+    address: str
+    block_number: int
+    pol_balance: int  # wei
+    usdc_balance: int  # 6 decimals
+    usdc_allowances: dict[str, int]  # spender -> raw allowance
+    ctf_approvals: dict[str, bool]  # operator -> isApprovedForAll
+
+    @property
+    def usdc(self) -> float:
+        return self.usdc_balance / 10**6
+
+    def missing_approvals(self, min_allowance: int = 2**255) -> "list[tuple[str, str]]":
+        """(kind, spender) pairs still to approve: kind is "usdc" or "ctf"."""
+        missing = [
+            ("usdc", s) for s, v in self.usdc_allowances.items() if v < min_allowance
+        ]
+        missing += [("ctf", s) for s, ok in self.ctf_approvals.items() if not ok]
+        return missing
@@ -0,0 +1,366 @@
+# shared request scheduler: per-host token bucket, AIMD concurrency limit and retry with backoff
+# used as an httpx transport for gamma/clob http calls and as a wrapper for sdk calls (ClobClient)
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+# statuses worth retrying; 429 and 503 also mean "slow down"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def is_retryable(request: httpx.Request, status: int) -> bool:
+    # a 429 was rejected before processing, anything else is only safe to resend if idempotent
+    if status == 429:
+        return True
+    if status is not None and status not in RETRY_STATUSES:
+        return False
+    return request.method in IDEMPOTENT_METHODS
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+def parse_retry_after(value: str) -> float:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _set_waiter(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class TokenBucket:
+    """Requests per second cap; a rate of 0 (or less) means no cap."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token, returning how long the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit that grows by one slot per window of successful requests
+    and halves when the server throttles us.
+    """
+
+    def __init__(self, initial: int = 8, minimum: int = 1, maximum: int = 64) -> None:
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        # (loop, future) per coroutine waiting for a slot; woken from release()
+        self._async_waiters: (
+            "deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]]"
+        ) = deque()
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def aacquire(self) -> None:
+        # the limiter is shared with threads and other event loops, so each waiting
+        # coroutine parks on a future of its own loop that release() resolves thread-safely
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._cond:
+                    try:
+                        self._async_waiters.remove((loop, waiter))
+                    except ValueError:
+                        # already woken: pass the free slot on to the next waiter
+                        self._wake_async(1)
+                raise
+
+    def _wake_async(self, n: int) -> None:
+        # caller holds self._cond
+        while n > 0 and self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_set_waiter, waiter)
+            except RuntimeError:
+                # that loop is closed
+                continue
+            n -= 1
+
+    def release(self, throttled: bool = False) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+            self._wake_async(int(self.limit) - self.in_flight)
+
+
+class HostPolicy:
+    def __init__(
+        self, rate: float, burst: float, concurrency: int, max_concurrency: int
+    ) -> None:
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AIMDLimiter(concurrency, maximum=max_concurrency)
+        self.paused_until = 0.0
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self._lock = threading.Lock()
+
+    def wait_time(self) -> float:
+        return max(self.bucket.reserve(), self.paused_until - time.monotonic())
+
+    def count_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def record(self, latency: float, status: int = None, error: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            self.total_latency += latency
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+            if error or (status is not None and status >= 500):
+                self.errors += 1
+
+    def metrics(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "concurrency_limit": int(self.limiter.limit),
+            "in_flight": self.limiter.in_flight,
+            "avg_latency_ms": (
+                round(1000 * self.total_latency / self.requests, 1)
+                if self.requests
+                else 0.0
+            ),
+        }
+
+
+class RequestScheduler:
+    """
+    Concurrency per host is set by the AIMD limiter, which keeps growing until the server
+    throttles. `rate` is an optional fixed requests-per-second cap on top (0 = off);
+    `host_rates` sets caps for single hosts.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: float = 20.0,
+        concurrency: int = 8,
+        max_concurrency: int = 32,
+        max_retries: int = 4,
+        host_rates: "dict[str, float]" = None,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.host_rates = host_rates or {}
+        self.hosts: "dict[str, HostPolicy]" = {}
+        self._lock = threading.Lock()
+
+    def policy(self, host: str) -> HostPolicy:
+        with self._lock:
+            if host not in self.hosts:
+                rate = self.host_rates.get(host, self.rate)
+                self.hosts[host] = HostPolicy(
+                    rate, max(self.burst, rate), self.concurrency, self.max_concurrency
+                )
+            return self.hosts[host]
+
+    def metrics(self) -> "dict[str, dict]":
+        return {host: policy.metrics() for host, policy in self.hosts.items()}
+
+    def retry_delay(
+        self, policy: HostPolicy, attempt: int, status: int, retry_after: str
+    ) -> float:
+        delay = parse_retry_after(retry_after) if status in THROTTLE_STATUSES else None
+        if delay is None:
+            delay = backoff_delay(attempt)
+        if status in THROTTLE_STATUSES:
+            # everyone talking to this host backs off, not just this request
+            policy.pause(delay)
+        policy.count_retry()
+        return delay
+
+    def call(self, host: str, fn, *args, retries: int = None, **kwargs):
+        """
+        Run a blocking sdk call (e.g. a ClobClient method) under `host`'s limits.
+        Calls that raise an error carrying a retryable `status_code` are retried;
+        pass retries=0 for non-idempotent calls such as order submission.
+        """
+        policy = self.policy(host)
+        retries = self.max_retries if retries is None else retries
+        attempt = 0
+        while True:
+            time.sleep(policy.wait_time())
+            policy.limiter.acquire()
+            start = time.monotonic()
+            status = None
+            try:
+                result = fn(*args, **kwargs)
+                policy.record(time.monotonic() - start)
+                return result
+            except Exception as e:
+                status = getattr(e, "status_code", None)
+                policy.record(time.monotonic() - start, status, error=True)
+                if status not in RETRY_STATUSES or attempt >= retries:
+                    raise
+            finally:
+                policy.limiter.release(throttled=status in THROTTLE_STATUSES)
+            time.sleep(self.retry_delay(policy, attempt, status, None))
+            attempt += 1
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    def __init__(
+        self, scheduler: RequestScheduler, transport: httpx.BaseTransport
+    ) -> None:
+        self.scheduler = scheduler
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        policy = self.scheduler.policy(request.url.host)
+        attempt = 0
+        while True:
+            time.sleep(policy.wait_time())
+            policy.limiter.acquire()
+            start = time.monotonic()
+            status = None
+            try:
+                response = self.transport.handle_request(request)
+                status = response.status_code
+                policy.record(time.monotonic() - start, status)
+            except httpx.TransportError:
+                policy.record(time.monotonic() - start, error=True)
+                if attempt >= self.scheduler.max_retries or not is_retryable(
+                    request, None
+                ):
+                    raise
+            finally:
+                policy.limiter.release(throttled=status in THROTTLE_STATUSES)
+
+            if status is not None:
+                if attempt >= self.scheduler.max_retries or not is_retryable(
+                    request, status
+                ):
+                    return response
+                retry_after = response.headers.get("retry-after")
+                response.close()
+            else:
+                retry_after = None
+            time.sleep(self.scheduler.retry_delay(policy, attempt, status, retry_after))
+            attempt += 1
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self, scheduler: RequestScheduler, transport: httpx.AsyncBaseTransport
+    ) -> None:
+        self.scheduler = scheduler
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        policy = self.scheduler.policy(request.url.host)
+        attempt = 0
+        while True:
+            await asyncio.sleep(policy.wait_time())
+            await policy.limiter.aacquire()
+            start = time.monotonic()
+            status = None
+            try:
+                response = await self.transport.handle_async_request(request)
+                status = response.status_code
+                policy.record(time.monotonic() - start, status)
+            except httpx.TransportError:
+                policy.record(time.monotonic() - start, error=True)
+                if attempt >= self.scheduler.max_retries or not is_retryable(
+                    request, None
+                ):
+                    raise
+            finally:
+                policy.limiter.release(throttled=status in THROTTLE_STATUSES)
+
+            if status is not None:
+                if attempt >= self.scheduler.max_retries or not is_retryable(
+                    request, status
+                ):
+                    return response
+                retry_after = response.headers.get("retry-after")
+                await response.aclose()
+            else:
+                retry_after = None
+            await asyncio.sleep(
+                self.scheduler.retry_delay(policy, attempt, status, retry_after)
+            )
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,105 @@
+import sys
+import time
+import json
+import random
+from pathlib import Path
+
+# 将项目根目录添加到 Python 路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.polymarket import decode
+from agents.polymarket.decode import decode_markets
+from agents.utils.objects import ClobReward, Market, PolymarketEvent, Tag
+
+
+def make_market(i: int) -> dict:
+    price = round(random.random(), 3)
+    return {
+        "id": str(200000 + i),
+        "question": f"Will market {i} resolve yes?",
+        "conditionId": "0x" + "%064x" % i,
+        "slug": f"market-{i}",
+        "endDate": "2025-01-01T00:00:00Z",
+        "liquidity": str(random.random() * 10000),
+        "description": "Synthetic market used to benchmark decoding. " * 4,
+        "outcomes": '["Yes", "No"]',
+        "outcomePrices": json.dumps([str(price), str(round(1 - price, 3))]),
+        "volume": str(random.random() * 100000),
+        "active": True,
+        "closed": False,
+        "archived": False,
+        "createdAt": "2024-07-08T01:06:23.982796Z",
+        "updatedAt": "2024-07-15T17:12:48.601056Z",
+        "clobTokenIds": json.dumps([str(random.getrandbits(250)) for _ in range(2)]),
+        "enableOrderBook": True,
+        "spread": 0.01,
+        "rewardsMinSize": 100,
+        "rewardsMaxSpread": 3.5,
+        "clobRewards": [
+            {
+                "id": str(i),
+                "conditionId": "0x" + "%064x" % i,
+                "assetAddress": "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",
+                "rewardsAmount": 0,
+                "rewardsDailyRate": 5,
+                "startDate": "2024-07-01",
+                "endDate": "2500-12-31",
+            }
+        ],
+        "events": [
+            {
+                "id": str(10000 + i),
+                "ticker": f"event-{i}",
+                "slug": f"event-{i}",
+                "title": f"Event {i}",
+                "active": True,
+                "closed": False,
+                "liquidity": 1000.5,
+                "tags": [{"id": "2", "label": "Politics", "slug": "politics"}],
+            }
+        ],
+    }
+
+
+def per_record(payload: bytes) -> list:
+    # the previous GammaMarketClient.parse_pydantic_market path, minus its prints
+    markets = []
+    for market_object in json.loads(payload):
+        market_object["clobRewards"] = [
+            ClobReward(**x) for x in market_object["clobRewards"]
+        ]
+        events = []
+        for event_object in market_object["events"]:
+            event_object["tags"] = [Tag(**x) for x in event_object["tags"]]
+            events.append(PolymarketEvent(**event_object))
+        market_object["events"] = events
+        market_object["outcomePrices"] = json.loads(market_object["outcomePrices"])
+        market_object["clobTokenIds"] = json.loads(market_object["clobTokenIds"])
+        markets.append(Market(**market_object))
+    return markets
+
+
+def bench(name: str, fn, payload: bytes, rounds: int) -> None:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        count = len(fn(payload))
+        best = min(best, time.perf_counter() - start)
+    print(
+        f"{name:<28} {count} records in {best:.3f}s  ({count / best:,.0f} records/sec)"
+    )
+
+
+def main(n: int = 10000, rounds: int = 3) -> None:
+    random.seed(0)
+    payload = json.dumps([make_market(i) for i in range(n)]).encode()
+    print(
+        f"payload: {n} markets, {len(payload) / 1e6:.1f} MB, orjson={'yes' if decode.orjson else 'no'}"
+    )
+    bench("per-record construction", per_record, payload, rounds)
+    bench("bulk decode_markets", decode_markets, payload, rounds)
+
+
+if __name__ == "__main__":
+    main(*(int(x) for x in sys.argv[1:3]))
@@ -5,20 +5,29 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from functools import lru_cache
+
 import typer
 from devtools import pprint
 
-from agents.polymarket.polymarket import Polymarket
-from agents.connectors.chroma import PolymarketRAG
-from agents.connectors.news import News
-from agents.application.trade import Trader
-from agents.application.executor import Executor
-from agents.application.creator import Creator
+# clients (and their heavy imports) are created by the commands that need them,
+# so --help and gamma-only commands start without wallet setup or clob auth
 
 app = typer.Typer()
-polymarket = Polymarket()
-newsapi_client = News()
-polymarket_rag = PolymarketRAG()
+
+
+@lru_cache(maxsize=None)
+def get_polymarket(read_only: bool = True):
+    from agents.polymarket.polymarket import Polymarket
+
+    return Polymarket(read_only=read_only)
+
+
+@lru_cache(maxsize=None)
+def get_polymarket_rag():
+    from agents.connectors.chroma import PolymarketRAG
+
+    return PolymarketRAG()
 
 
 @app.command()
@@ -27,12 +36,16 @@ def get_all_markets(limit: int = 5, sort_by: str = "spread") -> None:
     Query Polymarket's markets
     """
     print(f"limit: int = {limit}, sort_by: str = {sort_by}")
-    markets = polymarket.get_all_markets()
+    polymarket = get_polymarket()
+    markets = polymarket.get_market_table()
     markets = polymarket.filter_markets_for_trading(markets)
+    # drop rows map_api_to_market rejects before ranking, so `limit` valid rows come back
+    markets = markets.take(markets.valid_mask(polymarket.map_api_to_market))
     if sort_by == "spread":
-        markets = sorted(markets, key=lambda x: x.spread, reverse=True)
-    markets = markets[:limit]
-    pprint(markets)
+        markets = markets.top_k("spread", limit)
+    else:
+        markets = markets.head(limit)
+    pprint(markets.to_simple_markets(polymarket.map_api_to_market))
 
 
 @app.command()
@@ -40,7 +53,9 @@ def get_relevant_news(keywords: str) -> None:
     """
     Use NewsAPI to query the internet
     """
-    articles = newsapi_client.get_articles_for_cli_keywords(keywords)
+    from agents.connectors.news import News
+
+    articles = News().get_articles_for_cli_keywords(keywords)
     pprint(articles)
 
 
@@ -63,17 +78,19 @@ def get_all_events(limit: int = 5, sort_by: str = "number_of_markets", fetch_lim
     
     print(f"limit: int = {limit}, sort_by: str = {sort_by}, fetch_limit: int = {fetch_limit}, max_fetch: {max_fetch}")
     # Get tradeable events using API-level filtering with pagination
-    events = polymarket.get_all_events(tradeable_only=True, limit=fetch_limit, max_events=max_fetch)
+    polymarket = get_polymarket()
+    events = polymarket.get_event_table(tradeable_only=True, limit=fetch_limit, max_events=max_fetch)
     print(f"Retrieved {len(events)} events from API (pre-filtered for tradeable)")
     # Additional client-side filtering for restricted events (API doesn't support restricted parameter)
     events = polymarket.filter_events_for_trading(events)
     print(f"After filtering: {len(events)} tradeable events")
+    events = events.take(events.valid_mask(polymarket.map_api_to_event))
     
     if sort_by == "number_of_markets":
-        # markets is a comma-separated string, count the number of markets
-        events = sorted(events, key=lambda x: len(x.markets.split(',')) if x.markets else 0, reverse=True)
-    
-    events = events[:limit]
+        events = events.top_k("n_markets", limit)
+    else:
+        events = events.head(limit)
+    events = events.to_simple_events(polymarket.map_api_to_event)
     print(f"Final result: {len(events)} events")
     print("\n=== Events ===")
     pprint(events)
@@ -84,7 +101,7 @@ def create_local_markets_rag(local_directory: str) -> None:
     """
     Create a local markets database for RAG
     """
-    polymarket_rag.create_local_markets_rag(local_directory=local_directory)
+    get_polymarket_rag().create_local_markets_rag(local_directory=local_directory)
 
 
 @app.command()
@@ -92,7 +109,7 @@ def query_local_markets_rag(vector_db_directory: str, query: str) -> None:
     """
     RAG over a local database of Polymarket's events
     """
-    response = polymarket_rag.query_local_markets_rag(
+    response = get_polymarket_rag().query_local_markets_rag(
         local_directory=vector_db_directory, query=query
     )
     pprint(response)
@@ -106,6 +123,8 @@ def ask_superforecaster(event_title: str, market_question: str, outcome: str) ->
     print(
         f"event: str = {event_title}, question: str = {market_question}, outcome (usually yes or no): str = {outcome}"
     )
+    from agents.application.executor import Executor
+
     executor = Executor()
     response = executor.get_superforecast(
         event_title=event_title, market_question=market_question, outcome=outcome
@@ -118,6 +137,8 @@ def create_market() -> None:
     """
     Format a request to create a market on Polymarket
     """
+    from agents.application.creator import Creator
+
     c = Creator()
     market_description = c.one_best_market()
     print(f"market_description: str = {market_description}")
@@ -128,6 +149,8 @@ def ask_llm(user_input: str) -> None:
     """
     Ask a question to the LLM and get a response.
     """
+    from agents.application.executor import Executor
+
     executor = Executor()
     response = executor.get_llm_response(user_input)
     print(f"LLM Response: {response}")
@@ -138,6 +161,8 @@ def ask_polymarket_llm(user_input: str) -> None:
     """
     What types of markets do you want trade?
     """
+    from agents.application.executor import Executor
+
     executor = Executor()
     response = executor.get_polymarket_llm(user_input=user_input)
     print(f"LLM + current markets&events response: {response}")
@@ -148,6 +173,8 @@ def run_autonomous_trader() -> None:
     """
     Let an autonomous system trade for you.
     """
+    from agents.application.trade import Trader
+
     trader = Trader()
     trader.one_best_trade()
 
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+# 将项目根目录添加到 Python 路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.polymarket.onchain import USDC_ADDRESS, CTF_ADDRESS, WalletReader
+
+# usage: python scripts/python/wallet_snapshot.py <address> [rpc_url] [usdc_address] [ctf_address]
+# e.g. against a local dev chain: ... 0xabc... http://127.0.0.1:8545 0xUsdc... 0xCtf...
+
+
+def main(
+    address: str, rpc_url: str = None, usdc: str = USDC_ADDRESS, ctf: str = CTF_ADDRESS
+) -> None:
+    rpc_url = rpc_url or os.getenv("POLYGON_RPC", "https://polygon-rpc.com")
+    reader = WalletReader.from_rpc(rpc_url, usdc, ctf)
+    start = time.perf_counter()
+    snapshot = reader.snapshot(address)
+    elapsed = time.perf_counter() - start
+    mode = "multicall" if reader.has_multicall() else "json-rpc batch"
+    print(f"block {snapshot.block_number} via {mode} in {elapsed * 1000:.0f} ms")
+    print(f"USDC balance: {snapshot.usdc:.2f}")
+    for spender, allowance in snapshot.usdc_allowances.items():
+        print(f"USDC allowance {spender}: {allowance}")
+    for operator, approved in snapshot.ctf_approvals.items():
+        print(f"CTF approved {operator}: {approved}")
+    print(f"missing approvals: {snapshot.missing_approvals()}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:5])
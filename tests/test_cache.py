@@ -0,0 +1,136 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+import httpx
+
+from agents.connectors.embedding_cache import CachedEmbeddings, EmbeddingCache
+from agents.utils.cache import (
+    NO_CACHE,
+    AsyncCachingTransport,
+    CachingTransport,
+    ResponseCache,
+)
+
+URL = "https://gamma-api.polymarket.com/markets?limit=10"
+
+
+class CountingApi:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.conditional = 0
+
+    def handler(self, request):
+        self.calls += 1
+        if request.headers.get("if-none-match") == '"v1"':
+            self.conditional += 1
+            return httpx.Response(304)
+        return httpx.Response(200, json=[{"id": self.calls}], headers={"etag": '"v1"'})
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ResponseCache(
+            path=os.path.join(self.directory, "responses.sqlite")
+        )
+        self.api = CountingApi()
+        self.client = httpx.Client(
+            transport=CachingTransport(
+                self.cache, httpx.MockTransport(self.api.handler)
+            )
+        )
+
+    def tearDown(self):
+        self.client.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_fresh_entries_are_served_from_the_cache(self):
+        first = self.client.get(URL).json()
+        second = self.client.get(URL).json()
+        self.assertEqual(first, second)
+        self.assertEqual(self.api.calls, 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_no_cache_header_goes_to_the_api(self):
+        self.client.get(URL)
+        self.assertEqual(self.client.get(URL, headers=NO_CACHE).json(), [{"id": 2}])
+        self.assertEqual(self.api.calls, 2)
+
+    def test_stale_entries_are_revalidated(self):
+        self.cache.ttls = {"gamma-api.polymarket.com/markets": 0}
+        self.client.get(URL)
+        self.assertEqual(self.client.get(URL).json(), [{"id": 1}])
+        self.assertEqual(self.api.conditional, 1)
+        self.assertEqual(self.cache.stats()["revalidated"], 1)
+
+    def test_other_hosts_are_not_cached(self):
+        self.client.get("https://clob.polymarket.com/book")
+        self.client.get("https://clob.polymarket.com/book")
+        self.assertEqual(self.api.calls, 2)
+
+    def test_eviction_keeps_the_size_bound(self):
+        self.cache.max_bytes = 1
+        self.client.get(URL)
+        self.assertEqual(self.cache.stats()["size_bytes"], 0)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_async_transport(self):
+        transport = AsyncCachingTransport(
+            self.cache, httpx.MockTransport(self.api.handler)
+        )
+
+        async def get_twice():
+            async with httpx.AsyncClient(transport=transport) as client:
+                await client.get(URL)
+                return (await client.get(URL)).json()
+
+        self.assertEqual(asyncio.run(get_twice()), [{"id": 1}])
+        self.assertEqual(self.api.calls, 1)
+
+
+class LengthEmbeddings:
+    def __init__(self) -> None:
+        self.texts = []
+
+    def embed_documents(self, texts):
+        self.texts.extend(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class EmbeddingCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "embeddings.sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_each_text_is_embedded_once(self):
+        inner = LengthEmbeddings()
+        embeddings = CachedEmbeddings(inner, "model", EmbeddingCache(self.path))
+        first = embeddings.embed_documents(["a", "bb", "a"])
+        second = embeddings.embed_documents(["bb", "ccc"])
+        self.assertEqual(first, [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]])
+        self.assertEqual(second[0], [2.0, 1.0])
+        self.assertEqual(inner.texts, ["a", "bb", "ccc"])
+
+    def test_cache_persists_and_is_per_model(self):
+        EmbeddingCache(self.path).put_many("model", ["a"], [[1.0, 2.0]])
+        cache = EmbeddingCache(self.path)
+        self.assertEqual(cache.get_many("model", ["a"])[0].tolist(), [1.0, 2.0])
+        self.assertIsNone(cache.get_many("other", ["a"])[0])
+
+    def test_least_recently_used_vectors_are_evicted(self):
+        cache = EmbeddingCache(self.path, max_bytes=16)
+        cache.put_many("model", ["a", "b"], [[1.0, 1.0], [2.0, 2.0]])
+        cache.get_many("model", ["a"])
+        cache.put_many("model", ["c"], [[3.0, 3.0]])
+        self.assertLessEqual(cache.stats()["size_bytes"], 16)
+        self.assertGreater(cache.stats()["evictions"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
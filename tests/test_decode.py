@@ -0,0 +1,38 @@
+import json
+import unittest
+
+from agents.polymarket.decode import decode_events, decode_markets
+
+
+class DecodeTest(unittest.TestCase):
+    def test_markets_from_raw_bytes(self):
+        payload = json.dumps(
+            [
+                {
+                    "id": 1,
+                    "question": "q?",
+                    "outcomePrices": '["0.4", "0.6"]',
+                    "clobTokenIds": '["a", "b"]',
+                },
+                {"id": 2, "question": "r?"},
+            ]
+        ).encode()
+        markets = decode_markets(payload)
+        self.assertEqual([m.id for m in markets], [1, 2])
+        self.assertEqual(markets[0].outcomePrices, ["0.4", "0.6"])
+        self.assertEqual(markets[0].clobTokenIds, ["a", "b"])
+
+    def test_invalid_records_are_skipped(self):
+        markets = decode_markets([{"id": 1}, {"id": "not a number"}, {"id": 3}])
+        self.assertEqual([m.id for m in markets], [1, 3])
+
+    def test_events_unstringify_nested_markets(self):
+        events = decode_events(
+            [{"id": "10", "markets": [{"id": 1, "clobTokenIds": '["a"]'}]}]
+        )
+        self.assertEqual(events[0].id, "10")
+        self.assertEqual(events[0].markets[0].clobTokenIds, ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
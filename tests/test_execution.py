@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from agents.polymarket.execution import (
+    estimate_fill,
+    estimate_fills,
+    max_fill_within,
+    pad_levels,
+)
+from agents.polymarket.orderbook import OrderBook
+
+
+def book() -> OrderBook:
+    return OrderBook.from_snapshot(
+        {
+            "asset_id": "a",
+            "bids": [{"price": "0.3", "size": "100"}, {"price": "0.4", "size": "100"}],
+            "asks": [{"price": "0.6", "size": "100"}, {"price": "0.5", "size": "100"}],
+        }
+    )
+
+
+class ExecutionTest(unittest.TestCase):
+    def test_buy_walks_the_asks(self):
+        fill = estimate_fill(book(), 80.0, "BUY")
+        self.assertAlmostEqual(fill["shares"], 150.0)
+        self.assertAlmostEqual(fill["vwap"], 80.0 / 150.0)
+        self.assertAlmostEqual(fill["slippage_bps"], (80.0 / 150.0 - 0.5) / 0.5 * 1e4)
+        self.assertTrue(fill["complete"])
+
+    def test_sell_walks_the_bids(self):
+        fill = estimate_fill(book(), 150.0, "SELL")
+        self.assertAlmostEqual(fill["notional"], 55.0)
+        self.assertAlmostEqual(fill["vwap"], 55.0 / 150.0)
+
+    def test_order_larger_than_the_book_is_partial(self):
+        fill = estimate_fill(book(), 500.0, "SELL")
+        self.assertAlmostEqual(fill["filled"], 200.0)
+        self.assertFalse(fill["complete"])
+
+    def test_many_books_and_sizes_at_once(self):
+        prices, sizes = pad_levels([book(), OrderBook("empty")], "BUY")
+        fills = estimate_fills(prices, sizes, [10.0, 80.0], "BUY")
+        self.assertEqual(fills["shares"].shape, (2, 2))
+        self.assertAlmostEqual(fills["shares"][0, 0], 20.0)
+        self.assertEqual(fills["filled"][1].tolist(), [0.0, 0.0])
+
+    def test_max_fill_within_slippage(self):
+        prices, sizes = pad_levels([book()], "BUY")
+        amount = max_fill_within(prices, sizes, 500, "BUY")[0]
+        self.assertAlmostEqual(amount, 70.0)
+        fill = estimate_fill(book(), amount, "BUY")
+        self.assertAlmostEqual(fill["slippage_bps"], 500.0, places=6)
+        self.assertTrue(np.all(max_fill_within(prices, sizes, 0, "BUY") == 50.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
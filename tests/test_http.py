@@ -0,0 +1,50 @@
+import asyncio
+import unittest
+
+from agents.utils.http import get_async_http_client, iter_async, run_sync
+
+
+class RunSyncTest(unittest.TestCase):
+    def test_calls_share_one_loop_and_client(self):
+        async def current():
+            return asyncio.get_running_loop(), get_async_http_client()
+
+        loop_a, client_a = run_sync(current())
+        loop_b, client_b = run_sync(current())
+        self.assertIs(loop_a, loop_b)
+        self.assertIs(client_a, client_b)
+
+    def test_exceptions_propagate(self):
+        async def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            run_sync(fail())
+
+    def test_refuses_to_block_its_own_loop(self):
+        async def nested():
+            inner = asyncio.sleep(0)
+            with self.assertRaises(RuntimeError):
+                run_sync(inner)
+
+        run_sync(nested())
+
+    def test_iter_async_closes_the_generator(self):
+        closed = []
+
+        async def numbers():
+            try:
+                for i in range(10):
+                    yield i
+            finally:
+                closed.append(True)
+
+        items = iter_async(numbers())
+        self.assertEqual([next(items), next(items)], [0, 1])
+        items.close()
+        self.assertEqual(closed, [True])
+        self.assertEqual(list(iter_async(numbers())), list(range(10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import shutil
+import tempfile
+import unittest
+
+from agents.connectors.numpy_store import NumpyVectorStore
+
+
+class AxisEmbeddings:
+    # the query names the axis it points along
+    def embed_query(self, text):
+        vector = [0.0, 0.0, 0.0]
+        vector[int(text)] = 1.0
+        return vector
+
+
+class NumpyVectorStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = NumpyVectorStore(self.directory, AxisEmbeddings())
+        self.store.upsert(
+            ["a", "b", "c"],
+            [[1, 0, 0], [0, 1, 0], [0, 0, 1]],
+            ["doc a", "doc b", "doc c"],
+            [{"n": 1}, {"n": 2}, {"n": 3}],
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def ids(self, results):
+        return [doc.page_content for doc, _ in results]
+
+    def test_search_ranks_by_cosine_distance(self):
+        results = self.store.similarity_search_with_score("1", k=2)
+        self.assertEqual(self.ids(results)[0], "doc b")
+        self.assertAlmostEqual(results[0][1], 0.0, places=6)
+
+    def test_upsert_replaces_in_place_and_survives_reopening(self):
+        self.store.upsert(
+            ["b", "d"], [[0, 0, 1], [1, 1, 0]], ["doc b2", "doc d"], [{}, {}]
+        )
+        reopened = NumpyVectorStore(self.directory, AxisEmbeddings())
+        self.assertEqual(len(reopened), 4)
+        results = reopened.similarity_search_with_score("2", k=2)
+        self.assertEqual(sorted(self.ids(results)), ["doc b2", "doc c"])
+
+    def test_delete_compacts(self):
+        self.store.delete(["a", "missing"])
+        reopened = NumpyVectorStore(self.directory, AxisEmbeddings())
+        self.assertEqual(reopened.ids, ["b", "c"])
+        self.assertEqual(
+            self.ids(reopened.similarity_search_with_score("0", k=1)), ["doc b"]
+        )
+
+    def test_search_limited_to_ids(self):
+        results = self.store.similarity_search_with_score("1", k=3, ids=["a", "c", "x"])
+        self.assertEqual(sorted(self.ids(results)), ["doc a", "doc c"])
+        self.assertEqual(self.store.similarity_search_with_score("1", ids=["x"]), [])
+
+    def test_dimension_mismatch_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.store.upsert(["e"], [[1, 0]], ["doc e"], [{}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from unittest import mock
+
+from agents.polymarket.orderbook import OrderBook, OrderBookMirror
+
+
+def snapshot(token_id: str, bid: str = "0.40", ask: str = "0.60") -> dict:
+    return {
+        "asset_id": token_id,
+        "market": "m",
+        "bids": [{"price": "0.30", "size": "10"}, {"price": bid, "size": "5"}],
+        "asks": [{"price": "0.70", "size": "10"}, {"price": ask, "size": "5"}],
+    }
+
+
+class OrderBookTest(unittest.TestCase):
+    def test_levels_are_sorted_and_zero_size_removes(self):
+        book = OrderBook.from_snapshot(snapshot("a"))
+        self.assertEqual(book.best_bid(), (0.40, 5.0))
+        self.assertEqual(book.best_ask(), (0.60, 5.0))
+        book.set_level("BUY", "0.45", "2")
+        self.assertEqual(book.best_bid(), (0.45, 2.0))
+        book.set_level("BUY", "0.45", "0")
+        self.assertEqual(book.best_bid(), (0.40, 5.0))
+        self.assertAlmostEqual(book.mid(), 0.50)
+
+    def test_copy_is_independent(self):
+        book = OrderBook.from_snapshot(snapshot("a"))
+        copy = book.copy()
+        book.set_level("SELL", "0.55", "1")
+        self.assertEqual(copy.best_ask(), (0.60, 5.0))
+
+
+class OrderBookMirrorTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch(
+            "agents.polymarket.orderbook.time.monotonic", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.snapshots = []
+
+        def snapshot_fn(token_id):
+            self.snapshots.append(token_id)
+            return snapshot(token_id)
+
+        self.mirror = OrderBookMirror(snapshot_fn, max_age=5.0)
+        self.mirror.track(["a", "b"])
+
+    def test_book_goes_stale_without_messages(self):
+        self.assertTrue(self.mirror.is_fresh("a"))
+        self.now += 6
+        self.assertFalse(self.mirror.is_fresh("a"))
+        self.mirror.fresh_book("a")
+        self.assertEqual(self.snapshots, ["a", "b", "a"])
+        self.assertTrue(self.mirror.is_fresh("a"))
+
+    def test_messages_keep_only_their_own_token_fresh(self):
+        self.now += 4
+        self.mirror.apply(
+            {
+                "event_type": "price_change",
+                "asset_id": "b",
+                "changes": [{"price": "0.41", "side": "BUY", "size": "3"}],
+            }
+        )
+        self.now += 4
+        self.assertFalse(self.mirror.is_fresh("a"))
+        self.assertTrue(self.mirror.is_fresh("b"))
+        self.assertEqual(self.mirror.book("b").best_bid(), (0.41, 3.0))
+
+    def test_batched_price_changes_refresh_each_asset(self):
+        self.now += 4
+        self.mirror.apply(
+            {
+                "event_type": "price_change",
+                "price_changes": [
+                    {"asset_id": "a", "price": "0.59", "side": "SELL", "size": "1"},
+                    {"asset_id": "b", "price": "0.59", "side": "SELL", "size": "1"},
+                ],
+            }
+        )
+        self.now += 4
+        self.assertTrue(self.mirror.is_fresh("a"))
+        self.assertTrue(self.mirror.is_fresh("b"))
+
+    def test_untracked_token_has_no_fresh_book(self):
+        self.assertIsNone(self.mirror.fresh_book("c"))
+        self.assertFalse(self.mirror.is_fresh("c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
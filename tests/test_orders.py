@@ -0,0 +1,99 @@
+import threading
+import unittest
+
+import httpx
+from py_clob_client.clob_types import OrderType
+from py_clob_client.exceptions import PolyApiException
+
+from agents.polymarket.orders import OrderPipeline
+
+
+class FakeOrder:
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.order = {"tokenId": f"token-{n}"}
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.posted = []
+        self.canceled = []
+        self._lock = threading.Lock()
+
+    def post_order(self, order, order_type):
+        with self._lock:
+            self.posted.append(order.n)
+        return {"success": True, "orderID": f"order-{order.n}"}
+
+    def cancel_orders(self, order_ids):
+        self.canceled.extend(order_ids)
+        return {"canceled": list(order_ids)}
+
+
+class FakeScheduler:
+    def call(self, host, fn, *args, retries=None):
+        return fn(*args)
+
+
+def not_found(*args):
+    raise PolyApiException(httpx.Response(404, json={"error": "not found"}))
+
+
+class OrderPipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeClient()
+        self.pipeline = OrderPipeline(
+            self.client, FakeScheduler(), "clob", batch_size=2
+        )
+
+    def tearDown(self):
+        self.pipeline.close()
+
+    def test_batches_are_posted_in_order(self):
+        self.pipeline._post_batch = lambda orders, order_type: [
+            {"success": True, "orderID": f"order-{o.n}"} for o in orders
+        ]
+        responses = self.pipeline.post_orders([FakeOrder(n) for n in range(5)])
+        self.assertEqual(
+            [r["orderID"] for r in responses], [f"order-{n}" for n in range(5)]
+        )
+        self.assertEqual(self.pipeline.latency.stats()["orders"], 5)
+
+    def test_missing_batch_endpoint_falls_back_to_single_posts(self):
+        self.pipeline._post_batch = not_found
+        responses = self.pipeline.post_orders([FakeOrder(n) for n in range(5)])
+        self.assertFalse(self.pipeline.batch_supported)
+        self.assertEqual(
+            [r["orderID"] for r in responses], [f"order-{n}" for n in range(5)]
+        )
+        self.assertEqual(sorted(self.client.posted), list(range(5)))
+
+    def test_chunk_cut_before_fallback_posts_every_order(self):
+        # another chunk already found the batch endpoint missing
+        self.pipeline.batch_supported = False
+        responses = self.pipeline._submit(
+            [FakeOrder(n) for n in range(3)], OrderType.GTC
+        )
+        self.assertEqual(len(responses), 3)
+        self.assertEqual(self.client.posted, [0, 1, 2])
+
+    def test_other_errors_fail_the_chunk(self):
+        def server_error(*args):
+            raise PolyApiException(httpx.Response(500, json={"error": "boom"}))
+
+        self.pipeline._post_batch = server_error
+        responses = self.pipeline.post_orders([FakeOrder(n) for n in range(2)])
+        self.assertEqual([r["success"] for r in responses], [False, False])
+        self.assertTrue(self.pipeline.batch_supported)
+
+    def test_cancel_replace(self):
+        self.pipeline._post_batch = not_found
+        result = self.pipeline.cancel_replace(["old-1"], [FakeOrder(1), FakeOrder(2)])
+        self.assertEqual(self.client.canceled, ["old-1"])
+        self.assertEqual(
+            [r["orderID"] for r in result["posted"]], ["order-1", "order-2"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
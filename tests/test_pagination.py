@@ -0,0 +1,97 @@
+import unittest
+from unittest import mock
+
+import httpx
+
+from agents.polymarket.pagination import PageFetchError, aiter_offset_pages
+from agents.polymarket.polymarket import Polymarket
+
+
+class FakeApi:
+    """Offset-paginated endpoint over `total` records; records the offsets requested."""
+
+    def __init__(self, total: int, fail_offset: int = None) -> None:
+        self.total = total
+        self.fail_offset = fail_offset
+        self.offsets = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        self.offsets.append(offset)
+        if offset == self.fail_offset:
+            return httpx.Response(500)
+        records = [
+            {"id": str(i)} for i in range(offset, min(offset + limit, self.total))
+        ]
+        return httpx.Response(200, json=records)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+class PaginationTest(unittest.IsolatedAsyncioTestCase):
+    async def collect(self, api: FakeApi, stop_after: int = None, **kwargs) -> list:
+        pages = []
+        client = api.client()
+        with mock.patch(
+            "agents.polymarket.pagination.get_async_http_client", return_value=client
+        ):
+            agen = aiter_offset_pages("http://gamma/events", limit=10, **kwargs)
+            try:
+                async for offset, page in agen:
+                    pages.append(offset)
+                    if stop_after is not None and len(pages) >= stop_after:
+                        break
+            finally:
+                await agen.aclose()
+                await client.aclose()
+        return pages
+
+    async def test_pages_come_in_offset_order_until_short_page(self):
+        api = FakeApi(total=95)
+        pages = await self.collect(api, concurrency=4)
+        self.assertEqual(pages, list(range(0, 100, 10)))
+
+    async def test_max_records_caps_requests(self):
+        api = FakeApi(total=1000)
+        pages = await self.collect(api, max_records=25, concurrency=8)
+        self.assertEqual(pages, [0, 10, 20])
+        self.assertEqual(sorted(api.offsets), [0, 10, 20])
+
+    async def test_early_stop_wastes_few_requests(self):
+        api = FakeApi(total=1000)
+        pages = await self.collect(api, stop_after=1, concurrency=8)
+        self.assertEqual(pages, [0])
+        self.assertEqual(api.offsets, [0])
+
+    async def test_failed_page_raises(self):
+        api = FakeApi(total=1000, fail_offset=30)
+        with self.assertRaises(PageFetchError) as raised:
+            await self.collect(api, concurrency=4)
+        self.assertEqual(raised.exception.offset, 30)
+
+
+class EventPagesTest(unittest.IsolatedAsyncioTestCase):
+    async def test_max_events_counts_parsed_events(self):
+        polymarket = Polymarket.__new__(Polymarket)
+        polymarket.gamma_events_endpoint = "http://gamma/events"
+        api = FakeApi(total=1000)
+        client = api.client()
+
+        def parse_events(api_events):
+            # every third event fails to parse
+            return [e for e in api_events if int(e["id"]) % 3]
+
+        polymarket.parse_events = parse_events
+        with mock.patch(
+            "agents.polymarket.pagination.get_async_http_client", return_value=client
+        ):
+            events = [e async for e in polymarket.aiter_events(limit=10, max_events=25)]
+        await client.aclose()
+        self.assertEqual(len(events), 25)
+        self.assertEqual(sorted(api.offsets), [0, 10, 20, 30])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import httpx
+
+from agents.utils.ratelimit import (
+    AIMDLimiter,
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+    RequestScheduler,
+    TokenBucket,
+    is_retryable,
+    parse_retry_after,
+)
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_zero_rate_is_uncapped(self):
+        bucket = TokenBucket(0, 1)
+        self.assertEqual([bucket.reserve() for _ in range(100)], [0.0] * 100)
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(10, 2)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+
+
+class RetryRulesTest(unittest.TestCase):
+    def test_only_idempotent_requests_are_resent(self):
+        get = httpx.Request("GET", "http://host/x")
+        post = httpx.Request("POST", "http://host/x")
+        self.assertTrue(is_retryable(get, 503))
+        self.assertTrue(is_retryable(post, 429))
+        self.assertFalse(is_retryable(post, 503))
+        self.assertFalse(is_retryable(get, 404))
+
+    def test_retry_after(self):
+        self.assertEqual(parse_retry_after("2"), 2.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+class AIMDLimiterTest(unittest.TestCase):
+    def test_grows_on_success_and_halves_on_throttle(self):
+        limiter = AIMDLimiter(initial=4, maximum=8)
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release()
+        # about one extra slot per window of `limit` successes
+        self.assertGreater(limiter.limit, 4.9)
+        limiter.acquire()
+        limiter.release(throttled=True)
+        self.assertLess(limiter.limit, 3.0)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_limit_blocks_until_release(self):
+        limiter = AIMDLimiter(initial=1)
+        limiter.acquire()
+        self.assertFalse(limiter.try_acquire())
+        limiter.release()
+        self.assertTrue(limiter.try_acquire())
+
+    def test_async_waiter_is_woken_from_another_thread(self):
+        limiter = AIMDLimiter(initial=1)
+        limiter.acquire()
+
+        async def wait():
+            await asyncio.wait_for(limiter.aacquire(), timeout=2)
+            return limiter.in_flight
+
+        threading.Timer(0.05, limiter.release).start()
+        self.assertEqual(asyncio.run(wait()), 1)
+
+    def check_cancelled_waiter(self, woken_first: bool):
+        limiter = AIMDLimiter(initial=1)
+        limiter.acquire()
+
+        async def run():
+            first = asyncio.ensure_future(limiter.aacquire())
+            second = asyncio.ensure_future(limiter.aacquire())
+            await asyncio.sleep(0)
+            if woken_first:
+                limiter.release()
+                first.cancel()
+            else:
+                first.cancel()
+                limiter.release()
+            await asyncio.wait_for(second, timeout=2)
+
+        asyncio.run(run())
+        self.assertEqual(limiter.in_flight, 1)
+
+    def test_cancelled_waiter_leaves_the_queue(self):
+        self.check_cancelled_waiter(woken_first=False)
+
+    def test_woken_then_cancelled_waiter_passes_the_slot_on(self):
+        self.check_cancelled_waiter(woken_first=True)
+
+
+class FlakyApi:
+    def __init__(self, failures: int, status: int = 503) -> None:
+        self.failures = failures
+        self.status = status
+        self.calls = 0
+
+    def handler(self, request):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return httpx.Response(self.status, headers={"retry-after": "0"})
+        return httpx.Response(200, json={"ok": True})
+
+
+class RateLimitedTransportTest(unittest.TestCase):
+    def test_throttled_get_is_retried(self):
+        api = FlakyApi(failures=2)
+        scheduler = RequestScheduler(max_retries=3)
+        transport = RateLimitedTransport(scheduler, httpx.MockTransport(api.handler))
+        with httpx.Client(transport=transport) as client:
+            response = client.get("http://host/x")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(api.calls, 3)
+        self.assertEqual(scheduler.metrics()["host"]["retries"], 2)
+
+    def test_post_is_not_retried_on_server_error(self):
+        api = FlakyApi(failures=1, status=500)
+        transport = RateLimitedTransport(
+            RequestScheduler(), httpx.MockTransport(api.handler)
+        )
+        with httpx.Client(transport=transport) as client:
+            response = client.post("http://host/x")
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(api.calls, 1)
+
+    def test_async_transport_retries(self):
+        api = FlakyApi(failures=1)
+        transport = AsyncRateLimitedTransport(
+            RequestScheduler(), httpx.MockTransport(api.handler)
+        )
+
+        async def get():
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await client.get("http://host/x")
+
+        self.assertEqual(asyncio.run(get()).status_code, 200)
+        self.assertEqual(api.calls, 2)
+
+    def test_sdk_call_retries_status_errors(self):
+        calls = []
+
+        class ApiError(Exception):
+            status_code = 429
+
+        def flaky():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise ApiError()
+            return "ok"
+
+        scheduler = RequestScheduler(max_retries=1)
+        scheduler.retry_delay = lambda *args: 0.0
+        self.assertEqual(scheduler.call("clob", flaky), "ok")
+        with self.assertRaises(ApiError):
+            calls.clear()
+            scheduler.call("clob", flaky, retries=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from agents.polymarket.pagination import PageFetchError
+from agents.polymarket.store import EVENTS, GammaStore, parse_timestamp
+
+
+def record(id: int, updated_at: str, active: bool = True) -> dict:
+    return {"id": id, "updatedAt": updated_at, "active": active, "closed": not active}
+
+
+def pages(*pages, fail: bool = False):
+    # stands in for iter_offset_pages
+    for i, page in enumerate(pages):
+        yield i * 100, page
+    if fail:
+        raise PageFetchError("http://gamma/events", len(pages) * 100, 500)
+
+
+class GammaStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = GammaStore(os.path.join(self.directory, "store.sqlite"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def sync(self, *page_list, fail: bool = False) -> dict:
+        with mock.patch(
+            "agents.polymarket.store.iter_offset_pages",
+            return_value=pages(*page_list, fail=fail),
+        ):
+            return self.store.sync(EVENTS, "http://gamma/events")
+
+    def test_parse_timestamp_accepts_any_fraction(self):
+        short = parse_timestamp("2024-07-08T01:06:23.9Z")
+        long = parse_timestamp("2024-07-08T01:06:23.982796123Z")
+        self.assertLess(short, long)
+        self.assertIsNone(parse_timestamp("yesterday"))
+
+    def test_full_then_delta_sync(self):
+        stats = self.sync(
+            [record(1, "2024-01-01T00:00:00Z"), record(2, "2024-01-02T00:00:00Z")]
+        )
+        self.assertTrue(stats["full"])
+        stats = self.sync(
+            [
+                record(3, "2024-01-04T00:00:00Z"),
+                record(1, "2024-01-03T00:00:00Z", active=False),
+                record(2, "2024-01-01T12:00:00Z"),
+            ]
+        )
+        self.assertEqual((stats["upserted"], stats["evicted"]), (1, 1))
+        self.assertEqual([r["id"] for r in self.store.all(EVENTS)], [2, 3])
+        self.assertEqual(
+            self.store.watermark(EVENTS), parse_timestamp("2024-01-04T00:00:00Z")
+        )
+
+    def test_failed_delta_sync_changes_nothing(self):
+        self.sync([record(1, "2024-01-01T00:00:00Z")])
+        with self.assertRaises(PageFetchError):
+            self.sync([record(2, "2024-01-05T00:00:00Z")] * 100, fail=True)
+        self.assertEqual(self.store.count(EVENTS), 1)
+        self.assertEqual(
+            self.store.watermark(EVENTS), parse_timestamp("2024-01-01T00:00:00Z")
+        )
+
+    def test_failed_full_sync_keeps_the_old_records(self):
+        self.store.upsert(EVENTS, [record(7, "2024-01-01T00:00:00Z")])
+        with self.assertRaises(PageFetchError):
+            self.sync([record(1, "2024-01-01T00:00:00Z")], fail=True)
+        self.assertEqual([r["id"] for r in self.store.all(EVENTS)], [7])
+        self.assertIsNone(self.store.watermark(EVENTS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import shutil
+import tempfile
+import unittest
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from agents.connectors.vector_index import IncrementalIndex
+
+
+class WordEmbeddings(Embeddings):
+    # one dimension per word of a small vocabulary
+    vocabulary = ["election", "bitcoin", "football", "rates"]
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def _vector(self, text: str) -> "list[float]":
+        words = text.lower().split()
+        return [float(words.count(w)) + 0.01 for w in self.vocabulary]
+
+    def embed_documents(self, texts):
+        self.calls += len(texts)
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+def documents(*pairs):
+    return [Document(page_content=text, metadata={"id": i}) for i, text in pairs]
+
+
+class IncrementalIndexTest(unittest.TestCase):
+    backend = "numpy"
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.embeddings = WordEmbeddings()
+        self.index = IncrementalIndex(
+            self.directory, self.embeddings, backend=self.backend
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def sync(self, docs, complete=True):
+        return self.index.sync(
+            docs, [str(d.metadata["id"]) for d in docs], complete=complete
+        )
+
+    def test_only_new_or_changed_texts_are_embedded(self):
+        self.sync(documents((1, "election odds"), (2, "bitcoin price")))
+        stats = self.sync(documents((1, "election odds"), (2, "bitcoin price today")))
+        self.assertEqual(stats["unchanged"], 1)
+        self.assertEqual(stats["updated"], 1)
+        self.assertEqual(self.embeddings.calls, 3)
+
+    def test_complete_sync_prunes_missing_ids(self):
+        self.sync(documents((1, "election odds"), (2, "bitcoin price")))
+        stats = self.sync(documents((1, "election odds")))
+        self.assertEqual(stats["deleted"], 1)
+        self.assertEqual(set(self.index._existing()), {"1"})
+
+    def test_partial_sync_keeps_missing_ids(self):
+        self.sync(documents((1, "election odds"), (2, "bitcoin price")))
+        stats = self.sync(documents((1, "election odds")), complete=False)
+        self.assertEqual(stats["deleted"], 0)
+        self.assertEqual(set(self.index._existing()), {"1", "2"})
+
+    def test_search_is_limited_to_given_ids(self):
+        self.sync(
+            documents((1, "election odds"), (2, "bitcoin price"), (3, "football final"))
+        )
+        results = self.index.similarity_search_with_score(
+            "bitcoin", k=3, ids=["1", "3"]
+        )
+        self.assertEqual({doc.metadata["id"] for doc, _ in results}, {1, 3})
+        best, _ = self.index.similarity_search_with_score("bitcoin", k=1)[0]
+        self.assertEqual(best.metadata["id"], 2)
+        self.assertEqual(self.index.similarity_search_with_score("bitcoin", ids=[]), [])
+
+
+class ChromaIncrementalIndexTest(IncrementalIndexTest):
+    backend = "chroma"
+
+
+if __name__ == "__main__":
+    unittest.main()